@@ -0,0 +1,69 @@
+"""
+Compare the DOM-free script scanner with the BeautifulSoup path on large synthetic pages.
+
+    python benchmarks/bench_extract.py [--posts 2000] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from extractors.classroom_scraper import ClassroomScraper  # noqa: E402
+from extractors.community_scraper import CommunityScraper  # noqa: E402
+
+def build_page(posts: int, filler_kb: int = 512) -> str:
+    next_data = {
+        "props": {
+            "pageProps": {
+                "posts": [
+                    {
+                        "id": f"p{i:06d}",
+                        "name": f"post-{i}",
+                        "metadata": {"title": f"Post {i}", "content": "lorem {ipsum} " * 40, "upvotes": i % 97},
+                        "createdAt": "2024-11-07T23:26:18.04203Z",
+                    }
+                    for i in range(posts)
+                ]
+            }
+        }
+    }
+    bundle = "function f(a){return {x:a}};" * (filler_kb * 1024 // 30)
+    ld = {"@type": "Course", "name": "Course", "hasPart": [{"name": f"m{i}"} for i in range(200)]}
+    body = "<div class='row'><span>content</span></div>" * (filler_kb * 1024 // 45)
+    return (
+        "<html><head><title>bench</title>"
+        f"<script>{bundle}</script>"
+        f'<script type="application/ld+json">{json.dumps(ld)}</script>'
+        f"</head><body>{body}"
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script>'
+        "</body></html>"
+    )
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--posts", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    html = build_page(args.posts)
+    print(f"page size: {len(html) / 1e6:.1f} MB, {args.posts} posts")
+    for label, fast in (("soup", False), ("scan", True)):
+        comm = CommunityScraper(fast_extract=fast)
+        clas = ClassroomScraper(fast_extract=fast)
+        t_comm = timed(lambda: list(comm._extract_json_blobs(html)), args.repeat)
+        t_clas = timed(lambda: list(clas._extract_module_payloads(html)), args.repeat)
+        print(f"{label:>5}: community {t_comm * 1000:8.1f} ms   classroom {t_clas * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
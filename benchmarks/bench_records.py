@@ -0,0 +1,72 @@
+"""
+Record construction + serialization on posts with large comment trees:
+validated pydantic models + model_dump() vs the fast build()/dumps() path,
+and the same with the cyclic GC off (comment trees are acyclic, so its
+collections during the build find nothing; an option for callers, not for
+the parsers, which must not toggle process-wide state).
+
+    python benchmarks/bench_records.py [--posts 20] [--comments 5000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import orjson  # noqa: E402
+
+from outputs.schema import dumps, set_strict_validation  # noqa: E402
+from parsers.posts import normalize_post  # noqa: E402
+
+def make_post(i: int, comments: int) -> dict:
+    return {
+        "id": f"post-{i}",
+        "metadata": {"title": f"Post {i}", "content": "body " * 50, "upvotes": i},
+        "createdAt": "2024-11-07T23:26:18.04203Z",
+        "user": {"id": "u0", "name": "author", "metadata": {"bio": "hi"}},
+        "comments": [
+            {
+                "post": {
+                    "id": f"{i}-c{j}",
+                    "parent_id": f"{i}-c{j // 4}" if j else "",
+                    "metadata": {"content": "comment " * 12, "upvotes": j % 9},
+                    "created_at": f"2024-11-{j % 28 + 1:02d}T10:00:00.5Z",
+                    "user": {"id": f"u{j % 300}", "name": f"user {j % 300}", "metadata": {"bio": ""}},
+                }
+            }
+            for j in range(comments)
+        ],
+    }
+
+def bench(label: str, posts, strict: bool, dump) -> bytes:
+    set_strict_validation(strict)
+    t0 = time.perf_counter()
+    items = [normalize_post(p) for p in posts]
+    t1 = time.perf_counter()
+    out = b"\n".join(dump(item) for item in items)
+    t2 = time.perf_counter()
+    print(f"{label:>28}: build {(t1 - t0) * 1000:8.1f} ms  dump {(t2 - t1) * 1000:8.1f} ms  total {(t2 - t0) * 1000:8.1f} ms")
+    return out
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--posts", type=int, default=20)
+    ap.add_argument("--comments", type=int, default=5000)
+    args = ap.parse_args()
+
+    posts = [make_post(i, args.comments) for i in range(args.posts)]
+    normalize_post(posts[0])  # warm up the to_iso cache
+    legacy = bench("validated + model_dump", posts, True, lambda item: orjson.dumps(item.model_dump()))
+    strict = bench("validated + dumps", posts, True, dumps)
+    fast = bench("fast build + dumps", posts, False, dumps)
+    gc.disable()
+    try:
+        no_gc = bench("fast build + dumps, gc off", posts, False, dumps)
+    finally:
+        gc.enable()
+    assert legacy == strict == fast == no_gc, "serialized output differs"
+
+if __name__ == "__main__":
+    main()
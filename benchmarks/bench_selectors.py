@@ -0,0 +1,115 @@
+"""
+Record lookup in large __NEXT_DATA__ payloads: the former json.loads plus
+hard-coded key walks against orjson plus the compiled selectors
+(config/selectors.json), on synthetic blobs of several sizes.
+
+    python benchmarks/bench_selectors.py [--sizes 1 4 16] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List
+
+import orjson
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+sys.path.insert(0, HERE)
+
+import synthetic  # noqa: E402
+from extractors.selectors import load_selectors  # noqa: E402
+
+def legacy_posts(blob: Dict) -> Iterable[Dict]:
+    # CommunityScraper._coerce_post_records before the selectors
+    page_props = blob.get("props", {}).get("pageProps", {})
+    if isinstance(page_props, dict):
+        candidates = []
+        for key in ["posts", "items", "feed", "data"]:
+            val = page_props.get(key)
+            if isinstance(val, list):
+                candidates.extend(val)
+            elif isinstance(val, dict) and "items" in val and isinstance(val["items"], list):
+                candidates.extend(val["items"])
+        for rec in candidates:
+            if isinstance(rec, dict):
+                yield rec
+    for key in ["data", "payload", "result", "collection"]:
+        val = blob.get(key)
+        if isinstance(val, list):
+            for rec in val:
+                if isinstance(rec, dict):
+                    yield rec
+
+def legacy_modules(blob: Dict) -> Iterable[Dict]:
+    # ClassroomScraper._payloads_from_tags (__NEXT_DATA__ part) before the selectors
+    page_props = blob.get("props", {}).get("pageProps", {})
+    for key in ["classroom", "modules", "courses", "items", "data"]:
+        val = page_props.get(key)
+        if isinstance(val, list):
+            for it in val:
+                if isinstance(it, dict):
+                    yield it
+    course = page_props.get("course") or page_props.get("classroom")
+    if isinstance(course, dict):
+        for key in ["modules", "lessons", "items"]:
+            arr = course.get(key)
+            if isinstance(arr, list):
+                for it in arr:
+                    if isinstance(it, dict):
+                        yield it
+
+def build_blob(mb: int) -> str:
+    """
+    A feed page payload of about `mb` megabytes: posts with comment trees,
+    plus a course with modules, as in a combined Skool page.
+    """
+    rng = random.Random(mb)
+    posts: List[Dict[str, Any]] = []
+    modules = synthetic.skool_modules(rng, 50)
+    size = 0
+    while size < mb * 1_000_000:
+        post = synthetic.post(rng, len(posts), comment_width=3, comment_depth=2)
+        posts.append(post)
+        size += len(orjson.dumps(post))
+    blob = {"props": {"pageProps": {"posts": posts, "feed": {"items": posts[:20]}, "course": {"modules": modules}}}}
+    return json.dumps(blob)
+
+def timed(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16], help="Payload sizes in MB.")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    selectors = load_selectors()
+    posts, modules = selectors["posts"], selectors["nextDataModules"]
+    print(f"{'MB':>4} {'records':>8} {'json ms':>8} {'orjson ms':>10} {'walk us':>8} {'select us':>10} {'total':>7}")
+    for mb in args.sizes:
+        text = build_blob(mb)
+        doc = json.loads(text)
+        old = list(legacy_posts(doc)) + list(legacy_modules(doc))
+        new = posts.select(doc) + modules.select(doc)
+        assert old == new, "selectors disagree with the legacy walk"
+
+        decode_old = timed(lambda: json.loads(text), args.repeat)
+        decode_new = timed(lambda: orjson.loads(text), args.repeat)
+        walk_old = timed(lambda: (list(legacy_posts(doc)), list(legacy_modules(doc))), args.repeat)
+        walk_new = timed(lambda: (posts.select(doc), modules.select(doc)), args.repeat)
+        speedup = (decode_old + walk_old) / (decode_new + walk_new)
+        print(
+            f"{len(text) / 1e6:4.0f} {len(new):8d} {decode_old * 1000:8.1f} {decode_new * 1000:10.1f} "
+            f"{walk_old * 1e6:8.0f} {walk_new * 1e6:10.0f} {speedup:6.2f}x"
+        )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
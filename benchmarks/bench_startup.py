@@ -0,0 +1,104 @@
+"""
+CLI startup cost per mode: wall time of a short runner.py job and the heavy
+modules it loads, with lazy imports (as shipped) vs the same job with the
+heavy dependencies imported up front (what every run used to pay).
+
+    python benchmarks/bench_startup.py [--repeat 5]
+
+Online modes fetch two small synthetic pages from a local HTTP server.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Set, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RUNNER = os.path.join(os.path.dirname(HERE), "src", "runner.py")
+sys.path.insert(0, HERE)
+
+import synthetic  # noqa: E402
+
+HEAVY = ["requests", "tqdm", "dateutil", "bs4", "lxml", "pandas", "pyarrow", "multiprocessing", "sqlite3"]
+EAGER = "import requests, tqdm, dateutil.parser, bs4, lxml, multiprocessing, sqlite3"
+
+def _serve(pages: Dict[str, str]) -> Tuple[ThreadingHTTPServer, str]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            body = pages.get(self.path, "").encode("utf-8")
+            self.send_response(200 if body else 404)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+
+def _run(args: List[str], eager: bool, importtime: bool = False) -> Tuple[float, Set[str]]:
+    python = [sys.executable] + (["-X", "importtime"] if importtime else [])
+    if eager:
+        code = (
+            f"{EAGER}; import runpy, sys; sys.argv = sys.argv[1:]; "
+            "runpy.run_path(sys.argv[0], run_name='__main__')"
+        )
+        cmd = python + ["-c", code, RUNNER] + args
+    else:
+        cmd = python + [RUNNER] + args
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=tempfile.gettempdir())
+    elapsed = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise SystemExit(f"{' '.join(args)} failed:\n{proc.stderr[-2000:]}")
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            loaded.add(name.split(".")[0])
+    return elapsed, loaded
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    httpd, base = _serve(
+        {
+            "/community": synthetic.community_page(50, filler_kb=16),
+            "/classroom": synthetic.classroom_page(50, filler_kb=16),
+        }
+    )
+    work = tempfile.mkdtemp(prefix="skool-startup-")
+    inputs = os.path.join(work, "inputs.json")
+    with open(inputs, "w", encoding="utf-8") as f:
+        json.dump([f"{base}/community", f"{base}/classroom"], f)
+    online = ["--inputs", inputs, "--rate", "0", "--output", os.path.join(work, "out")]
+    modes = {
+        "help": ["--help"],
+        "offline": ["--offline", "--output", os.path.join(work, "offline")],
+        "community": ["--mode", "community"] + online,
+        "classroom": ["--mode", "classroom"] + online,
+        "both": ["--mode", "both"] + online,
+    }
+
+    print(f"{'mode':>10} {'lazy ms':>9} {'eager ms':>9} {'saved':>7}  heavy modules loaded")
+    try:
+        for mode, argv in modes.items():
+            lazy = min(_run(argv, False)[0] for _ in range(args.repeat))
+            eager = min(_run(argv, True)[0] for _ in range(args.repeat))
+            loaded = _run(argv, False, importtime=True)[1]
+            heavy = ", ".join(m for m in HEAVY if m in loaded) or "-"
+            print(f"{mode:>10} {lazy * 1000:9.0f} {eager * 1000:9.0f} {(eager - lazy) * 1000:7.0f}  {heavy}")
+    finally:
+        httpd.shutdown()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
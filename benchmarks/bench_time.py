@@ -0,0 +1,48 @@
+"""
+Micro-benchmark for extractors.utils_time.to_iso against the plain dateutil path.
+
+    python benchmarks/bench_time.py [--n 200000] [--distinct 5000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from extractors.utils_time import _parse_dateutil, _str_to_iso, to_iso  # noqa: E402
+
+def make_inputs(n: int, distinct: int):
+    rnd = random.Random(1)
+    pool = [
+        f"2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}T{rnd.randint(0, 23):02d}:"
+        f"{rnd.randint(0, 59):02d}:{rnd.randint(0, 59):02d}.{rnd.randint(0, 999999):06d}Z"
+        for _ in range(distinct)
+    ]
+    return [rnd.choice(pool) for _ in range(n)]
+
+def bench(label: str, fn, values) -> None:
+    t0 = time.perf_counter()
+    for v in values:
+        fn(v)
+    dt = time.perf_counter() - t0
+    print(f"{label:>22}: {dt * 1000:8.1f} ms  ({len(values) / dt / 1e3:8.1f} k/s)")
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=200_000)
+    ap.add_argument("--distinct", type=int, default=5_000)
+    args = ap.parse_args()
+
+    values = make_inputs(args.n, args.distinct)
+    unique = list(dict.fromkeys(values))
+    bench("dateutil", _parse_dateutil, values)
+    _str_to_iso.cache_clear()
+    bench("to_iso, all distinct", to_iso, unique)
+    _str_to_iso.cache_clear()
+    bench("to_iso, repeated", to_iso, values)
+    bench("to_iso, epoch ns", to_iso, [1731431342139887000 + i for i in range(args.n)])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Throughput and peak memory of each pipeline stage on synthetic inputs
+(benchmarks/synthetic.py), separately and end to end, compared against a
+stored baseline.
+
+    python benchmarks/run_benchmarks.py                  # run, compare with the baseline
+    python benchmarks/run_benchmarks.py --save-baseline  # run, store as the new baseline
+    python benchmarks/run_benchmarks.py --only normalize --scale 0.25
+
+Timings are the best of --repeat runs; peak memory is measured in a separate
+run under tracemalloc (Python allocations only). A case regresses when its
+throughput drops by more than --tolerance or its peak memory grows by more
+than --memory-tolerance; the exit status is then 1.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import synthetic  # noqa: E402
+from extractors.classroom_scraper import ClassroomScraper  # noqa: E402
+from extractors.community_scraper import CommunityScraper  # noqa: E402
+from extractors.page_cache import Page  # noqa: E402
+from outputs.exporters import Exporter  # noqa: E402
+from parsers.classroom import normalize_module  # noqa: E402
+from parsers.comments import normalize_comments  # noqa: E402
+from parsers.posts import normalize_post  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+@dataclass
+class Case:
+    name: str
+    # Builds the inputs (untimed) and returns the function to measure plus its item count
+    setup: Callable[[], Any]
+
+def _extract_case(scale: float) -> Case:
+    def setup():
+        posts = max(1, int(2000 * scale))
+        html = synthetic.community_page(posts, filler_kb=512)
+        scraper = CommunityScraper()
+        return (lambda: list(scraper._extract_json_blobs(html))), posts
+    return Case("extract_json_blobs", setup)
+
+def _normalize_post_case(scale: float) -> Case:
+    def setup():
+        posts = max(1, int(5000 * scale))
+        rng = synthetic.random.Random(1)
+        records = [synthetic.post(rng, i) for i in range(posts)]
+        return (lambda: [normalize_post(r) for r in records]), posts
+    return Case("normalize_post", setup)
+
+def _normalize_comments_case(scale: float) -> Case:
+    def setup():
+        trees = max(1, int(40 * scale))
+        rng = synthetic.random.Random(2)
+        forest = [synthetic.comment_tree(rng, f"p{i}", width=8, depth=3) for i in range(trees)]
+        count = sum(len(t) for t in forest)
+        return (lambda: [normalize_comments(t) for t in forest]), count
+    return Case("normalize_comments", setup)
+
+def _exporter_case(scale: float) -> Case:
+    def setup():
+        posts = max(1, int(2000 * scale))
+        rng = synthetic.random.Random(3)
+        items = [normalize_post(synthetic.post(rng, i, comment_width=3, comment_depth=2)) for i in range(posts)]
+
+        def export() -> None:
+            out = tempfile.mkdtemp(prefix="skool-bench-")
+            try:
+                exporter = Exporter(out_dir=out)
+                for item in items:
+                    exporter.write(item)
+                exporter.finalize()
+            finally:
+                shutil.rmtree(out, ignore_errors=True)
+        return export, posts
+    return Case("exporter", setup)
+
+def _end_to_end_case(scale: float) -> Case:
+    def setup():
+        pages = max(1, int(8 * scale))
+        community = [
+            Page(url=f"https://www.skool.com/g/{i}", html=synthetic.community_page(250, 3, 2, seed=i))
+            for i in range(pages)
+        ]
+        classroom = [
+            Page(url=f"https://www.skool.com/g/classroom/{i}", html=synthetic.classroom_page(200, shape, seed=i))
+            for i, shape in enumerate(["skool", "schema"] * max(1, pages // 2))
+        ]
+
+        def pipeline() -> None:
+            out = tempfile.mkdtemp(prefix="skool-bench-")
+            try:
+                comm, clas = CommunityScraper(), ClassroomScraper()
+                exporter = Exporter(out_dir=out)
+                for page in community:
+                    for raw in comm.iter_items_from_page(page):
+                        exporter.write(normalize_post(raw))
+                for page in classroom:
+                    for raw in clas.iter_modules_from_page(page):
+                        exporter.write(normalize_module(raw))
+                exporter.finalize()
+            finally:
+                shutil.rmtree(out, ignore_errors=True)
+        return pipeline, pages * 250 + len(classroom) * 200
+    return Case("end_to_end", setup)
+
+CASES = [_extract_case, _normalize_post_case, _normalize_comments_case, _exporter_case, _end_to_end_case]
+
+def measure(case: Case, repeat: int) -> Dict[str, float]:
+    fn, items = case.setup()
+    fn()  # warm up caches (to_iso, imports)
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "items": items,
+        "seconds": round(best, 4),
+        "itemsPerSecond": round(items / best, 1) if best > 0 else 0.0,
+        "peakMB": round(peak / 1e6, 2),
+    }
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float, memory_tolerance: float) -> List[str]:
+    """
+    Human-readable regressions of `results` against `baseline`.
+    """
+    problems: List[str] = []
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if not base or base.get("items") != cur["items"]:
+            continue  # new case, or a different --scale: nothing to compare with
+        if cur["itemsPerSecond"] < base["itemsPerSecond"] * (1 - tolerance):
+            problems.append(
+                f"{name}: throughput {cur['itemsPerSecond']:.0f}/s vs baseline {base['itemsPerSecond']:.0f}/s"
+            )
+        if cur["peakMB"] > base["peakMB"] * (1 + memory_tolerance):
+            problems.append(f"{name}: peak memory {cur['peakMB']:.1f} MB vs baseline {base['peakMB']:.1f} MB")
+    return problems
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results file.")
+    ap.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline.")
+    ap.add_argument("--only", default="", help="Run only cases whose name contains this.")
+    ap.add_argument("--scale", type=float, default=1.0, help="Input size multiplier.")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop (fraction).")
+    ap.add_argument("--memory-tolerance", type=float, default=0.25, help="Allowed peak memory growth (fraction).")
+    ap.add_argument("--output", default=None, help="Also write this run's results to this JSON file.")
+    args = ap.parse_args()
+
+    results: Dict[str, Dict] = {}
+    for make in CASES:
+        case = make(args.scale)
+        if args.only and args.only not in case.name:
+            continue
+        r = results[case.name] = measure(case, args.repeat)
+        print(
+            f"{case.name:>20}: {r['items']:7d} items  {r['seconds'] * 1000:9.1f} ms  "
+            f"{r['itemsPerSecond']:10.0f} items/s  peak {r['peakMB']:7.1f} MB"
+        )
+
+    report: Dict[str, Any] = {"python": platform.python_version(), "scale": args.scale, "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    baseline: Optional[Dict[str, Any]] = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    if args.save_baseline:
+        if baseline is not None:
+            # Keep cases this run skipped (--only)
+            report["results"] = {**baseline.get("results", {}), **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+    if baseline is None:
+        print("No baseline yet; run with --save-baseline to store one.")
+        return
+
+    problems = compare(results, baseline.get("results", {}), args.tolerance, args.memory_tolerance)
+    for p in problems:
+        print(f"REGRESSION {p}")
+    if problems:
+        sys.exit(1)
+    print("No regressions against the baseline.")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""
+Synthetic Skool inputs for benchmarks: community pages with __NEXT_DATA__,
+comment trees of a given width and depth, and classroom payloads in Skool
+and schema.org shapes. Output is deterministic for a given seed.
+"""
+from __future__ import annotations
+
+import json
+import random
+from typing import Any, Dict, List
+
+_WORDS = (
+    "community course module lesson launch growth coaching weekly call replay "
+    "template funnel offer audience question answer update thanks idea"
+).split()
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+def _ts(rng: random.Random) -> str:
+    return (
+        f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        f"T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}.{rng.randint(0, 99999):05d}Z"
+    )
+
+def user(rng: random.Random, users: int = 500) -> Dict[str, Any]:
+    n = rng.randrange(users)
+    return {
+        "id": f"u{n:05d}",
+        "name": f"member-{n}",
+        "firstName": "Member",
+        "lastName": str(n),
+        "createdAt": "2023-01-01T00:00:00Z",
+        "updatedAt": _ts(rng),
+        "metadata": {"bio": _text(rng, 8), "pictureProfile": f"https://cdn.example/{n}.png"},
+    }
+
+def comment_tree(rng: random.Random, post_id: str, width: int, depth: int) -> List[Dict[str, Any]]:
+    """
+    Flat comment records as Skool sends them ({"post": {...}} with parent_id),
+    `width` replies per comment down to `depth` levels, depth-first.
+    """
+    out: List[Dict[str, Any]] = []
+
+    def _level(parent: str, level: int) -> None:
+        for i in range(width):
+            cid = f"{parent or post_id}.{i}"
+            out.append(
+                {
+                    "post": {
+                        "id": cid,
+                        "parent_id": parent,
+                        "root_id": post_id,
+                        "created_at": _ts(rng),
+                        "updated_at": _ts(rng),
+                        "metadata": {"content": _text(rng, 25), "upvotes": rng.randrange(20)},
+                        "user": user(rng),
+                    }
+                }
+            )
+            if level + 1 < depth:
+                _level(cid, level + 1)
+
+    if depth > 0:
+        _level("", 0)
+    return out
+
+def post(rng: random.Random, i: int, comment_width: int = 0, comment_depth: int = 0) -> Dict[str, Any]:
+    pid = f"p{i:07d}"
+    comments = comment_tree(rng, pid, comment_width, comment_depth)
+    return {
+        "id": pid,
+        "name": f"post-{i}",
+        "groupId": f"g{i % 4}",
+        "userId": "",
+        "postType": "generic",
+        "createdAt": _ts(rng),
+        "updatedAt": _ts(rng),
+        "metadata": {
+            "title": _text(rng, 6),
+            "content": _text(rng, 120),
+            "upvotes": rng.randrange(500),
+            "comments": len(comments),
+            "pinned": int(i % 50 == 0),
+            "labels": "l1",
+        },
+        "user": user(rng),
+        "comments": comments,
+    }
+
+def _script_page(next_data: Dict[str, Any], extra_scripts: str = "", filler_kb: int = 0) -> str:
+    body = "<div class='row'><span>content</span></div>" * (filler_kb * 1024 // 45)
+    return (
+        "<html><head><title>synthetic</title>"
+        f"<script>{'function f(a){return {x:a}};' * (filler_kb * 1024 // 30)}</script>"
+        f"{extra_scripts}</head><body>{body}"
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script>'
+        "</body></html>"
+    )
+
+def community_page(
+    posts: int, comment_width: int = 0, comment_depth: int = 0, filler_kb: int = 64, seed: int = 0
+) -> str:
+    """
+    A community feed page whose __NEXT_DATA__ holds `posts` posts, each with a
+    comment tree of `comment_width` x `comment_depth`.
+    """
+    rng = random.Random(seed)
+    records = [post(rng, i, comment_width, comment_depth) for i in range(posts)]
+    return _script_page({"props": {"pageProps": {"posts": records, "total": posts}}}, filler_kb=filler_kb)
+
+def skool_modules(rng: random.Random, modules: int) -> List[Dict[str, Any]]:
+    course = {"id": "c1", "name": "course-1", "title": "Course 1", "createdAt": _ts(rng)}
+    return [
+        {
+            "id": f"m{i:06d}",
+            "name": f"module-{i}",
+            "title": _text(rng, 5),
+            "content": _text(rng, 80),
+            "url": f"https://www.skool.com/g/classroom/c1?md=m{i:06d}",
+            "createdAt": _ts(rng),
+            "updatedAt": _ts(rng),
+            "groupId": "g0",
+            "videos": [f"https://video.example/{i}.mp4"],
+            "courseMetaDetails": course,
+        }
+        for i in range(modules)
+    ]
+
+def schema_org_modules(rng: random.Random, modules: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "@type": "LearningResource",
+            "@id": f"https://www.skool.com/g/classroom/c1#m{i:06d}",
+            "name": _text(rng, 5),
+            "description": _text(rng, 80),
+            "dateCreated": _ts(rng),
+            "dateModified": _ts(rng),
+            "video": f"https://video.example/{i}.mp4",
+            "about": {"@id": "c1", "name": "Course 1", "headline": "Course 1"},
+        }
+        for i in range(modules)
+    ]
+
+def classroom_page(modules: int, shape: str = "skool", filler_kb: int = 64, seed: int = 0) -> str:
+    """
+    A classroom page with `modules` modules, either in __NEXT_DATA__
+    (shape="skool") or as schema.org LD+JSON (shape="schema").
+    """
+    rng = random.Random(seed)
+    if shape == "skool":
+        return _script_page({"props": {"pageProps": {"modules": skool_modules(rng, modules)}}}, filler_kb=filler_kb)
+    ld = json.dumps(schema_org_modules(rng, modules))
+    return _script_page(
+        {"props": {"pageProps": {}}},
+        extra_scripts=f'<script type="application/ld+json">{ld}</script>',
+        filler_kb=filler_kb,
+    )
\ No newline at end of file
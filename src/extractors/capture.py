@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import IO, Dict, Generator, Iterator, List, Mapping, Optional
+
+import orjson
+
+from extractors.http_client import STREAM_CHUNK, FetchEngine, FetchResult
+from extractors.utils_time import now_iso
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+ARCHIVE_NAME = "capture.bin"
+INDEX_NAME = "capture.idx"
+# Frame: magic, metadata length, compressed body length, metadata JSON, zlib body
+MAGIC = b"SKC1"
+_HEADER = struct.Struct("<4sII")
+
+@dataclass
+class CaptureEntry:
+    url: str
+    offset: int
+    size: int
+    status: int = 200
+    fetchedAt: Optional[str] = None
+
+@dataclass
+class CapturedPage:
+    url: str
+    status: int
+    headers: Dict[str, str]
+    fetchedAt: Optional[str]
+    body: str
+
+@dataclass
+class CaptureWriter:
+    """
+    Append-only archive of fetched pages: `capture.bin` holds one frame per
+    response (URL, status, headers and the zlib-compressed body), and
+    `capture.idx` one NDJSON line per frame with its offset, so a reader can
+    seek straight to any URL. Safe to share between fetch threads; several
+    runs can append to the same directory (the newest capture of a URL wins).
+    """
+
+    path: str
+    level: int = 6
+    pages: int = 0
+    _archive: Optional[IO[bytes]] = field(default=None, init=False, repr=False)
+    _index: Optional[IO[bytes]] = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        self._archive = open(os.path.join(self.path, ARCHIVE_NAME), "ab")
+        self._index = open(os.path.join(self.path, INDEX_NAME), "ab")
+
+    def write(self, url: str, status: int, headers: Mapping[str, str], body: str) -> None:
+        meta = {"url": url, "status": status, "headers": dict(headers), "fetchedAt": now_iso()}
+        meta_bytes = orjson.dumps(meta)
+        # Compressed outside the lock so fetch threads compress in parallel
+        data = zlib.compress(body.encode("utf-8"), self.level)
+        frame = _HEADER.pack(MAGIC, len(meta_bytes), len(data)) + meta_bytes + data
+        with self._lock:
+            offset = self._archive.tell()
+            self._archive.write(frame)
+            self._archive.flush()
+            entry = {"url": url, "offset": offset, "size": len(frame), "status": status, "fetchedAt": meta["fetchedAt"]}
+            self._index.write(orjson.dumps(entry) + b"\n")
+            self._index.flush()
+            self.pages += 1
+
+    def close(self) -> None:
+        with self._lock:
+            for f in (self._archive, self._index):
+                if f is not None:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    f.close()
+            self._archive = self._index = None
+
+def _read_frame(f: IO[bytes], offset: int) -> Optional[CapturedPage]:
+    f.seek(offset)
+    header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None
+    magic, meta_len, body_len = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"Corrupt capture archive at offset {offset}")
+    meta_bytes = f.read(meta_len)
+    data = f.read(body_len)
+    if len(meta_bytes) < meta_len or len(data) < body_len:
+        return None  # torn last frame
+    meta = orjson.loads(meta_bytes)
+    return CapturedPage(
+        url=meta["url"],
+        status=meta.get("status", 200),
+        headers=meta.get("headers") or {},
+        fetchedAt=meta.get("fetchedAt"),
+        body=zlib.decompress(data).decode("utf-8"),
+    )
+
+@dataclass
+class CaptureArchive:
+    """
+    Random access to a capture directory by URL. The index is read once; if
+    it is missing or behind the archive (a crash between the two writes),
+    the remaining frames are scanned to catch up. Reads use their own file
+    handle per thread, so pages can be loaded and decompressed in parallel.
+    """
+
+    path: str
+    entries: List[CaptureEntry] = field(default_factory=list, init=False, repr=False)
+    _by_url: Dict[str, CaptureEntry] = field(default_factory=dict, init=False, repr=False)
+    _local: threading.local = field(default_factory=threading.local, init=False, repr=False)
+    _handles: List[IO[bytes]] = field(default_factory=list, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        archive = os.path.join(self.path, ARCHIVE_NAME)
+        if not os.path.exists(archive):
+            raise FileNotFoundError(f"No capture archive in {self.path}")
+        end = 0
+        index = os.path.join(self.path, INDEX_NAME)
+        if os.path.exists(index):
+            with open(index, "rb") as f:
+                for line in f:
+                    try:
+                        entry = CaptureEntry(**orjson.loads(line))
+                    except (orjson.JSONDecodeError, TypeError):
+                        break
+                    self._add(entry)
+                    end = max(end, entry.offset + entry.size)
+        if end < os.path.getsize(archive):
+            self._scan(archive, end)
+
+    def _add(self, entry: CaptureEntry) -> None:
+        self.entries.append(entry)
+        self._by_url[entry.url] = entry
+
+    def _scan(self, archive: str, offset: int) -> None:
+        with open(archive, "rb") as f:
+            while True:
+                f.seek(offset)
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                magic, meta_len, body_len = _HEADER.unpack(header)
+                if magic != MAGIC:
+                    logger.warning("Corrupt capture frame at offset %s, ignoring the rest", offset)
+                    return
+                meta_bytes = f.read(meta_len)
+                size = _HEADER.size + meta_len + body_len
+                if len(meta_bytes) < meta_len or offset + size > os.path.getsize(archive):
+                    return
+                meta = orjson.loads(meta_bytes)
+                self._add(CaptureEntry(meta["url"], offset, size, meta.get("status", 200), meta.get("fetchedAt")))
+                offset += size
+
+    def _file(self) -> IO[bytes]:
+        f = getattr(self._local, "f", None)
+        if f is None:
+            f = self._local.f = open(os.path.join(self.path, ARCHIVE_NAME), "rb")
+            with self._lock:
+                self._handles.append(f)
+        return f
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._by_url
+
+    def __len__(self) -> int:
+        return len(self._by_url)
+
+    def urls(self) -> List[str]:
+        """
+        Captured URLs in first-capture order.
+        """
+        return list(dict.fromkeys(e.url for e in self.entries))
+
+    def get(self, url: str) -> Optional[CapturedPage]:
+        """
+        The newest capture of `url`, or None.
+        """
+        entry = self._by_url.get(url)
+        return _read_frame(self._file(), entry.offset) if entry is not None else None
+
+    def __iter__(self) -> Iterator[CapturedPage]:
+        for entry in self.entries:
+            page = _read_frame(self._file(), entry.offset)
+            if page is not None:
+                yield page
+
+    def close(self) -> None:
+        with self._lock:
+            for f in self._handles:
+                f.close()
+            self._handles.clear()
+
+@dataclass
+class ReplayEngine(FetchEngine):
+    """
+    FetchEngine that answers from a CaptureArchive and never touches the
+    network, so the scrapers, crawler and comment fetcher re-run unchanged on
+    captured pages. URLs that were not captured come back as failed fetches.
+    """
+
+    archive: Optional[CaptureArchive] = None
+    missing: int = 0
+
+    def fetch(self, url: str) -> FetchResult:
+        page = self.archive.get(url) if self.archive is not None else None
+        if page is None:
+            with self._lock:
+                self.missing += 1
+            logger.warning("Not in capture: %s", url)
+            return FetchResult(url=url)
+        return FetchResult(url=url, status=200, text=page.body)
+
+    def stream(self, url: str, chunk_size: int = STREAM_CHUNK) -> Generator[str, None, bool]:
+        result = self.fetch(url)
+        text = result.text or ""
+        for start in range(0, len(text), chunk_size):
+            yield text[start:start + chunk_size]
+        return result.ok
+
+    def stats(self) -> Dict[str, float]:
+        return {"requests": 0, "retries": 0, "backoffSeconds": 0.0, "missing": self.missing}
+
+    def close(self) -> None:
+        if self.archive is not None:
+            self.archive.close()
\ No newline at end of file
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-import json
+import itertools
 import logging
-import time
-from dataclasses import dataclass
-from typing import Dict, Generator, Iterable, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Generator, Iterable, Iterator, List, Optional
 
-import requests
-from bs4 import BeautifulSoup
+from extractors.comment_fetcher import CommentFetcher
+from extractors.http_client import DEFAULT_USER_AGENT, FetchEngine
+from extractors.page_cache import Page, PageCache
+from extractors.scripts import ScriptTag, TagStream
+from extractors.selectors import SelectorSet, load_selectors
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -16,80 +18,104 @@ logger.setLevel(logging.INFO)
 class ClassroomScraper:
     include_comments: bool = False
     max_items: Optional[int] = None
-    user_agent: str = (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-        "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
-    )
+    user_agent: str = DEFAULT_USER_AGENT
     retries: int = 3
     timeout: int = 20
+    engine: Optional[FetchEngine] = field(default=None, repr=False)
+    # Scan <script> tags directly; the BeautifulSoup DOM is only built as a fallback
+    fast_extract: bool = True
+    # Optional per-run cache shared with CommunityScraper
+    cache: Optional[PageCache] = field(default=None, repr=False)
+    # Fetches full comment threads when include_comments is set
+    comments: Optional[CommentFetcher] = field(default=None, repr=False)
+    # Record selectors (JSON file); None uses config/selectors.json
+    selectors_path: Optional[str] = None
+    # iter_modules streams the page and stops reading once max_items modules are found
+    stream: bool = False
+    _selectors: Dict[str, SelectorSet] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.engine is None:
+            self.engine = FetchEngine(
+                user_agent=self.user_agent, retries=self.retries, timeout=self.timeout
+            )
+        if self.include_comments and self.comments is None:
+            self.comments = CommentFetcher(engine=self.engine, concurrency=self.engine.concurrency)
+        self._selectors = load_selectors(self.selectors_path)
+
+    def with_comments(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Records with their comment threads fetched (a few at a time) when
+        include_comments is set; otherwise the records unchanged.
+        """
+        if not self.include_comments or self.comments is None:
+            return iter(records)
+        return self.comments.attach_many(records)
 
     def _get(self, url: str) -> Optional[str]:
-        for attempt in range(1, self.retries + 1):
-            try:
-                resp = requests.get(url, headers={"User-Agent": self.user_agent}, timeout=self.timeout)
-                if resp.status_code == 200:
-                    return resp.text
-                logger.warning("GET %s -> %s", url, resp.status_code)
-            except requests.RequestException as exc:
-                logger.warning("GET error (%s/%s): %s", attempt, self.retries, exc)
-                time.sleep(1.5 * attempt)
-        return None
+        return self.engine.get(url)
+
+    def _page(self, url: str) -> Page:
+        if self.cache is not None:
+            return self.cache.get_or_fetch(url, self.engine.fetch)
+        return Page(url=url, html=self._get(url))
 
     def _extract_module_payloads(self, html: str) -> Iterable[Dict]:
-        soup = BeautifulSoup(html, "lxml")
+        return self._payloads_from_page(Page(url="", html=html))
+
+    def _payloads_from_page(self, page: Page) -> Iterable[Dict]:
+        yield from self._payloads_from_tags(page.extraction_tags(self.fast_extract))
+
+    def _payloads_from_tags(self, tags: List[ScriptTag]) -> Iterable[Dict]:
         # Try Next.js payload first
-        next_data = soup.find("script", {"id": "__NEXT_DATA__"})
-        if next_data and next_data.string:
-            try:
-                blob = json.loads(next_data.string)
-                page_props = blob.get("props", {}).get("pageProps", {})
-                # Heuristic keys
-                for key in ["classroom", "modules", "courses", "items", "data"]:
-                    val = page_props.get(key)
-                    if isinstance(val, list):
-                        for it in val:
-                            if isinstance(it, dict):
-                                yield it
-                # If a course object contains modules inside
-                course = page_props.get("course") or page_props.get("classroom")
-                if isinstance(course, dict):
-                    for key in ["modules", "lessons", "items"]:
-                        arr = course.get(key)
-                        if isinstance(arr, list):
-                            for it in arr:
-                                if isinstance(it, dict):
-                                    yield it
-            except json.JSONDecodeError:
-                pass
+        next_data = next((t for t in tags if t.attrs.get("id") == "__NEXT_DATA__"), None)
+        if next_data is not None:
+            yield from self._selectors["nextDataModules"].select(next_data.json())
 
         # Fallback: any LD+JSON with '@type': 'Course' / 'CreativeWork'
-        for tag in soup.find_all("script", {"type": "application/ld+json"}):
-            if not tag.string:
-                continue
-            try:
-                blob = json.loads(tag.string)
-            except json.JSONDecodeError:
-                continue
-            if isinstance(blob, dict):
-                if blob.get("@type") in {"Course", "CreativeWork", "LearningResource"}:
-                    yield blob
-            elif isinstance(blob, list):
-                for b in blob:
-                    if isinstance(b, dict) and b.get("@type") in {
-                        "Course",
-                        "CreativeWork",
-                        "LearningResource",
-                    }:
-                        yield b
+        ld = self._selectors["ldModules"]
+        for tag in tags:
+            if tag.attrs.get("type") == "application/ld+json":
+                yield from ld.select(tag.json())
 
     def iter_modules(self, url: str) -> Generator[Dict, None, None]:
-        html = self._get(url)
-        if not html:
+        if self.stream:
+            yield from self.iter_modules_streamed(url)
+            return
+        yield from self.iter_modules_from_page(self._page(url))
+
+    def iter_modules_streamed(self, url: str) -> Generator[Dict, None, None]:
+        """
+        iter_modules that parses the page while it downloads and drops the
+        connection once max_items modules have been yielded.
+        """
+        tags = TagStream(self.engine.stream(url))
+        try:
+            yield from self.with_comments(itertools.islice(self.iter_payloads_streamed(tags), self.max_items or None))
+        finally:
+            tags.close()
+        if not tags.fetched:
             logger.error("Failed to fetch %s", url)
+
+    def iter_payloads_streamed(self, tags: TagStream) -> Generator[Dict, None, None]:
+        """
+        Module payloads of a page that is still downloading, in
+        _payloads_from_tags order: __NEXT_DATA__ modules as soon as that
+        script closes, then LD+JSON ones. There is no DOM fallback.
+        """
+        next_data = next((t for t in tags if t.attrs.get("id") == "__NEXT_DATA__"), None)
+        if next_data is not None:
+            yield from self._selectors["nextDataModules"].select(next_data.json())
+        ld = self._selectors["ldModules"]
+        for tag in tags:
+            if tag.attrs.get("type") == "application/ld+json":
+                yield from ld.select(tag.json())
+
+    def iter_modules_from_html(self, url: str, html: Optional[str]) -> Generator[Dict, None, None]:
+        yield from self.iter_modules_from_page(Page(url=url, html=html))
+
+    def iter_modules_from_page(self, page: Page) -> Generator[Dict, None, None]:
+        if not page.html:
+            logger.error("Failed to fetch %s", page.url)
             return
-        seen = 0
-        for payload in self._extract_module_payloads(html):
-            yield payload
-            seen += 1
-            if self.max_items and seen >= self.max_items:
-                return
\ No newline at end of file
+        yield from self.with_comments(itertools.islice(self._payloads_from_page(page), self.max_items or None))
\ No newline at end of file
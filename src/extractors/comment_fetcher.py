@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from string import Formatter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+import orjson
+
+from extractors.http_client import FetchEngine, imap_ordered
+from extractors.page_cache import Page
+from extractors.pagination import first_of, pagination_in, with_query
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Where a thread payload keeps its comments (pageProps.postTree.children, API "comments", ...)
+COMMENT_LIST_KEYS = ["comments", "children", "replies", "items"]
+# Per-comment hints that more replies exist than were embedded
+MORE_REPLIES_KEYS = ["hasMoreReplies", "hasMoreChildren", "moreReplies"]
+REPLY_CURSOR_KEYS = ["repliesCursor", "nextRepliesCursor", "childrenCursor"]
+
+def _node(rec: Dict) -> Dict:
+    return rec["post"] if isinstance(rec.get("post"), dict) else rec
+
+def _children(rec: Dict) -> List[Dict]:
+    # Skool nests replies beside the comment ({"post": {...}, "children": [...]}) or inside it
+    for src in (rec, _node(rec)):
+        for key in ("children", "replies"):
+            if isinstance(src.get(key), list):
+                return src[key]
+    return []
+
+def _payload(text: str) -> Any:
+    """
+    A thread response as JSON: an API body, or __NEXT_DATA__ pageProps of an HTML page.
+    """
+    head = text.lstrip()[:1]
+    if head in ("{", "["):
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return None
+    tag = next((t for t in Page(url="", html=text).script_tags() if t.attrs.get("id") == "__NEXT_DATA__"), None)
+    blob = tag.json() if tag else None
+    return blob.get("props", {}).get("pageProps") if isinstance(blob, dict) else None
+
+def find_comments(payload: Any) -> List[Dict]:
+    if isinstance(payload, list):
+        return [c for c in payload if isinstance(c, dict)]
+    if not isinstance(payload, dict):
+        return []
+    for scope in [payload] + [v for v in payload.values() if isinstance(v, dict)]:
+        for key in COMMENT_LIST_KEYS:
+            val = scope.get(key)
+            if isinstance(val, dict) and isinstance(val.get("items"), list):
+                val = val["items"]
+            if isinstance(val, list):
+                return [c for c in val if isinstance(c, dict)]
+    return []
+
+@dataclass
+class CommentFetcher:
+    """
+    Fetches full comment threads for post records.
+
+    `thread_url` is formatted with the record's fields (url, urlAjax, id, name,
+    groupId); by default the record's urlAjax (the comments API) or else its
+    url is used. A thread may be HTML with __NEXT_DATA__ or a JSON body. Thread pages are
+    followed by cursor or page number; a comment flagged as having more
+    replies than embedded gets its replies fetched from the thread URL with
+    `parent_param` set. Nested replies are flattened with parent_id so
+    parsers.comments.normalize_comments can rebuild the tree. Up to
+    `concurrency` threads are fetched at once, one page at a time each.
+    """
+
+    engine: FetchEngine
+    concurrency: int = 3
+    thread_url: Optional[str] = None
+    page_param: str = "p"
+    cursor_param: str = "c"
+    parent_param: str = "parent"
+    max_pages: int = 50
+
+    def url_for(self, rec: Dict) -> Optional[str]:
+        core = _node(rec)
+        fields = {k: core.get(k) or rec.get(k) or "" for k in ("url", "urlAjax", "id", "name", "groupId")}
+        if self.thread_url is None:
+            return str(fields["urlAjax"] or fields["url"]) or None
+        # Every field the template uses must be present
+        names = [name for _, name, _, _ in Formatter().parse(self.thread_url) if name]
+        if any(not fields.get(name) for name in names):
+            return None
+        return self.thread_url.format(**fields)
+
+    def _pages(self, url: str, budget: List[int]) -> Iterator[List[Dict]]:
+        number, next_url = 1, url
+        while next_url and budget[0] > 0:
+            budget[0] -= 1
+            res = self.engine.fetch(next_url)
+            if not res.ok:
+                logger.warning("Failed to fetch comments %s", next_url)
+                return
+            payload = _payload(res.text)
+            comments = find_comments(payload)
+            yield comments
+            if not comments:
+                return
+            info = pagination_in(payload)
+            number += 1
+            if info.cursor:
+                next_url = with_query(url, **{self.cursor_param: info.cursor})
+            elif info.has_more or (info.total_pages and number <= info.total_pages):
+                next_url = with_query(url, **{self.page_param: number})
+            else:
+                next_url = None
+
+    def _flatten(self, comments: Iterable[Dict], parent: str, url: str, budget: List[int], seen: Set[str]) -> Iterator[Dict]:
+        for rec in comments:
+            node = _node(rec)
+            cid = str(node.get("id") or node.get("comment_id") or "")
+            if cid and cid in seen:
+                continue
+            seen.add(cid)
+            if parent and not node.get("parent_id"):
+                node = dict(node, parent_id=parent)
+            yield {"post": {k: v for k, v in node.items() if k not in ("children", "replies")}}
+            yield from self._flatten(_children(rec), cid, url, budget, seen)
+            if cid and (first_of(rec, MORE_REPLIES_KEYS) or first_of(node, MORE_REPLIES_KEYS)):
+                params = {self.parent_param: cid}
+                cursor = first_of(rec, REPLY_CURSOR_KEYS) or first_of(node, REPLY_CURSOR_KEYS)
+                if cursor is not None:
+                    params[self.cursor_param] = cursor
+                for page in self._pages(with_query(url, **params), budget):
+                    yield from self._flatten(page, cid, url, budget, seen)
+
+    def fetch_thread(self, url: str) -> List[Dict]:
+        """
+        Every comment of the thread at `url`, flat, in page order.
+        """
+        budget = [self.max_pages]
+        seen: Set[str] = set()
+        out: List[Dict] = []
+        for page in self._pages(url, budget):
+            out.extend(self._flatten(page, "", url, budget, seen))
+        return out
+
+    def attach(self, rec: Dict) -> Dict:
+        """
+        `rec` with "comments" replaced by its fetched thread; unchanged when the
+        record has no thread URL or nothing could be fetched.
+        """
+        url = self.url_for(rec)
+        if not url:
+            return rec
+        comments = self.fetch_thread(url)
+        if not comments:
+            return rec
+        out = dict(rec)
+        if isinstance(rec.get("post"), dict):
+            out["post"] = dict(rec["post"], comments=comments)
+        else:
+            out["comments"] = comments
+        return out
+
+    def attach_many(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        attach() over `records` with up to `concurrency` threads in flight;
+        records come back in input order.
+        """
+        return imap_ordered(self.attach, records, workers=self.concurrency)
\ No newline at end of file
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-import json
+import itertools
 import logging
-import re
-import time
-from dataclasses import dataclass
-from typing import Dict, Generator, Iterable, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Optional, Set
 
-import requests
-from bs4 import BeautifulSoup
+from extractors.comment_fetcher import CommentFetcher
+from extractors.http_client import DEFAULT_USER_AGENT, FetchEngine
+from extractors.page_cache import Page, PageCache
+from extractors.scripts import ScriptTag, TagStream
+from extractors.selectors import SelectorSet, load_selectors
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -22,110 +23,141 @@ SCRIPT_JSON_SELECTORS = [
 
 @dataclass
 class CommunityScraper:
-    include_comments: bool = True
+    # Opt-in: fetches every post's thread page (one request per post)
+    include_comments: bool = False
     max_items: Optional[int] = None
-    user_agent: str = (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-        "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
-    )
+    user_agent: str = DEFAULT_USER_AGENT
     retries: int = 3
     timeout: int = 20
+    engine: Optional[FetchEngine] = field(default=None, repr=False)
+    # Scan <script> tags directly; the BeautifulSoup DOM is only built as a fallback
+    fast_extract: bool = True
+    # Optional per-run cache shared with ClassroomScraper
+    cache: Optional[PageCache] = field(default=None, repr=False)
+    # Fetches full comment threads when include_comments is set
+    comments: Optional[CommentFetcher] = field(default=None, repr=False)
+    # Record selectors (JSON file); None uses config/selectors.json
+    selectors_path: Optional[str] = None
+    # iter_items streams the page and stops reading once max_items records are found
+    stream: bool = False
+    _selectors: Dict[str, SelectorSet] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.engine is None:
+            self.engine = FetchEngine(
+                user_agent=self.user_agent, retries=self.retries, timeout=self.timeout
+            )
+        if self.include_comments and self.comments is None:
+            self.comments = CommentFetcher(engine=self.engine, concurrency=self.engine.concurrency)
+        self._selectors = load_selectors(self.selectors_path)
+
+    def with_comments(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Records with their comment threads fetched (a few at a time) when
+        include_comments is set; otherwise the records unchanged.
+        """
+        if not self.include_comments or self.comments is None:
+            return iter(records)
+        return self.comments.attach_many(records)
 
     def _get(self, url: str) -> Optional[str]:
-        for attempt in range(1, self.retries + 1):
-            try:
-                resp = requests.get(url, headers={"User-Agent": self.user_agent}, timeout=self.timeout)
-                if resp.status_code == 200:
-                    return resp.text
-                logger.warning("GET %s -> %s", url, resp.status_code)
-            except requests.RequestException as exc:
-                logger.warning("GET error (%s/%s): %s", attempt, self.retries, exc)
-                time.sleep(1.5 * attempt)
-        return None
+        return self.engine.get(url)
+
+    def _page(self, url: str) -> Page:
+        if self.cache is not None:
+            return self.cache.get_or_fetch(url, self.engine.fetch)
+        return Page(url=url, html=self._get(url))
 
     def _extract_json_blobs(self, html: str) -> Iterable[Dict]:
-        soup = BeautifulSoup(html, "lxml")
+        return self._blobs_from_page(Page(url="", html=html))
+
+    def _blobs_from_page(self, page: Page) -> Iterable[Dict]:
+        yield from self._blobs_from_tags(page.extraction_tags(self.fast_extract))
+
+    def _blobs_from_tags(self, tags: List[ScriptTag], consumed: Optional[Set[int]] = None) -> Iterable[Dict]:
+        # Scripts already yielded whole; the generic scan would decode them again
+        consumed = set(consumed or ())
         # Try named script first
         for sel in SCRIPT_JSON_SELECTORS:
             if "name" in sel:
-                tag = soup.find("script", {"id": sel["name"]})
-                if tag and tag.string:
-                    try:
-                        yield json.loads(tag.string)
-                    except json.JSONDecodeError:
-                        pass
+                tag = next((t for t in tags if t.attrs.get("id") == sel["name"]), None)
+                if tag and id(tag) not in consumed and tag.json() is not None:
+                    consumed.add(id(tag))
+                    yield tag.json()
             elif "type" in sel:
-                for tag in soup.find_all("script", {"type": sel["type"]}):
-                    if not tag.string:
-                        continue
-                    try:
-                        yield json.loads(tag.string)
-                    except json.JSONDecodeError:
-                        continue
+                for tag in tags:
+                    if tag.attrs.get("type") == sel["type"] and id(tag) not in consumed and tag.json() is not None:
+                        consumed.add(id(tag))
+                        yield tag.json()
 
         # Generic inline JSON candidates
-        for tag in soup.find_all("script"):
-            content = tag.string or ""
-            if "{" in content and "}" in content:
-                # Heuristic: try to find large JSON blocks
-                m = re.search(r"(\{.*\})", content, flags=re.DOTALL)
-                if m:
-                    block = m.group(1)
-                    try:
-                        yield json.loads(block)
-                    except Exception:
-                        continue
-
-    def _coerce_post_records(self, blob: Dict) -> Iterable[Dict]:
+        for tag in tags:
+            if id(tag) in consumed:
+                continue
+            blob = tag.inline_json()
+            if blob is not None:
+                yield blob
+
+    def _coerce_post_records(self, blob: Any) -> List[Dict]:
         """
-        Attempts to find post-like records inside the blob.
+        Post-like records inside the blob, found by the "posts" selectors.
         Returns dictionaries that parsers.posts.normalize_post can handle.
         """
-        # Strategy 1: Next data with pageProps
-        page_props = (
-            blob.get("props", {})
-            .get("pageProps", {})
-        )
-        if isinstance(page_props, dict):
-            # Heuristic containers
-            candidates = []
-            for key in ["posts", "items", "feed", "data"]:
-                val = page_props.get(key)
-                if isinstance(val, list):
-                    candidates.extend(val)
-                elif isinstance(val, dict) and "items" in val and isinstance(val["items"], list):
-                    candidates.extend(val["items"])
-            for rec in candidates:
-                if isinstance(rec, dict):
-                    yield rec
-
-        # Strategy 2: top-level list
-        if isinstance(blob, list):
-            for rec in blob:
-                if isinstance(rec, dict):
-                    yield rec
-
-        # Strategy 3: nested data keys
-        for key in ["data", "payload", "result", "collection"]:
-            val = blob.get(key)
-            if isinstance(val, list):
-                for rec in val:
-                    if isinstance(rec, dict):
-                        yield rec
+        return self._selectors["posts"].select(blob)
 
     def iter_items(self, url: str) -> Generator[Dict, None, None]:
         """
         Yields raw post dicts discovered on the page. Comment inclusion depends on downstream parser/normalizer.
         """
-        html = self._get(url)
-        if not html:
+        if self.stream:
+            yield from self.iter_items_streamed(url)
+            return
+        yield from self.iter_items_from_page(self._page(url))
+
+    def iter_items_streamed(self, url: str) -> Generator[Dict, None, None]:
+        """
+        iter_items that parses the page while it downloads and drops the
+        connection once max_items records have been yielded.
+        """
+        tags = TagStream(self.engine.stream(url))
+        try:
+            yield from self.with_comments(itertools.islice(self.iter_records_streamed(tags), self.max_items or None))
+        finally:
+            tags.close()
+        if not tags.fetched:
             logger.error("Failed to fetch %s", url)
+
+    def iter_items_from_html(self, url: str, html: Optional[str]) -> Generator[Dict, None, None]:
+        yield from self.iter_items_from_page(Page(url=url, html=html))
+
+    def iter_items_from_page(self, page: Page) -> Generator[Dict, None, None]:
+        """
+        Same as iter_items, for a page that was already fetched (e.g. through PageCache.fetch_many).
+        """
+        if not page.html:
+            logger.error("Failed to fetch %s", page.url)
             return
 
-        seen = 0
-        for blob in self._extract_json_blobs(html):
-            for rec in self._coerce_post_records(blob):
-                yield rec
-                seen += 1
-                if self.max_items and seen >= self.max_items:
-                    return
\ No newline at end of file
+        yield from self.with_comments(itertools.islice(self.iter_records(page), self.max_items or None))
+
+    def iter_records(self, page: Page) -> Generator[Dict, None, None]:
+        """
+        All post records found on the page, without the max_items cap.
+        """
+        for blob in self._blobs_from_page(page):
+            yield from self._coerce_post_records(blob)
+
+    def iter_records_streamed(self, tags: TagStream) -> Generator[Dict, None, None]:
+        """
+        iter_records for a page that is still downloading. __NEXT_DATA__ comes
+        first in iter_records order, so its records are yielded as soon as that
+        script closes; the rest of the page is read only if more are asked for.
+        There is no DOM fallback.
+        """
+        consumed: Set[int] = set()
+        next_data = next((t for t in tags if t.attrs.get("id") == "__NEXT_DATA__"), None)
+        if next_data is not None and next_data.json() is not None:
+            consumed.add(id(next_data))
+            yield from self._coerce_post_records(next_data.json())
+        for blob in self._blobs_from_tags(list(tags), consumed):
+            yield from self._coerce_post_records(blob)
\ No newline at end of file
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import itertools
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from extractors.community_scraper import CommunityScraper
+from extractors.page_cache import Page, PageCache
+from extractors.pagination import Pagination, pagination_in, with_query
+from extractors.utils_time import to_iso
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+@dataclass
+class _Budget:
+    remaining: Optional[int] = None
+    stop: bool = False
+
+@dataclass
+class FeedPage:
+    number: int
+    page: Page
+    records: List[Dict] = field(default_factory=list)
+
+def find_pagination(page: Page) -> Pagination:
+    """
+    Read paging hints from __NEXT_DATA__ pageProps, or from a dict directly
+    under it (e.g. pageProps.feed.nextCursor).
+    """
+    tag = next((t for t in page.script_tags() if t.attrs.get("id") == "__NEXT_DATA__"), None)
+    blob = tag.json() if tag else None
+    props = blob.get("props", {}).get("pageProps", {}) if isinstance(blob, dict) else {}
+    return pagination_in(props)
+
+def _created_at(rec: Dict) -> Optional[datetime]:
+    core = rec.get("post") if isinstance(rec.get("post"), dict) else rec
+    iso = to_iso(core.get("createdAt") or core.get("created_at"))
+    return datetime.fromisoformat(iso) if iso else None
+
+def _record_ids(records: List[Dict]) -> Set[str]:
+    ids = set()
+    for rec in records:
+        core = rec.get("post") if isinstance(rec.get("post"), dict) else rec
+        if core.get("id"):
+            ids.add(str(core["id"]))
+    return ids
+
+def _pinned(rec: Dict) -> bool:
+    meta = rec.get("metadata") or {}
+    return bool(meta.get("pinned") if isinstance(meta, dict) else False)
+
+@dataclass
+class FeedCrawler:
+    """
+    Follows a community feed past its first page.
+
+    Numbered feeds (pageProps page / totalPages / hasMore) are fetched with up to
+    `concurrency` later pages in flight; cursor feeds can only go one page at a
+    time. Stops at the last page (as reported by any page), an empty page, a
+    page that only repeats records already seen (a server ignoring the page
+    parameter), `max_pages`, the scraper's max_items, or the first non-pinned
+    post older than `since`.
+    """
+
+    scraper: CommunityScraper
+    cache: PageCache = field(default_factory=PageCache)
+    concurrency: int = 3
+    max_pages: Optional[int] = None
+    since: Optional[datetime] = None
+    page_param: str = "p"
+    cursor_param: str = "c"
+
+    def __post_init__(self) -> None:
+        if self.since is not None and self.since.tzinfo is None:
+            self.since = self.since.replace(tzinfo=timezone.utc)
+
+    def crawl(self, url: str) -> Iterator[FeedPage]:
+        yield from self.crawl_from(self.cache.get_or_fetch(url, self.scraper.engine.fetch))
+
+    def crawl_from(self, first: Page) -> Iterator[FeedPage]:
+        """
+        Crawl starting from an already fetched first page.
+        """
+        if not first.html:
+            logger.error("Failed to fetch %s", first.url)
+            return
+        budget = _Budget(remaining=self.scraper.max_items)
+
+        feed = self._take(1, first, budget)
+        seen = _record_ids(feed.records)
+        yield feed
+        info = find_pagination(first)
+        if budget.stop or info.has_more is False:
+            return
+
+        if info.total_pages or info.page is not None or (info.has_more and not info.cursor):
+            start = (info.page or 1) + 1
+            last = info.total_pages
+            if self.max_pages:
+                last = min(last or self.max_pages, self.max_pages)
+            numbers: Iterable[int] = range(start, last + 1) if last else itertools.count(start)
+            pages = self.cache.fetch_many(
+                (with_query(first.url, **{self.page_param: n}) for n in numbers),
+                self.scraper.engine.fetch,
+                workers=self.concurrency,
+            )
+            try:
+                for number, page in zip(itertools.count(start), pages):
+                    feed = self._take(number, page, budget)
+                    if (not feed.records and not budget.stop) or self._repeats(feed, seen):
+                        return
+                    yield feed
+                    if budget.stop:
+                        return
+                    # Later pages may know better than the first where the feed ends
+                    info = find_pagination(page)
+                    if info.has_more is False or (info.total_pages and number >= info.total_pages):
+                        return
+            finally:
+                pages.close()
+            return
+
+        number, cursor = 1, info.cursor
+        while cursor and not (self.max_pages and number >= self.max_pages):
+            number += 1
+            page = self.cache.get_or_fetch(
+                with_query(first.url, **{self.cursor_param: cursor}), self.scraper.engine.fetch
+            )
+            feed = self._take(number, page, budget)
+            if (not feed.records and not budget.stop) or self._repeats(feed, seen):
+                return
+            yield feed
+            if budget.stop:
+                return
+            cursor = find_pagination(page).cursor
+
+    def _repeats(self, feed: FeedPage, seen: Set[str]) -> bool:
+        ids = _record_ids(feed.records)
+        if ids and ids <= seen:
+            logger.warning("Page %s of %s only repeats earlier records, stopping", feed.number, feed.page.url)
+            return True
+        seen |= ids
+        return False
+
+    def _take(self, number: int, page: Page, budget: _Budget) -> FeedPage:
+        feed = FeedPage(number=number, page=page)
+        if not page.html:
+            logger.error("Failed to fetch %s", page.url)
+            budget.stop = True
+            return feed
+        for rec in self.scraper.iter_records(page):
+            if self.since is not None and not _pinned(rec):
+                created = _created_at(rec)
+                if created is not None and created < self.since:
+                    # Feed is newest first: everything after this is older too
+                    budget.stop = True
+                    continue
+            feed.records.append(rec)
+            if budget.remaining is not None:
+                budget.remaining -= 1
+                if budget.remaining <= 0:
+                    budget.stop = True
+                    break
+        return feed
\ No newline at end of file
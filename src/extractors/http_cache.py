@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Tuple
+
+@dataclass
+class CachedResponse:
+    url: str
+    body: str
+    etag: str = ""
+    last_modified: str = ""
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+@dataclass
+class HttpCache:
+    """
+    Disk-backed response cache keyed by URL, used for conditional revalidation.
+
+    Every entry is a small JSON metadata file (validators, last use, size) next to
+    a gzip-compressed body. Entries unused for `max_age` seconds are dropped, and
+    the least recently used ones go first once the bodies exceed `max_bytes`,
+    down to `low_water` of it so a full cache is not pruned on every store.
+    The directory is scanned once at startup; after that sizes and last use
+    are tracked in memory.
+    """
+
+    path: str
+    max_bytes: int = 512 * 1024 * 1024
+    max_age: Optional[float] = 7 * 24 * 3600
+    low_water: float = 0.9
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    _bytes: int = field(default=0, repr=False)
+    # key -> (usedAt, size), least recently used first
+    _entries: "OrderedDict[str, Tuple[float, int]]" = field(default_factory=OrderedDict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        self.prune()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _files(self, url: str) -> Tuple[str, str]:
+        base = os.path.join(self.path, self._key(url))
+        return base + ".json", base + ".body.gz"
+
+    def _remove(self, key: str) -> None:
+        base = os.path.join(self.path, key)
+        for p in (base + ".json", base + ".body.gz"):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+    def _read_meta(self, meta_path: str) -> Optional[Dict]:
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta_path: str, meta: Dict) -> None:
+        tmp = f"{meta_path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, meta_path)
+
+    def load(self, url: str) -> Optional[CachedResponse]:
+        meta_path, body_path = self._files(url)
+        meta = self._read_meta(meta_path)
+        if not meta or meta.get("url") != url:
+            return None
+        if self.max_age is not None and time.time() - meta.get("usedAt", 0) > self.max_age:
+            return None
+        try:
+            with gzip.open(body_path, "rt", encoding="utf-8") as f:
+                body = f.read()
+        except (OSError, EOFError):
+            return None
+        return CachedResponse(
+            url=url,
+            body=body,
+            etag=meta.get("etag", ""),
+            last_modified=meta.get("lastModified", ""),
+        )
+
+    def store(self, url: str, body: str, headers: Mapping[str, str]) -> bool:
+        """
+        Save a 200 response. Responses without validators are not cached, since
+        they could never be revalidated.
+        """
+        etag = headers.get("ETag", "")
+        last_modified = headers.get("Last-Modified", "")
+        if not etag and not last_modified:
+            return False
+        meta_path, body_path = self._files(url)
+        tmp = f"{body_path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=5) as f:
+            f.write(body)
+        os.replace(tmp, body_path)
+        size = os.path.getsize(body_path)
+        now = time.time()
+        self._write_meta(
+            meta_path,
+            {"url": url, "etag": etag, "lastModified": last_modified, "usedAt": now, "size": size},
+        )
+        key = self._key(url)
+        with self._lock:
+            self.stores += 1
+            _, previous = self._entries.pop(key, (0.0, 0))
+            self._entries[key] = (now, size)
+            self._bytes += size - previous
+            victims = self._evict(now) if self._bytes > self.max_bytes else []
+        for victim in victims:
+            self._remove(victim)
+        return True
+
+    def touch(self, url: str) -> None:
+        """
+        Record a successful revalidation (304) so the entry is not aged out.
+        """
+        meta_path, _ = self._files(url)
+        meta = self._read_meta(meta_path)
+        if meta:
+            meta["usedAt"] = time.time()
+            self._write_meta(meta_path, meta)
+            key = self._key(url)
+            with self._lock:
+                if key in self._entries:
+                    self._entries[key] = (meta["usedAt"], self._entries[key][1])
+                    self._entries.move_to_end(key)
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _evict(self, now: float) -> List[str]:
+        """
+        Drop expired entries and, once over `max_bytes`, the least recently
+        used ones down to the low-water mark. Returns the keys whose files
+        must be removed; call with the lock held.
+        """
+        victims: List[str] = []
+        # Entries are ordered by last use, so expired ones sit at the front
+        while self.max_age is not None and self._entries:
+            key, (used_at, size) = next(iter(self._entries.items()))
+            if now - used_at <= self.max_age:
+                break
+            del self._entries[key]
+            self._bytes -= size
+            victims.append(key)
+        if self._bytes > self.max_bytes:
+            target = self.max_bytes * self.low_water
+            while self._entries and self._bytes > target:
+                key, (_, size) = self._entries.popitem(last=False)
+                self._bytes -= size
+                victims.append(key)
+        return victims
+
+    def prune(self) -> None:
+        """
+        Rescan the directory (e.g. after another process wrote to it) and
+        drop expired and excess entries.
+        """
+        entries: List[Tuple[float, int, str]] = []
+        for name in os.listdir(self.path):
+            if not name.endswith(".json"):
+                continue
+            meta = self._read_meta(os.path.join(self.path, name)) or {}
+            entries.append((meta.get("usedAt", 0), int(meta.get("size", 0)), name[: -len(".json")]))
+        entries.sort()
+        with self._lock:
+            self._entries = OrderedDict((key, (used_at, size)) for used_at, size, key in entries)
+            self._bytes = sum(size for _, size, _ in entries)
+            victims = self._evict(time.time())
+        for victim in victims:
+            self._remove(victim)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "stores": self.stores, "bytes": self._bytes}
\ No newline at end of file
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import codecs
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Generator, Iterable, Iterator, Optional, TypeVar
+
+from extractors.http_cache import HttpCache
+from extractors.rate_limit import RETRYABLE_STATUSES, RateLimiter, backoff_delay, parse_retry_after
+
+if TYPE_CHECKING:
+    import requests
+
+    from extractors.capture import CaptureWriter
+    from metrics import RunMetrics
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+# Read size for stream(); small enough to stop soon after the last needed byte
+STREAM_CHUNK = 64 * 1024
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+def imap_ordered(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    workers: int,
+    window: Optional[int] = None,
+) -> Iterator[R]:
+    """
+    Like map(), but runs fn on a thread pool with at most `window` calls in flight.
+    Results are yielded in input order; `items` is consumed lazily.
+    """
+    workers = max(1, workers)
+    window = max(workers, window or workers * 2)
+    pending: Deque[Future] = deque()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch")
+    try:
+        for it in items:
+            pending.append(pool.submit(fn, it))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for fut in pending:
+            fut.cancel()
+        pool.shutdown(wait=True)
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int = 0
+    text: Optional[str] = None
+    # True when the server answered 304 and `text` came from the HttpCache
+    not_modified: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (200, 304) and self.text is not None
+
+@dataclass
+class FetchEngine:
+    """
+    Shared HTTP client for the scrapers: one keep-alive session plus ordered
+    concurrent fetching. Page fetches and comment-thread fetches each run up
+    to `concurrency` threads on it, so the connection pool holds both.
+    """
+
+    user_agent: str = DEFAULT_USER_AGENT
+    retries: int = 3
+    timeout: int = 20
+    concurrency: int = 3
+    http_cache: Optional[HttpCache] = None
+    limiter: Optional[RateLimiter] = None
+    backoff_base: float = 1.0
+    backoff_cap: float = 60.0
+    # Receives per-request latency and response size
+    metrics: Optional[RunMetrics] = None
+    # Archives every page served (--capture) for refetch-free re-parsing
+    capture: Optional[CaptureWriter] = None
+    requests_made: int = 0
+    retried: int = 0
+    backoff_seconds: float = 0.0
+    _session: Optional[requests.Session] = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            # Imported on first use so offline runs never load requests
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            sess = requests.Session()
+            # Page fetch threads and CommentFetcher threads share the pool
+            size = 2 * max(1, self.concurrency)
+            adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+            sess.mount("http://", adapter)
+            sess.mount("https://", adapter)
+            sess.headers["User-Agent"] = self.user_agent
+            self._session = sess
+        return self._session
+
+    def _backoff(self, attempt: int, retry_after: Optional[float] = None) -> None:
+        delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap, retry_after)
+        with self._lock:
+            self.retried += 1
+            self.backoff_seconds += delay
+        time.sleep(delay)
+
+    def fetch(self, url: str) -> FetchResult:
+        import requests
+
+        cached = self.http_cache.load(url) if self.http_cache is not None else None
+        headers = cached.conditional_headers() if cached else {}
+        status = 0
+        for attempt in range(1, self.retries + 1):
+            if self.limiter is not None:
+                self.limiter.acquire(url)
+            with self._lock:
+                self.requests_made += 1
+            t0 = time.perf_counter()
+            try:
+                resp = self.session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as exc:
+                logger.warning("GET error (%s/%s): %s", attempt, self.retries, exc)
+                if self.limiter is not None:
+                    self.limiter.record_failure(url)
+                if attempt < self.retries:
+                    self._backoff(attempt)
+                continue
+            if self.metrics is not None:
+                self.metrics.observe_fetch(time.perf_counter() - t0, len(resp.content))
+            status = resp.status_code
+            if status in (200, 304) and self.limiter is not None:
+                self.limiter.record_success(url)
+            if status == 304 and cached:
+                self.http_cache.touch(url)
+                self.http_cache.record(hit=True)
+                if self.capture is not None:
+                    self.capture.write(url, status, resp.headers, cached.body)
+                return FetchResult(url=url, status=status, text=cached.body, not_modified=True)
+            if status == 200:
+                if self.http_cache is not None:
+                    self.http_cache.record(hit=False)
+                    self.http_cache.store(url, resp.text, resp.headers)
+                if self.capture is not None:
+                    self.capture.write(url, status, resp.headers, resp.text)
+                return FetchResult(url=url, status=status, text=resp.text)
+            logger.warning("GET %s -> %s", url, status)
+            if status not in RETRYABLE_STATUSES:
+                break
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            if self.limiter is not None:
+                self.limiter.record_failure(url, status, retry_after)
+            if attempt < self.retries:
+                self._backoff(attempt, retry_after)
+        return FetchResult(url=url, status=status)
+
+    def stream(self, url: str, chunk_size: int = STREAM_CHUNK) -> Generator[str, None, bool]:
+        """
+        The body of `url` as decoded text chunks, as they arrive. Closing the
+        generator early drops the connection, so the rest of the page is never
+        downloaded. Retries happen before the first byte only; a page that
+        cannot be fetched yields nothing. Bypasses the HttpCache.
+
+        The generator returns (StopIteration.value) False when the page could
+        not be fetched or the body broke off, True when it was read in full.
+        """
+        import requests
+
+        resp = None
+        for attempt in range(1, self.retries + 1):
+            if self.limiter is not None:
+                self.limiter.acquire(url)
+            with self._lock:
+                self.requests_made += 1
+            t0 = time.perf_counter()
+            try:
+                resp = self.session.get(url, timeout=self.timeout, stream=True)
+            except requests.RequestException as exc:
+                logger.warning("GET error (%s/%s): %s", attempt, self.retries, exc)
+                if self.limiter is not None:
+                    self.limiter.record_failure(url)
+                if attempt < self.retries:
+                    self._backoff(attempt)
+                continue
+            status = resp.status_code
+            if status == 200:
+                if self.limiter is not None:
+                    self.limiter.record_success(url)
+                break
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            resp.close()
+            resp = None
+            logger.warning("GET %s -> %s", url, status)
+            if status not in RETRYABLE_STATUSES:
+                return False
+            if self.limiter is not None:
+                self.limiter.record_failure(url, status, retry_after)
+            if attempt < self.retries:
+                self._backoff(attempt, retry_after)
+        if resp is None:
+            return False
+        decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+        received = 0
+        try:
+            for chunk in resp.iter_content(chunk_size):
+                received += len(chunk)
+                text = decoder.decode(chunk)
+                if text:
+                    yield text
+            text = decoder.decode(b"", final=True)
+            if text:
+                yield text
+        except requests.RequestException as exc:
+            # Reset connection, body shorter than Content-Length, ...
+            logger.warning("GET %s broke off after %s bytes: %s", url, received, exc)
+            return False
+        finally:
+            resp.close()
+            if self.metrics is not None:
+                self.metrics.observe_fetch(time.perf_counter() - t0, received)
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        out: Dict[str, float] = {
+            "requests": self.requests_made,
+            "retries": self.retried,
+            "backoffSeconds": round(self.backoff_seconds, 3),
+        }
+        if self.limiter is not None:
+            out.update(self.limiter.stats())
+        return out
+
+    def get(self, url: str) -> Optional[str]:
+        return self.fetch(url).text
+
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[FetchResult]:
+        """
+        Fetch `urls` with up to `concurrency` requests in flight.
+        Results come back in the same order as `urls`.
+        """
+        return imap_ordered(self.fetch, urls, workers=self.concurrency)
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
\ No newline at end of file
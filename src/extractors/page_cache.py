@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from extractors.http_client import FetchResult, imap_ordered
+from extractors.scripts import ScriptTag, iter_script_tags, soup_script_tags
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+@dataclass
+class Page:
+    """
+    A fetched page plus its lazily scanned <script> tags. Tags cache their own
+    decoded JSON, so several extractors reading one Page decode it only once.
+    """
+
+    url: str
+    html: Optional[str] = None
+    # Served from the on-disk HttpCache after a 304: content is unchanged since the last run
+    not_modified: bool = False
+    _tags: Dict[bool, List[ScriptTag]] = field(default_factory=dict, repr=False)
+
+    def script_tags(self, fast: bool = True) -> List[ScriptTag]:
+        if fast not in self._tags:
+            if not self.html:
+                self._tags[fast] = []
+            elif fast:
+                self._tags[fast] = list(iter_script_tags(self.html))
+            else:
+                self._tags[fast] = list(soup_script_tags(self.html))
+        return self._tags[fast]
+
+    def extraction_tags(self, fast: bool = True) -> List[ScriptTag]:
+        """
+        The tags the scrapers extract from: the fast scan, falling back to the
+        DOM parse only when the scanner could not read the page (no <script>
+        found at all, or it failed). A page whose scripts simply hold nothing
+        of interest is not parsed a second time.
+        """
+        if fast and self.html:
+            try:
+                tags = self.script_tags(fast=True)
+            except Exception as exc:
+                logger.warning("Script scan failed for %s, using the DOM parser: %s", self.url or "page", exc)
+            else:
+                if tags:
+                    return tags
+        return self.script_tags(fast=False)
+
+    @property
+    def size(self) -> int:
+        return len(self.html or "")
+
+@dataclass
+class PageCache:
+    """
+    Per-run LRU of fetched pages, bounded by page count and total HTML size.
+    Concurrent requests for the same URL wait for the first fetch instead of
+    downloading it again.
+    """
+
+    max_pages: int = 32
+    max_bytes: int = 64 * 1024 * 1024
+    hits: int = 0
+    misses: int = 0
+    _pages: "OrderedDict[str, Page]" = field(default_factory=OrderedDict, repr=False)
+    _bytes: int = field(default=0, repr=False)
+    _inflight: Dict[str, threading.Event] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def get(self, url: str) -> Optional[Page]:
+        with self._lock:
+            page = self._pages.get(url)
+            if page is not None:
+                self._pages.move_to_end(url)
+            return page
+
+    def put(self, page: Page) -> Page:
+        with self._lock:
+            old = self._pages.pop(page.url, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._pages[page.url] = page
+            self._bytes += page.size
+            while self._pages and (len(self._pages) > self.max_pages or self._bytes > self.max_bytes):
+                _, evicted = self._pages.popitem(last=False)
+                self._bytes -= evicted.size
+        return page
+
+    def get_or_fetch(self, url: str, fetch: Callable[[str], FetchResult]) -> Page:
+        while True:
+            with self._lock:
+                page = self._pages.get(url)
+                if page is not None:
+                    self._pages.move_to_end(url)
+                    self.hits += 1
+                    return page
+                waiter = self._inflight.get(url)
+                if waiter is None:
+                    self._inflight[url] = threading.Event()
+                    self.misses += 1
+                    break
+            waiter.wait()
+            # Owner finished; loop picks the page up (or fetches if it failed)
+        try:
+            res = fetch(url)
+            page = Page(url=url, html=res.text, not_modified=res.not_modified)
+            # Failed fetches are not cached so a later reader can retry
+            if page.html:
+                self.put(page)
+            return page
+        finally:
+            with self._lock:
+                self._inflight.pop(url).set()
+
+    def fetch_many(self, urls: Iterable[str], fetch: Callable[[str], FetchResult], workers: int) -> Iterator[Page]:
+        """
+        Ordered, concurrent get_or_fetch over `urls`.
+        """
+        return imap_ordered(lambda u: self.get_or_fetch(u, fetch), urls, workers=workers)
\ No newline at end of file
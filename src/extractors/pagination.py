@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+CURSOR_KEYS = ["nextCursor", "next_cursor", "endCursor", "nextPageCursor"]
+PAGE_KEYS = ["page", "currentPage", "pageNumber"]
+TOTAL_PAGES_KEYS = ["totalPages", "pageCount", "numPages", "total_pages"]
+HAS_MORE_KEYS = ["hasMore", "hasNextPage", "has_more"]
+
+@dataclass
+class Pagination:
+    page: Optional[int] = None
+    total_pages: Optional[int] = None
+    cursor: Optional[str] = None
+    has_more: Optional[bool] = None
+
+def first_of(d: Dict, keys: List[str]) -> Any:
+    for key in keys:
+        if d.get(key) not in (None, ""):
+            return d[key]
+    return None
+
+def pagination_in(props: Any) -> Pagination:
+    """
+    Paging hints from a payload dict, or from a dict directly under it
+    (e.g. pageProps.feed.nextCursor).
+    """
+    if not isinstance(props, dict):
+        return Pagination()
+    scopes = [props] + [v for v in props.values() if isinstance(v, dict)]
+    info = Pagination()
+    for scope in scopes:
+        if info.cursor is None:
+            cursor = first_of(scope, CURSOR_KEYS)
+            info.cursor = str(cursor) if cursor is not None else None
+        if info.page is None and isinstance(first_of(scope, PAGE_KEYS), int):
+            info.page = first_of(scope, PAGE_KEYS)
+        if info.total_pages is None and isinstance(first_of(scope, TOTAL_PAGES_KEYS), int):
+            info.total_pages = first_of(scope, TOTAL_PAGES_KEYS)
+        if info.has_more is None and first_of(scope, HAS_MORE_KEYS) is not None:
+            info.has_more = bool(first_of(scope, HAS_MORE_KEYS))
+    return info
+
+def with_query(url: str, **params: Any) -> str:
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.update({k: str(v) for k, v in params.items()})
+    return urlunsplit(parts._replace(query=urlencode(query)))
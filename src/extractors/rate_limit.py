@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+# Statuses worth retrying after a pause; any other non-200 is final
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After as seconds to wait; accepts both delta-seconds and HTTP-date.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0, retry_after: Optional[float] = None) -> float:
+    """
+    Exponential backoff with full jitter; an explicit Retry-After wins.
+    """
+    if retry_after is not None:
+        return min(retry_after, cap)
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+@dataclass
+class TokenBucket:
+    rate: float
+    burst: float = 1.0
+    _tokens: float = field(default=-1.0, repr=False)
+    _updated: float = field(default_factory=time.monotonic, repr=False)
+
+    def __post_init__(self) -> None:
+        if self._tokens < 0:
+            self._tokens = self.burst
+
+    def reserve(self, now: float) -> float:
+        """
+        Take one token and return how long the caller must wait before using it.
+        Not thread-safe on its own; RateLimiter serializes access.
+        """
+        # `now` may lie in the future when the host is paused; never refill backwards
+        self._tokens = min(self.burst, self._tokens + max(0.0, now - self._updated) * self.rate)
+        self._updated = max(self._updated, now)
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+@dataclass
+class _Host:
+    bucket: Optional[TokenBucket]
+    failures: int = 0
+    paused_until: float = 0.0
+
+@dataclass
+class RateLimiter:
+    """
+    Per-host request pacing shared by every scraper using the same FetchEngine.
+
+    Each host gets a token bucket (`rate` requests/s, `burst` at once; rate 0
+    disables pacing). Throttling responses halve the host's rate, successes
+    slowly restore it. Retry-After pauses the whole host (for at most
+    `cooldown_cap` seconds, like backoff_delay's cap), and after
+    `failure_threshold` consecutive failures the host is paused for `cooldown`
+    seconds (circuit breaker).
+    """
+
+    rate: float = 5.0
+    burst: float = 3.0
+    min_rate: float = 0.2
+    failure_threshold: int = 5
+    cooldown: float = 60.0
+    cooldown_cap: float = 60.0
+    wait_seconds: float = 0.0
+    throttled: int = 0
+    circuit_opens: int = 0
+    _hosts: Dict[str, _Host] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _host(self, url: str) -> _Host:
+        host = urlsplit(url).netloc
+        state = self._hosts.get(host)
+        if state is None:
+            bucket = TokenBucket(self.rate, self.burst) if self.rate > 0 else None
+            state = self._hosts[host] = _Host(bucket=bucket)
+        return state
+
+    def acquire(self, url: str) -> float:
+        """
+        Block until a request to `url`'s host is allowed; returns seconds waited.
+        """
+        with self._lock:
+            state = self._host(url)
+            now = time.monotonic()
+            delay = max(0.0, state.paused_until - now)
+            if state.bucket is not None:
+                delay += state.bucket.reserve(now + delay)
+            self.wait_seconds += delay
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def record_success(self, url: str) -> None:
+        with self._lock:
+            state = self._host(url)
+            state.failures = 0
+            if state.bucket is not None and state.bucket.rate < self.rate:
+                state.bucket.rate = min(self.rate, state.bucket.rate + self.rate * 0.05)
+
+    def record_failure(self, url: str, status: int = 0, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            state = self._host(url)
+            state.failures += 1
+            now = time.monotonic()
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+                if state.bucket is not None:
+                    state.bucket.rate = max(self.min_rate, state.bucket.rate / 2)
+            if retry_after is not None:
+                # A server asking for hours must not stall the run that long
+                state.paused_until = max(state.paused_until, now + min(retry_after, self.cooldown_cap))
+            if state.failures >= self.failure_threshold:
+                self.circuit_opens += 1
+                state.failures = 0
+                state.paused_until = max(state.paused_until, now + self.cooldown)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "waitSeconds": round(self.wait_seconds, 3),
+            "throttled": self.throttled,
+            "circuitOpens": self.circuit_opens,
+        }
\ No newline at end of file
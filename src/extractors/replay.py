@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import codecs
+import gzip
+import json
+import logging
+from typing import IO, Any, Iterator
+
+import orjson
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+CHUNK_SIZE = 1 << 20
+# A single array element larger than this is treated as a corrupt input
+MAX_RECORD_BYTES = 1 << 28
+_WS = " \t\r\n"
+
+def _open(path: str) -> IO[bytes]:
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+def _iter_ndjson(f: IO[bytes], path: str) -> Iterator[Any]:
+    for number, line in enumerate(f, 1):
+        if number == 1:
+            line = line.removeprefix(codecs.BOM_UTF8)
+        if not line.strip():
+            continue
+        try:
+            yield orjson.loads(line)
+        except orjson.JSONDecodeError:
+            # Typically a torn last line of an archive that was being written
+            logger.warning("Skipping invalid JSON on line %s of %s", number, path)
+
+def _iter_array(f: IO[bytes], path: str, chunk_size: int) -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8-sig")()
+    buf = ""
+    pos = 0
+    eof = False
+    started = False
+    while True:
+        # Skip separators up to the next element
+        while True:
+            while pos < len(buf) and buf[pos] in _WS:
+                pos += 1
+            if pos < len(buf) and buf[pos] == ",":
+                pos += 1
+                continue
+            break
+        if pos < len(buf) and not started:
+            # Opening bracket (iter_records checked it is the first character)
+            started = True
+            pos += 1
+            continue
+        if pos < len(buf) and buf[pos] == "]":
+            return
+        if pos < len(buf):
+            try:
+                obj, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError(f"Invalid JSON array element in {path}") from None
+                if len(buf) - pos > MAX_RECORD_BYTES:
+                    raise ValueError(f"Array element over {MAX_RECORD_BYTES} bytes in {path}") from None
+            else:
+                yield obj
+                continue
+        elif eof:
+            raise ValueError(f"Unterminated JSON array in {path}")
+        # Need more input: at least as much as is buffered, so re-decoding a large element stays linear
+        chunk = f.read(max(chunk_size, len(buf) - pos))
+        eof = not chunk
+        buf = buf[pos:] + text.decode(chunk, final=eof)
+        pos = 0
+
+def iter_records(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Records of a replay file, decoded as they are read: a top-level JSON
+    array (like data/sample_output.json) or NDJSON, optionally gzipped.
+    Memory use is bounded by the largest record, not the file. Close the
+    generator (or stop iterating) to stop reading.
+    """
+    with _open(path) as f:
+        head = b""
+        while not head.strip():
+            chunk = f.read(4096)
+            if not chunk:
+                return
+            head += chunk
+        f.seek(0)
+        if head.removeprefix(codecs.BOM_UTF8).lstrip().startswith(b"["):
+            yield from _iter_array(f, path, chunk_size)
+        else:
+            yield from _iter_ndjson(f, path)
\ No newline at end of file
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+import orjson
+
+_OPEN_RE = re.compile(r"<script\b([^>]*)>", re.IGNORECASE)
+_CLOSE_RE = re.compile(r"</script\s*>", re.IGNORECASE)
+_ATTR_RE = re.compile(r"""([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+# A whole JSON string literal, or a single brace
+_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}]', re.DOTALL)
+# What an open/close tag cut off at the end of a chunk can look like
+_OPEN_PREFIX_RE = re.compile(r"<(?:s(?:c(?:r(?:i(?:p(?:t(?:[^\w>][^>]*)?)?)?)?)?)?)?", re.IGNORECASE)
+_CLOSE_PREFIX_RE = re.compile(r"<(?:/(?:s(?:c(?:r(?:i(?:p(?:t\s*)?)?)?)?)?)?)?", re.IGNORECASE)
+
+_UNSET: Any = object()
+
+@dataclass
+class ScriptTag:
+    attrs: Dict[str, str] = field(default_factory=dict)
+    text: str = ""
+    _json: Any = field(default=_UNSET, repr=False, compare=False)
+    _inline: Any = field(default=_UNSET, repr=False, compare=False)
+
+    def json(self) -> Any:
+        """
+        The script body decoded as JSON, or None if it is empty or not JSON.
+        Decoded once; every extractor reading the same tag shares the result.
+        """
+        if self._json is _UNSET:
+            self._json = _loads(self.text)
+        return self._json
+
+    def inline_json(self) -> Any:
+        """
+        The first balanced {...} block inside the script, decoded, or None.
+        """
+        if self._inline is _UNSET:
+            block = None
+            if "{" in self.text and "}" in self.text:
+                block = find_json_object(self.text)
+            self._inline = _loads(block) if block else None
+        return self._inline
+
+def _loads(text: Optional[str]) -> Any:
+    if not text:
+        return None
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return None
+
+def _parse_attrs(raw: str) -> Dict[str, str]:
+    attrs: Dict[str, str] = {}
+    for m in _ATTR_RE.finditer(raw):
+        name = m.group(1).lower()
+        if name not in attrs:
+            attrs[name] = next((g for g in m.groups()[1:] if g is not None), "")
+    return attrs
+
+def iter_script_tags(html: str) -> Iterator[ScriptTag]:
+    """
+    Yield every <script> element of the page without building a DOM.
+    Script bodies are raw text in HTML, so slicing between the tags gives the
+    same content BeautifulSoup would return in `tag.string`.
+    """
+    pos = 0
+    while True:
+        m = _OPEN_RE.search(html, pos)
+        if not m:
+            return
+        end = _CLOSE_RE.search(html, m.end())
+        stop = end.start() if end else len(html)
+        yield ScriptTag(attrs=_parse_attrs(m.group(1)), text=html[m.end():stop])
+        if not end:
+            return
+        pos = end.end()
+
+def _tail_start(text: str, prefix: re.Pattern) -> int:
+    # A tag cut off by the chunk boundary has no '>' yet, so it starts after the last one
+    i = text.find("<", text.rfind(">") + 1)
+    while i >= 0:
+        if prefix.fullmatch(text, i):
+            return i
+        i = text.find("<", i + 1)
+    return len(text)
+
+@dataclass
+class ScriptScanner:
+    """
+    Incremental iter_script_tags: feed() the HTML as it arrives and get back
+    the script tags completed so far (the same tags, in the same order).
+    Only the body of the script being read is buffered; other markup is
+    dropped once scanned.
+    """
+
+    _attrs: Optional[Dict[str, str]] = field(default=None, repr=False)
+    _parts: List[str] = field(default_factory=list, repr=False)
+    _carry: str = field(default="", repr=False)
+
+    def feed(self, data: str) -> List[ScriptTag]:
+        out: List[ScriptTag] = []
+        text = self._carry + data
+        self._carry = ""
+        while text:
+            if self._attrs is None:
+                m = _OPEN_RE.search(text)
+                if not m:
+                    self._carry = text[_tail_start(text, _OPEN_PREFIX_RE):]
+                    break
+                self._attrs = _parse_attrs(m.group(1))
+                text = text[m.end():]
+            else:
+                m = _CLOSE_RE.search(text)
+                if not m:
+                    cut = _tail_start(text, _CLOSE_PREFIX_RE)
+                    self._parts.append(text[:cut])
+                    self._carry = text[cut:]
+                    break
+                self._parts.append(text[:m.start()])
+                out.append(ScriptTag(attrs=self._attrs, text="".join(self._parts)))
+                self._attrs, self._parts = None, []
+                text = text[m.end():]
+        return out
+
+    def close(self) -> List[ScriptTag]:
+        """
+        End of input: an unterminated script runs to the end of the page.
+        """
+        if self._attrs is None:
+            return []
+        tag = ScriptTag(attrs=self._attrs, text="".join(self._parts) + self._carry)
+        self._attrs, self._parts, self._carry = None, [], ""
+        return [tag]
+
+@dataclass
+class TagStream:
+    """
+    Script tags of a page that is still downloading. Each iteration replays
+    the tags read so far and then reads on, so several extractors can share
+    one download; close() abandons whatever has not been read yet.
+    """
+
+    chunks: Iterator[str]
+    tags: List[ScriptTag] = field(default_factory=list)
+    # Characters received; 0 means the fetch failed (or the page was empty)
+    chars: int = 0
+    # Set when the download ended with an error (see FetchEngine.stream)
+    failed: bool = False
+    _scanner: ScriptScanner = field(default_factory=ScriptScanner, repr=False)
+    _done: bool = field(default=False, repr=False)
+
+    def _read(self) -> bool:
+        before = len(self.tags)
+        while not self._done and len(self.tags) == before:
+            try:
+                chunk = next(self.chunks)
+            except StopIteration as end:
+                self.failed = end.value is False
+                self.tags.extend(self._scanner.close())
+                self._done = True
+            else:
+                self.chars += len(chunk)
+                self.tags.extend(self._scanner.feed(chunk))
+        return len(self.tags) > before
+
+    def __iter__(self) -> Iterator[ScriptTag]:
+        i = 0
+        while i < len(self.tags) or self._read():
+            yield self.tags[i]
+            i += 1
+
+    @property
+    def fetched(self) -> bool:
+        """
+        Whether the page arrived intact (so far, if the stream was cut short on purpose).
+        """
+        return self.chars > 0 and not self.failed
+
+    def close(self) -> None:
+        self._done = True
+        close = getattr(self.chunks, "close", None)
+        if close is not None:
+            close()
+
+def soup_script_tags(html: str) -> Iterator[ScriptTag]:
+    """
+    DOM-based equivalent of iter_script_tags, kept as a fallback for markup
+    the scanner cannot make sense of.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+    for tag in soup.find_all("script"):
+        attrs = {k: " ".join(v) if isinstance(v, list) else v for k, v in tag.attrs.items()}
+        # Plain str: orjson does not accept NavigableString
+        yield ScriptTag(attrs=attrs, text=str(tag.string or ""))
+
+def find_json_object(text: str) -> Optional[str]:
+    """
+    Return the first balanced {...} block in `text`, or None.
+    Braces inside JSON string literals are skipped, so this stops at the end of
+    the first object instead of running to the last '}' of the script.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    depth = 0
+    for m in _TOKEN_RE.finditer(text, start):
+        tok = m.group()
+        if tok == "{":
+            depth += 1
+        elif tok == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:m.end()]
+    return None
\ No newline at end of file
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+
+DEFAULT_SELECTORS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "selectors.json")
+
+_STEP_RE = re.compile(
+    r"""\.(?P<key>[\w@$-]+)"""
+    r"""|\[['"](?P<quoted>[^'"]+)['"]\]"""
+    r"""|\[(?P<each>\*)\]"""
+    r"""|\[\?(?P<pred>[^\]=:]+)(?:=(?P<values>[^\]]*)|:(?P<kind>object|list|string|number))?\]"""
+)
+_KINDS: Dict[str, Tuple[type, ...]] = {
+    "object": (dict,),
+    "list": (list,),
+    "string": (str,),
+    "number": (int, float),
+}
+
+# A step is ("key", name), ("each", None) or ("filter", (key, values, kind))
+Step = Tuple[str, Any]
+
+def parse_selector(selector: str) -> List[Step]:
+    """
+    Split a selector into steps. The syntax is a small JSONPath subset:
+
+        $.props.pageProps.posts[*]      child keys and every list element
+        $['odd key'][*]                 quoted keys
+        $[*][?@type=Course|Lesson]      keep objects whose key equals one of the values
+        $.course[?modules:list]         ...has a key with a value of that type
+        $.data[?id]                     ...has the key at all
+
+    Only objects are ever selected; a step that does not fit the data (a key
+    on a list, [*] on an object) simply selects nothing.
+    """
+    if not selector.startswith("$"):
+        raise ValueError(f"Selector must start with '$': {selector!r}")
+    steps: List[Step] = []
+    pos = 1
+    while pos < len(selector):
+        m = _STEP_RE.match(selector, pos)
+        if not m:
+            raise ValueError(f"Invalid selector {selector!r} at {selector[pos:]!r}")
+        if m.group("key") or m.group("quoted"):
+            steps.append(("key", m.group("key") or m.group("quoted")))
+        elif m.group("each"):
+            steps.append(("each", None))
+        else:
+            values = m.group("values")
+            steps.append(
+                ("filter", (m.group("pred").strip(), frozenset(values.split("|")) if values is not None else None, m.group("kind")))
+            )
+        pos = m.end()
+    return steps
+
+def _matches(node: Any, pred: Tuple[str, Optional[frozenset], Optional[str]]) -> bool:
+    key, values, kind = pred
+    if not isinstance(node, dict) or key not in node:
+        return False
+    if values is not None:
+        return isinstance(node[key], str) and node[key] in values
+    if kind is not None:
+        value = node[key]
+        return isinstance(value, _KINDS[kind]) and not (kind == "number" and isinstance(value, bool))
+    return True
+
+@dataclass
+class _Node:
+    keys: Dict[str, "_Node"] = field(default_factory=dict)
+    each: Optional["_Node"] = None
+    filters: List[Tuple[Tuple[str, Optional[frozenset], Optional[str]], "_Node"]] = field(default_factory=list)
+    # Indices of the selectors that end here
+    emit: List[int] = field(default_factory=list)
+
+@dataclass
+class SelectorSet:
+    """
+    Selectors compiled into one prefix tree, so a payload is walked once for
+    all of them (shared prefixes like $.props.pageProps are visited once).
+    Results come back grouped in selector order, then document order.
+    """
+
+    selectors: Sequence[str]
+    _root: _Node = field(default_factory=_Node, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        for index, selector in enumerate(self.selectors):
+            node = self._root
+            for kind, arg in parse_selector(selector):
+                if kind == "key":
+                    node = node.keys.setdefault(arg, _Node())
+                elif kind == "each":
+                    node.each = node.each or _Node()
+                    node = node.each
+                else:
+                    child = next((n for p, n in node.filters if p == arg), None)
+                    if child is None:
+                        child = _Node()
+                        node.filters.append((arg, child))
+                    node = child
+            node.emit.append(index)
+
+    def select(self, payload: Any) -> List[Dict]:
+        buckets: List[List[Dict]] = [[] for _ in self.selectors]
+        self._walk(self._root, payload, buckets)
+        if len(buckets) == 1:
+            return buckets[0]
+        return [rec for bucket in buckets for rec in bucket]
+
+    def _walk(self, node: _Node, value: Any, buckets: List[List[Dict]]) -> None:
+        if node.emit and isinstance(value, dict):
+            for index in node.emit:
+                buckets[index].append(value)
+        if node.keys and isinstance(value, dict):
+            for key, child in node.keys.items():
+                if key in value:
+                    self._walk(child, value[key], buckets)
+        if node.each is not None and isinstance(value, list):
+            child = node.each
+            if not (child.keys or child.each or child.filters):
+                # Leaf [*]: the common case, kept out of the recursion
+                for item in value:
+                    if isinstance(item, dict):
+                        for index in child.emit:
+                            buckets[index].append(item)
+            else:
+                for item in value:
+                    self._walk(child, item, buckets)
+        for pred, child in node.filters:
+            if _matches(value, pred):
+                self._walk(child, value, buckets)
+
+@lru_cache(maxsize=None)
+def load_selectors(path: Optional[str] = None) -> Dict[str, SelectorSet]:
+    """
+    Named selector groups from a JSON file ({"name": ["$...", ...]}),
+    compiled once per process. Defaults to config/selectors.json.
+    """
+    with open(path or DEFAULT_SELECTORS, "rb") as f:
+        config = orjson.loads(f.read())
+    if not isinstance(config, dict):
+        raise ValueError(f"{path or DEFAULT_SELECTORS}: expected an object of selector lists")
+    return {name: SelectorSet(tuple(selectors)) for name, selectors in config.items() if not name.startswith("_")}
\ No newline at end of file
@@ -1,20 +1,102 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Optional
+import math
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Optional
 
-from dateutil import parser as dtparser
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# The shapes Skool actually sends: 2024-11-07T23:26:18.04203Z and friends
+_ISO_RE = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})"
+    r"(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?)?"
+    r"(?:([Zz])|([+-])(\d{2}):?(\d{2}))?"
+)
+
+def _parse_dateutil(ts: str) -> Optional[str]:
+    # Only for shapes the fast path rejects; dateutil is slow to import
+    from dateutil import parser as dtparser
 
-def to_iso(ts: Optional[str]) -> Optional[str]:
-    if not ts:
-        return None
     try:
-        dt = dtparser.parse(str(ts))
+        dt = dtparser.parse(ts)
         if not dt.tzinfo:
             dt = dt.replace(tzinfo=timezone.utc)
         return dt.astimezone(timezone.utc).isoformat()
     except Exception:
         return None
 
+def _parse_fast(ts: str) -> Optional[datetime]:
+    m = _ISO_RE.fullmatch(ts.strip())
+    if not m:
+        return None
+    year, month, day, hour, minute, second, frac, zulu, sign, off_h, off_m = m.groups()
+    try:
+        tz = timezone.utc
+        if sign:
+            offset = timedelta(hours=int(off_h), minutes=int(off_m))
+            tz = timezone(-offset if sign == "-" else offset)
+        return datetime(
+            int(year),
+            int(month),
+            int(day),
+            int(hour or 0),
+            int(minute or 0),
+            int(second or 0),
+            int(frac.ljust(6, "0")) if frac else 0,
+            tzinfo=tz,
+        )
+    except ValueError:
+        # e.g. 24:00, Feb 30 or a +24:00 offset: let dateutil decide, as before
+        return None
+
+@lru_cache(maxsize=65536)
+def _str_to_iso(ts: str) -> Optional[str]:
+    dt = _parse_fast(ts)
+    if dt is not None:
+        return dt.astimezone(timezone.utc).isoformat()
+    return _parse_dateutil(ts)
+
+def epoch_to_iso(value: float) -> Optional[str]:
+    """
+    Epoch timestamp in seconds, milliseconds, microseconds or nanoseconds
+    (picked by magnitude) to an ISO-8601 UTC string.
+    """
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        if abs(value) < 1e11:
+            value = round(value * 1_000_000)
+            return (_EPOCH + timedelta(microseconds=value)).isoformat()
+        value = int(value)
+    magnitude = abs(value)
+    if magnitude < 10**11:
+        micros = value * 1_000_000
+    elif magnitude < 10**14:
+        micros = value * 1_000
+    elif magnitude < 10**17:
+        micros = value
+    else:
+        micros = value // 1_000
+    try:
+        return (_EPOCH + timedelta(microseconds=micros)).isoformat()
+    except OverflowError:
+        return None
+
+def to_iso(ts: Any) -> Optional[str]:
+    """
+    Normalize a timestamp to ISO-8601 UTC.
+
+    Plain ISO strings take a regex fast path, anything else goes through
+    dateutil; string results are memoized. Integers and floats are read as
+    epoch time (see epoch_to_iso).
+    """
+    if not ts or isinstance(ts, bool):
+        return None
+    if isinstance(ts, (int, float)):
+        return epoch_to_iso(ts)
+    return _str_to_iso(str(ts))
+
 def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
\ No newline at end of file
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Upper bounds in seconds, Prometheus style (the last bucket is +Inf)
+LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Peak resident memory of this process, or None where the resource module is missing (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+@dataclass
+class Histogram:
+    buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    counts: List[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Upper bound of the bucket holding the q-quantile (None when empty or in +Inf).
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return None
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 4),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": {str(b): n for b, n in zip(self.buckets + ("+Inf",), self.counts)},
+        }
+
+@dataclass
+class Stage:
+    seconds: float = 0.0
+    calls: int = 0
+
+@dataclass
+class RunMetrics:
+    """
+    Run telemetry: time per pipeline stage, fetch latency histogram, bytes
+    downloaded, items by type, peak memory, plus the stats() of any component
+    registered in `sources` (fetch engine, caches, ...).
+
+    Each stage is updated from a single thread (fetch_wait/extract/normalize
+    by the producer, queue_wait/export by the consumer), so stages are not
+    locked; fetch observations come from the fetch pool and are. New stages
+    and item types are added under the lock, so summary() can snapshot them
+    from another thread. The per-item cost is a couple of perf_counter() calls.
+
+    With `textfile` set, tick() rewrites a Prometheus textfile (node_exporter
+    textfile collector format) at most every `interval` seconds.
+    """
+
+    textfile: Optional[str] = None
+    interval: float = 15.0
+    sources: Dict[str, Callable[[], Dict[str, float]]] = field(default_factory=dict)
+    stages: Dict[str, Stage] = field(default_factory=dict)
+    items: Dict[str, int] = field(default_factory=dict)
+    fetch_latency: Histogram = field(default_factory=Histogram)
+    bytes_downloaded: int = 0
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+    _next_flush: float = field(default=0.0, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def stage(self, name: str) -> Stage:
+        st = self.stages.get(name)
+        if st is None:
+            with self._lock:
+                st = self.stages.setdefault(name, Stage())
+        return st
+
+    def add(self, name: str, seconds: float, calls: int = 1) -> None:
+        st = self.stage(name)
+        st.seconds += seconds
+        st.calls += calls
+
+    @contextmanager
+    def time(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def timed(self, name: str, source: Iterable[T]) -> Iterator[T]:
+        """
+        Iterate `source`, charging the time spent producing each element to stage `name`.
+        """
+        st = self.stage(name)
+        it = iter(source)
+        clock = time.perf_counter
+        while True:
+            t0 = clock()
+            try:
+                obj = next(it)
+            except StopIteration:
+                st.seconds += clock() - t0
+                return
+            st.seconds += clock() - t0
+            st.calls += 1
+            yield obj
+
+    def observe_fetch(self, seconds: float, nbytes: int) -> None:
+        with self._lock:
+            self.fetch_latency.observe(seconds)
+            self.bytes_downloaded += nbytes
+
+    def count_item(self, kind: str) -> None:
+        n = self.items.get(kind)
+        if n is None:
+            with self._lock:
+                self.items[kind] = self.items.get(kind, 0) + 1
+        else:
+            self.items[kind] = n + 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def summary(self) -> Dict[str, object]:
+        elapsed = self.elapsed()
+        with self._lock:
+            latency = self.fetch_latency.to_dict()
+            downloaded = self.bytes_downloaded
+            # The pipeline threads keep running; copy before iterating
+            stages = list(self.stages.items())
+            items = dict(self.items)
+        out: Dict[str, object] = {
+            "elapsedSeconds": round(elapsed, 3),
+            "stages": {k: {"seconds": round(s.seconds, 4), "calls": s.calls} for k, s in stages},
+            "items": items,
+            "itemsPerSecond": {k: round(n / elapsed, 2) if elapsed > 0 else 0.0 for k, n in items.items()},
+            "fetchLatency": latency,
+            "bytesDownloaded": downloaded,
+            "peakRssBytes": peak_rss_bytes(),
+        }
+        for name, stats in self.sources.items():
+            out[name] = stats()
+        return out
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def prometheus(self) -> str:
+        summary = self.summary()
+        lines: List[str] = []
+
+        def _metric(name: str, kind: str, samples: Iterable[Tuple[str, object]]) -> None:
+            lines.append(f"# TYPE skool_{name} {kind}")
+            lines.extend(f"skool_{name}{labels} {value}" for labels, value in samples)
+
+        _metric("run_elapsed_seconds", "gauge", [("", summary["elapsedSeconds"])])
+        _metric(
+            "stage_seconds_total",
+            "counter",
+            [(f'{{stage="{k}"}}', s["seconds"]) for k, s in summary["stages"].items()],
+        )
+        _metric("items_total", "counter", [(f'{{type="{k}"}}', n) for k, n in summary["items"].items()])
+        _metric("downloaded_bytes_total", "counter", [("", summary["bytesDownloaded"])])
+        with self._lock:
+            hist = self.fetch_latency
+            cumulative, samples = 0, []
+            for bound, n in zip(hist.buckets + ("+Inf",), hist.counts):
+                cumulative += n
+                samples.append((f'_bucket{{le="{bound}"}}', cumulative))
+            samples += [("_sum", round(hist.total, 4)), ("_count", hist.count)]
+        _metric("fetch_latency_seconds", "histogram", samples)
+        if summary["peakRssBytes"] is not None:
+            _metric("peak_rss_bytes", "gauge", [("", summary["peakRssBytes"])])
+        for name in self.sources:
+            for key, value in summary[name].items():
+                if isinstance(value, (int, float)):
+                    _metric(f"{name}_{key}", "gauge", [("", value)])
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self) -> None:
+        if not self.textfile:
+            return
+        # Written aside and renamed so the collector never reads a partial file
+        tmp = f"{self.textfile}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, self.textfile)
+
+    def tick(self) -> None:
+        """
+        Refresh the Prometheus textfile if `interval` seconds have passed.
+        """
+        if self.textfile is None:
+            return
+        now = time.monotonic()
+        if now >= self._next_flush:
+            self._next_flush = now + self.interval
+            self.write_textfile()
\ No newline at end of file
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import os
+import shutil
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+import orjson
+
+from outputs.schema import Comment, ItemType, SkoolItem, User
+
+# Hive's name for a missing partition value, understood by Spark, DuckDB, pyarrow.dataset
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+TABLES = ("posts", "comments", "modules")
+
+def _schemas() -> Dict[str, Any]:
+    import pyarrow as pa
+
+    ts = pa.timestamp("us", tz="UTC")
+    common = [
+        ("id", pa.string()),
+        ("groupId", pa.string()),
+        ("createdAt", ts),
+        ("updatedAt", ts),
+    ]
+    return {
+        "posts": pa.schema(common + [
+            ("name", pa.string()),
+            ("title", pa.string()),
+            ("postTitle", pa.string()),
+            ("content", pa.string()),
+            ("url", pa.string()),
+            ("urlAjax", pa.string()),
+            ("postType", pa.string()),
+            ("rootId", pa.string()),
+            ("parentId", pa.string()),
+            ("labelId", pa.string()),
+            ("userId", pa.string()),
+            ("userName", pa.string()),
+            ("commentsCount", pa.int64()),
+            ("upvotes", pa.int64()),
+            ("pinned", pa.bool_()),
+            ("metadata", pa.string()),
+        ]),
+        "comments": pa.schema(common + [
+            ("postId", pa.string()),
+            ("parentId", pa.string()),
+            ("rootId", pa.string()),
+            ("depth", pa.int32()),
+            ("content", pa.string()),
+            ("upvotes", pa.int64()),
+            ("attachments", pa.string()),
+            ("attachmentsData", pa.string()),
+            ("userId", pa.string()),
+            ("userName", pa.string()),
+        ]),
+        "modules": pa.schema(common + [
+            ("name", pa.string()),
+            ("title", pa.string()),
+            ("postTitle", pa.string()),
+            ("content", pa.string()),
+            ("url", pa.string()),
+            ("urlAjax", pa.string()),
+            ("postType", pa.string()),
+            ("media", pa.list_(pa.string())),
+            ("courseId", pa.string()),
+            ("courseName", pa.string()),
+            ("courseTitle", pa.string()),
+        ]),
+    }
+
+def _ts(iso: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(iso) if iso else None
+
+def _int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _user_id(user: Optional[User], fallback: str = "") -> str:
+    return user.id if user is not None and user.id else fallback
+
+def _flatten_comments(
+    comments: List[Comment], item: SkoolItem, ts: Callable[[Optional[str]], Any], depth: int = 0
+) -> Iterator[Dict[str, Any]]:
+    for c in comments:
+        yield {
+            "id": c.id,
+            "groupId": item.groupId,
+            "createdAt": ts(c.createdAt),
+            "updatedAt": ts(c.updatedAt),
+            "postId": item.id,
+            "parentId": c.parentId,
+            "rootId": c.rootId or item.id,
+            "depth": depth,
+            "content": c.content,
+            "upvotes": c.upvotes,
+            "attachments": c.attachments,
+            "attachmentsData": c.attachmentsData,
+            "userId": _user_id(c.user),
+            "userName": c.user.name if c.user is not None else "",
+        }
+        yield from _flatten_comments(c.replies, item, ts, depth + 1)
+
+def rows_for(item: SkoolItem, ts: Callable[[Optional[str]], Any] = _ts) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    (table, row) pairs for one item: the post or module itself, then its
+    comment tree flattened depth-first. `ts` converts the ISO timestamps
+    (to datetimes by default).
+    """
+    if item.type == ItemType.module:
+        course = item.courseMetaDetails
+        yield "modules", {
+            "id": item.id,
+            "groupId": item.groupId,
+            "createdAt": ts(item.createdAt),
+            "updatedAt": ts(item.updatedAt),
+            "name": item.name,
+            "title": item.title,
+            "postTitle": item.postTitle,
+            "content": item.content,
+            "url": item.url,
+            "urlAjax": item.urlAjax,
+            "postType": item.postType,
+            "media": item.media,
+            "courseId": course.id if course else None,
+            "courseName": course.name if course else None,
+            "courseTitle": course.title if course else None,
+        }
+    else:
+        meta = item.metadata
+        yield "posts", {
+            "id": item.id,
+            "groupId": item.groupId,
+            "createdAt": ts(item.createdAt),
+            "updatedAt": ts(item.updatedAt),
+            "name": item.name,
+            "title": item.title,
+            "postTitle": item.postTitle,
+            "content": item.content,
+            "url": item.url,
+            "urlAjax": item.urlAjax,
+            "postType": item.postType,
+            "rootId": item.rootId,
+            "parentId": item.parentId,
+            "labelId": item.labelId,
+            "userId": _user_id(item.user, item.userId),
+            "userName": item.user.name if item.user is not None else "",
+            "commentsCount": _int(meta.get("comments")),
+            "upvotes": _int(meta.get("upvotes")),
+            "pinned": bool(meta.get("pinned")),
+            "metadata": orjson.dumps(meta).decode(),
+        }
+    for row in _flatten_comments(item.comments, item, ts):
+        yield "comments", row
+
+def _partition_value(value: Any) -> str:
+    return quote(str(value), safe="") if value not in (None, "") else NULL_PARTITION
+
+@dataclass
+class _Partition:
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    writer: Any = None
+
+@dataclass
+class ParquetExporter:
+    """
+    Writes posts, comments and modules as Parquet datasets under
+    `out_dir/parquet/<table>/group=<groupId>/date=<YYYY-MM-DD>/part-<n>.parquet`
+    (Hive partitioning on the post's group and each row's creation date; the
+    keys differ from the groupId/createdAt columns so engines like Spark do
+    not see duplicate columns).
+
+    Rows are buffered per partition and written as a row group once
+    `row_group_size` rows are waiting. Memory is bounded by `max_buffered_rows`
+    (the fullest buffer is flushed early when exceeded) and `max_open_files`
+    (the least recently used writer is closed; the partition continues in a
+    new part file). Needs pyarrow, imported on first use.
+
+    Files are written to `<dir_name>.tmp` and swapped in by finalize(), so an
+    interrupted run leaves the previous dataset untouched.
+    """
+
+    out_dir: str
+    dir_name: str = "parquet"
+    row_group_size: int = 50_000
+    max_buffered_rows: int = 200_000
+    max_open_files: int = 64
+    compression: str = "zstd"
+    rows_written: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(TABLES, 0))
+    _table_schemas: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _partitions: Dict[Tuple[str, str, str], _Partition] = field(default_factory=dict, init=False, repr=False)
+    # Part files started per partition; outlives the _Partition so numbering continues
+    _parts: Dict[Tuple[str, str, str], int] = field(default_factory=dict, init=False, repr=False)
+    _open: "OrderedDict[Tuple[str, str, str], None]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _buffered: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        try:
+            self._table_schemas = _schemas()
+        except ImportError as exc:
+            raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)") from exc
+        # Rewritten on every run, like items.json; leftovers of a crashed run go
+        shutil.rmtree(self._staging, ignore_errors=True)
+
+    @property
+    def _staging(self) -> str:
+        return os.path.join(self.out_dir, self.dir_name + ".tmp")
+
+    def write(self, item: SkoolItem) -> None:
+        for table, row in rows_for(item):
+            created = row["createdAt"]
+            key = (
+                table,
+                _partition_value(row["groupId"]),
+                _partition_value(created.date().isoformat() if created else None),
+            )
+            part = self._partitions.get(key)
+            if part is None:
+                part = self._partitions[key] = _Partition()
+            part.rows.append(row)
+            self._buffered += 1
+            if len(part.rows) >= self.row_group_size:
+                self._flush(key)
+        while self._buffered > self.max_buffered_rows:
+            self._flush(max(self._partitions, key=lambda k: len(self._partitions[k].rows)))
+
+    def _flush(self, key: Tuple[str, str, str]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        part = self._partitions[key]
+        if not part.rows:
+            return
+        table, group, date = key
+        if part.writer is None:
+            while len(self._open) >= self.max_open_files:
+                self._close(next(iter(self._open)))
+            folder = os.path.join(self._staging, table, f"group={group}", f"date={date}")
+            os.makedirs(folder, exist_ok=True)
+            number = self._parts.get(key, 0)
+            part.writer = pq.ParquetWriter(
+                os.path.join(folder, f"part-{number:05d}.parquet"),
+                self._table_schemas[table],
+                compression=self.compression,
+            )
+            self._parts[key] = number + 1
+        self._open[key] = None
+        self._open.move_to_end(key)
+        part.writer.write_table(pa.Table.from_pylist(part.rows, schema=self._table_schemas[table]))
+        self.rows_written[table] += len(part.rows)
+        self._buffered -= len(part.rows)
+        part.rows = []
+
+    def _close(self, key: Tuple[str, str, str]) -> None:
+        part = self._partitions[key]
+        if part.writer is not None:
+            part.writer.close()
+            part.writer = None
+        self._open.pop(key, None)
+        if not part.rows:
+            # Nothing buffered and no writer: a long run touches many date
+            # partitions, so only the part counter is kept
+            del self._partitions[key]
+
+    def finalize(self) -> None:
+        # Flushing may close (and drop) other partitions to stay under max_open_files
+        while self._partitions:
+            key = next(iter(self._partitions))
+            self._flush(key)
+            self._close(key)
+        final = os.path.join(self.out_dir, self.dir_name)
+        os.makedirs(self._staging, exist_ok=True)
+        shutil.rmtree(final, ignore_errors=True)
+        os.replace(self._staging, final)
\ No newline at end of file
@@ -1,51 +1,209 @@
 from __future__ import annotations
 
 import csv
-import json
 import os
 from dataclasses import dataclass, field
-from typing import List
+from typing import IO, Any, Dict, List, Optional, Tuple, Union
 
 import orjson
-import pandas as pd
 
-from outputs.schema import SkoolItem
+from outputs.schema import RawItem, SkoolItem, dumps
+from outputs.users import UserRegistry
+
+CSV_COLUMNS = ["type", "id", "title", "url", "createdAt", "commentsCount", "upvotes"]
+# Row formats written by Exporter; columnar output lives in outputs.columnar
+FORMATS = ("ndjson", "json", "csv")
 
 @dataclass
 class Exporter:
+    """
+    Writes items.ndjson, items.json and items.csv (or the subset in `formats`)
+    incrementally.
+
+    Each file is opened once on the first write and kept open (buffered) until
+    finalize(); items are serialized as they arrive and never kept in memory.
+
+    With a `users` registry (users table layout) authors are written once to
+    users.ndjson and items refer to them by id ("user": "<id>").
+
+    items.ndjson accumulates across runs; with `append_ndjson` off it is
+    rewritten like the other files (merges, which produce the whole set).
+    """
+
     out_dir: str
     jsonl_name: str = "items.ndjson"
     json_name: str = "items.json"
     csv_name: str = "items.csv"
-    _buffer: List[SkoolItem] = field(default_factory=list)
+    users_name: str = "users.ndjson"
+    users: Optional[UserRegistry] = None
+    formats: Tuple[str, ...] = FORMATS
+    buffer_size: int = 1 << 20
+    append_ndjson: bool = True
+    _ndjson: Optional[IO[bytes]] = field(default=None, init=False, repr=False)
+    _json: Optional[IO[bytes]] = field(default=None, init=False, repr=False)
+    _csv_file: Optional[IO[str]] = field(default=None, init=False, repr=False)
+    _csv: Any = field(default=None, init=False, repr=False)
+    _users_file: Optional[IO[bytes]] = field(default=None, init=False, repr=False)
+    _opened: bool = field(default=False, init=False, repr=False)
+    _count: int = field(default=0, init=False)
+    _finalized: bool = field(default=False, init=False, repr=False)
 
     def _path(self, name: str) -> str:
         return os.path.join(self.out_dir, name)
 
-    def write(self, item: SkoolItem) -> None:
-        # Stream NDJSON for large runs
-        with open(self._path(self.jsonl_name), "ab") as f:
-            f.write(orjson.dumps(item.model_dump()) + b"\n")
-        self._buffer.append(item)
+    def _open(self, append: bool = False) -> None:
+        # NDJSON keeps appending across runs; JSON array and CSV are rewritten
+        # unless we are resuming a checkpointed run
+        self._opened = True
+        if "ndjson" in self.formats:
+            mode = "ab" if append or self.append_ndjson else "wb"
+            self._ndjson = open(self._path(self.jsonl_name), mode, buffering=self.buffer_size)
+        if "json" in self.formats:
+            self._json = open(self._path(self.json_name), "ab" if append else "wb", buffering=self.buffer_size)
+            if not append:
+                self._json.write(b"[")
+        if "csv" in self.formats:
+            self._csv_file = open(
+                self._path(self.csv_name),
+                "a" if append else "w",
+                newline="",
+                encoding="utf-8",
+                buffering=self.buffer_size,
+            )
+            self._csv = csv.writer(self._csv_file, lineterminator=os.linesep)
+            if not append:
+                self._csv.writerow(CSV_COLUMNS)
+        if self.users is not None:
+            # Append-only while running (a changed user gets a newer line), compacted by finalize()
+            self._users_file = open(
+                self._path(self.users_name), "ab" if append else "wb", buffering=self.buffer_size
+            )
+
+    def _files(self) -> List[IO]:
+        return [f for f in (self._ndjson, self._json, self._csv_file, self._users_file) if f is not None]
+
+    def checkpoint(self) -> Dict[str, int]:
+        """
+        Flush and fsync all outputs and return their sizes; pass the result to
+        resume() to continue a crashed run from exactly this point.
+        """
+        if not self._opened:
+            self._open()
+        self.flush()
+        for f in self._files():
+            os.fsync(f.fileno())
+        offsets = {"count": self._count}
+        for key, f in (("ndjson", self._ndjson), ("json", self._json), ("csv", self._csv_file), ("users", self._users_file)):
+            if f is not None:
+                offsets[key] = f.tell()
+        return offsets
+
+    def resume(self, offsets: Dict[str, int]) -> None:
+        """
+        Reopen the outputs in append mode after truncating them to a checkpoint,
+        dropping anything written after it.
+        """
+        for name, key in ((self.jsonl_name, "ndjson"), (self.json_name, "json"), (self.csv_name, "csv")):
+            if key in self.formats:
+                os.truncate(self._path(name), offsets[key])
+        if self.users is not None:
+            users_path = self._path(self.users_name)
+            if "users" in offsets:
+                os.truncate(users_path, offsets["users"])
+            self.users.load(users_path)
+        self._open(append=True)
+        self._count = offsets["count"]
+
+    @staticmethod
+    def _csv_row(item: Union[SkoolItem, RawItem]) -> List[Any]:
+        if isinstance(item, RawItem):
+            data = item.data
+            return [
+                data["type"],
+                data["id"],
+                data["title"] or data["postTitle"],
+                data["url"],
+                data["createdAt"] or "",
+                data["metadata"].get("comments", 0),
+                data["metadata"].get("upvotes", 0),
+            ]
+        return [
+            item.type.value,
+            item.id,
+            item.title or item.postTitle,
+            item.url,
+            item.createdAt or "",
+            item.metadata.get("comments", 0),
+            item.metadata.get("upvotes", 0),
+        ]
+
+    def write(self, item: Union[SkoolItem, RawItem]) -> None:
+        if not self._opened:
+            self._open()
+        refs = self.users is not None
+        if refs:
+            if isinstance(item, RawItem):
+                item = item.model(self.users)
+            self._write_users()
+        if self._ndjson is not None:
+            self._ndjson.write((item.json if isinstance(item, RawItem) else dumps(item, user_refs=refs)) + b"\n")
+        if self._json is not None:
+            # Same layout as orjson.dumps(list, OPT_INDENT_2): every element is
+            # indented one level and separated by ",\n". orjson never emits raw
+            # newlines inside strings, so re-indenting line by line is safe.
+            if isinstance(item, RawItem):
+                pretty = orjson.dumps(item.data, option=orjson.OPT_INDENT_2)
+            else:
+                pretty = dumps(item, option=orjson.OPT_INDENT_2, user_refs=refs)
+            self._json.write((b",\n  " if self._count else b"\n  ") + pretty.replace(b"\n", b"\n  "))
+        if self._csv is not None:
+            self._csv.writerow(self._csv_row(item))
+        self._count += 1
+
+    def _write_users(self) -> None:
+        # Before the items referring to them, so a checkpoint never has dangling ids
+        for user in self.users.drain():
+            self._users_file.write(dumps(user) + b"\n")
+
+    def _compact_users(self) -> None:
+        path = self._path(self.users_name)
+        with open(path + ".tmp", "wb", buffering=self.buffer_size) as f:
+            for user in self.users:
+                f.write(dumps(user) + b"\n")
+        os.replace(path + ".tmp", path)
+
+    def flush(self) -> None:
+        for f in self._files():
+            f.flush()
 
     def finalize(self) -> None:
-        # Write JSON array
-        with open(self._path(self.json_name), "wb") as f:
-            f.write(orjson.dumps([i.model_dump() for i in self._buffer], option=orjson.OPT_INDENT_2))
-
-        # Minimal CSV for a quick view
-        rows = []
-        for i in self._buffer:
-            rows.append(
-                {
-                    "type": i.type.value,
-                    "id": i.id,
-                    "title": i.title or i.postTitle,
-                    "url": i.url,
-                    "createdAt": i.createdAt or "",
-                    "commentsCount": i.metadata.get("comments", 0),
-                    "upvotes": i.metadata.get("upvotes", 0),
-                }
-            )
-        df = pd.DataFrame(rows)
-        df.to_csv(self._path(self.csv_name), index=False)
\ No newline at end of file
+        if self._finalized:
+            return
+        self._finalized = True
+        if not self._opened:
+            # Nothing written: empty array and a header-less CSV, as before
+            if "json" in self.formats:
+                with open(self._path(self.json_name), "wb") as f:
+                    f.write(b"[]")
+            if "csv" in self.formats:
+                with open(self._path(self.csv_name), "w", encoding="utf-8") as f:
+                    f.write(os.linesep)
+            if self.users is not None:
+                self._compact_users()
+            return
+        if self._json is not None and self._count:
+            self._json.write(b"\n]")
+        elif self._json is not None:
+            # Opened by checkpoint() but nothing written: same files as an empty run
+            self._json.seek(0)
+            self._json.truncate()
+            self._json.write(b"[]")
+        if self._csv_file is not None and not self._count:
+            self._csv_file.seek(0)
+            self._csv_file.truncate()
+            self._csv_file.write(os.linesep)
+        for f in self._files():
+            f.close()
+        if self.users is not None:
+            self._compact_users()
+        self._ndjson = self._json = self._csv_file = self._csv = self._users_file = None
\ No newline at end of file
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, IO, Iterator, Optional, Set, Tuple
+
+import orjson
+
+@dataclass
+class JournalState:
+    done: Set[str] = field(default_factory=set)
+    # Exporter.checkpoint() taken after the last completed unit
+    offsets: Optional[Dict[str, int]] = None
+    # ...and when the run started: its output begins here (earlier runs' before)
+    start: Optional[Dict[str, int]] = None
+
+@dataclass
+class RunJournal:
+    """
+    Append-only log of finished work units (URLs or feed pages).
+
+    Each "done" line carries the exporter's file offsets at that point, so a
+    resumed run can cut the outputs back to the last consistent state and
+    never re-emit records from a unit that was only partly exported.
+    """
+
+    path: str
+    _f: Optional[IO[bytes]] = field(default=None, init=False, repr=False)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> JournalState:
+        state = JournalState()
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    entry = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # Torn last line from a crash mid-write
+                    break
+                if entry.get("event") == "done":
+                    state.done.add(entry["unit"])
+                elif entry.get("event") == "start":
+                    state.start = entry.get("offsets")
+                if "offsets" in entry:
+                    state.offsets = entry["offsets"]
+        return state
+
+    def units(self) -> Iterator[Tuple[str, Dict[str, int], Dict[str, int]]]:
+        """
+        (unit, offsets before, offsets after) for every finished unit, in the
+        order they were exported: the unit's records are the bytes between the
+        two checkpoints.
+        """
+        before: Optional[Dict[str, int]] = None
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    entry = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    break
+                if "offsets" not in entry:
+                    continue
+                if entry.get("event") == "done" and before is not None:
+                    yield entry["unit"], before, entry["offsets"]
+                before = entry["offsets"]
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        if self._f is None:
+            self._f = open(self.path, "ab")
+        self._f.write(orjson.dumps(entry) + b"\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def start(self, offsets: Dict[str, int]) -> None:
+        """
+        Begin a fresh journal, recording where this run's output starts.
+        """
+        if self._f is not None:
+            self._f.close()
+        self._f = open(self.path, "wb")
+        self._append({"event": "start", "offsets": offsets})
+
+    def mark_done(self, unit: str, offsets: Dict[str, int], items: int = 0) -> None:
+        self._append({"event": "done", "unit": unit, "items": items, "offsets": offsets})
+
+    def finish(self) -> None:
+        self._append({"event": "finished"})
+        self.close()
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            self._f = None
\ No newline at end of file
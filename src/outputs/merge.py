@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import orjson
+
+from dedup import Deduper
+from outputs.exporters import FORMATS, Exporter
+from outputs.journal import RunJournal
+from outputs.schema import RawItem, User, build, dumps
+from outputs.users import UserRegistry
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# (partition dir, start, end) of a run of NDJSON lines; end None = to the end of the file
+Block = Tuple[str, int, Optional[int]]
+
+@dataclass
+class MergeStats:
+    partitions: int = 0
+    items: int = 0
+    duplicates: int = 0
+    users: int = 0
+
+def _base_unit(unit: str) -> str:
+    # Crawled feed pages are journaled as "<url>#p<n>"
+    head, sep, tail = unit.rpartition("#p")
+    return head if sep and tail.isdigit() else unit
+
+def _blocks(partitions: Sequence[str], urls: Sequence[str], jsonl_name: str) -> Iterator[Block]:
+    """
+    NDJSON byte ranges of all partitions, ordered by input URL (from each
+    partition's run journal) so the result does not depend on which worker
+    handled which URL. Partitions without a journal follow whole, in order.
+    """
+    wanted = set(urls)
+    by_url: Dict[str, List[Block]] = {}
+    rest: List[Block] = []
+    for part in partitions:
+        if not os.path.exists(os.path.join(part, jsonl_name)):
+            logger.warning("No %s in %s, skipping", jsonl_name, part)
+            continue
+        journal = RunJournal(os.path.join(part, "run.journal"))
+        if not journal.exists():
+            rest.append((part, 0, None))
+            continue
+        for unit, before, after in journal.units():
+            if "ndjson" not in after:
+                raise ValueError(f"{part} was not written with ndjson output; it cannot be merged")
+            block = (part, before["ndjson"], after["ndjson"])
+            base = _base_unit(unit)
+            if base in wanted:
+                by_url.setdefault(base, []).append(block)
+            else:
+                rest.append(block)
+    for url in dict.fromkeys(urls):
+        yield from by_url.pop(url, [])
+    for blocks in by_url.values():
+        yield from blocks
+    yield from rest
+
+def _read_lines(path: str, start: int, end: Optional[int]) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        pos = start
+        for line in f:
+            if end is not None and pos >= end:
+                return
+            pos += len(line)
+            line = line.rstrip(b"\r\n")
+            if line.strip():
+                yield line
+
+def merge_partitions(
+    partitions: Sequence[str],
+    out_dir: str,
+    urls: Sequence[str] = (),
+    formats: Sequence[str] = FORMATS,
+    deduper: Optional[Deduper] = None,
+) -> MergeStats:
+    """
+    Combine shard/worker outputs into one items.ndjson/items.json/items.csv
+    set (and users.ndjson when the partitions have one) in `out_dir`.
+
+    Items are ordered by `urls` (then by journal order within a URL) and
+    deduplicated by (type, id) like a single run, keeping the first copy
+    (`deduper` picks the seen-set, in memory by default); NDJSON lines are copied
+    verbatim. Users are merged like in a single run (newest copy wins, gaps
+    filled) and written sorted by id.
+    """
+    stats = MergeStats(partitions=len(partitions))
+    # The merge is the whole result: replace items.ndjson instead of appending to it
+    exporter = Exporter(out_dir, formats=tuple(f for f in formats if f in FORMATS), append_ndjson=False)
+    deduper = deduper or Deduper()
+    for part, start, end in _blocks(partitions, urls, exporter.jsonl_name):
+        for line in _read_lines(os.path.join(part, exporter.jsonl_name), start, end):
+            item = RawItem(line)
+            # type and id are read off the line; only the exporters decode it
+            if not deduper.first(item.type, item.id):
+                continue
+            exporter.write(item)
+            stats.items += 1
+    exporter.finalize()
+    stats.duplicates = deduper.dropped
+    deduper.close()
+
+    users_paths = [os.path.join(p, exporter.users_name) for p in partitions]
+    users_paths = [p for p in users_paths if os.path.exists(p)]
+    if users_paths:
+        registry = UserRegistry()
+        for path in users_paths:
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        registry.intern(build(User, **orjson.loads(line)))
+                    except orjson.JSONDecodeError:
+                        break
+        merged = sorted(registry, key=lambda u: u.id)
+        with open(os.path.join(out_dir, exporter.users_name), "wb") as f:
+            for user in merged:
+                f.write(dumps(user) + b"\n")
+        stats.users = len(merged)
+    return stats
\ No newline at end of file
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import os
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
 
+import orjson
 from pydantic import BaseModel, Field
 
+# Validate every record the parsers build (slower); also see set_strict_validation()
+_STRICT = os.environ.get("SKOOL_STRICT_VALIDATION", "").lower() in ("1", "true", "yes")
+
 class ItemType(str, Enum):
     post = "post"
     module = "module"
@@ -61,4 +67,132 @@ class SkoolItem(BaseModel):
     user: Optional[User] = None
     comments: List[Comment] = Field(default_factory=list)
     media: List[str] = Field(default_factory=list)
-    courseMetaDetails: Optional[CourseMetaDetails] = None
\ No newline at end of file
+    courseMetaDetails: Optional[CourseMetaDetails] = None
+
+M = TypeVar("M", bound=BaseModel)
+
+_new = object.__new__
+_set = object.__setattr__
+_FIELD_ORDER: Dict[type, Tuple[str, ...]] = {}
+
+def set_strict_validation(enabled: bool) -> None:
+    global _STRICT
+    _STRICT = bool(enabled)
+
+def strict_validation() -> bool:
+    return _STRICT
+
+def _field_order(cls: type) -> Tuple[str, ...]:
+    order = _FIELD_ORDER.get(cls)
+    if order is None:
+        order = _FIELD_ORDER[cls] = tuple(cls.model_fields)
+    return order
+
+def build(cls: Type[M], **fields: Any) -> M:
+    """
+    Construct a model from values the parsers have already coerced.
+
+    Unless strict validation is on, pydantic validation is skipped and the
+    fields are stored as given, so callers must pass the right types.
+    """
+    if _STRICT:
+        return cls(**fields)
+    given = set(fields)
+    if tuple(fields) != _field_order(cls):
+        # Missing fields or a different order: fill defaults, keep declared order
+        defaults = cls.model_fields
+        fields = {
+            name: fields[name] if name in fields else defaults[name].get_default(call_default_factory=True)
+            for name in _field_order(cls)
+        }
+    obj = _new(cls)
+    _set(obj, "__dict__", fields)
+    _set(obj, "__pydantic_fields_set__", given)
+    _set(obj, "__pydantic_extra__", None)
+    _set(obj, "__pydantic_private__", None)
+    return obj
+
+def _model_fields(obj: Any) -> Dict[str, Any]:
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def _model_fields_user_refs(obj: Any) -> Any:
+    if isinstance(obj, User) and obj.id:
+        return obj.id
+    return _model_fields(obj)
+
+def dumps(item: BaseModel, option: Optional[int] = None, user_refs: bool = False) -> bytes:
+    """
+    orjson-encode a model tree directly; same bytes as orjson.dumps(item.model_dump()).
+    With `user_refs`, nested users are written as their id (users table layout).
+    """
+    return orjson.dumps(item, default=_model_fields_user_refs if user_refs else _model_fields, option=option)
+
+def _user_from_dict(data: Any, users: Any) -> Optional[User]:
+    if not isinstance(data, dict):
+        return None
+    user = build(User, **data)
+    return users.intern(user) if users is not None else user
+
+def _comment_from_dict(data: Dict[str, Any], users: Any) -> Comment:
+    data = dict(data)
+    data["user"] = _user_from_dict(data.get("user"), users)
+    data["replies"] = [_comment_from_dict(r, users) for r in data.get("replies") or []]
+    return build(Comment, **data)
+
+def item_from_dict(data: Dict[str, Any], users: Any = None) -> SkoolItem:
+    """
+    Rebuild a SkoolItem from its dumps() form; authors are interned in `users`
+    (a UserRegistry) when given.
+    """
+    data = dict(data)
+    data["type"] = ItemType(data["type"])
+    data["user"] = _user_from_dict(data.get("user"), users)
+    data["comments"] = [_comment_from_dict(c, users) for c in data.get("comments") or []]
+    meta = data.get("courseMetaDetails")
+    data["courseMetaDetails"] = build(CourseMetaDetails, **meta) if isinstance(meta, dict) else None
+    return build(SkoolItem, **data)
+
+_TYPE_PREFIX = b'{"type":"'
+_ID_PREFIX = b',"id":"'
+
+@dataclass
+class RawItem:
+    """
+    A SkoolItem already serialized by dumps(), e.g. in a parse worker process.
+    Written to NDJSON as is; decoded only when another output needs it.
+    """
+
+    json: bytes
+    _data: Optional[Dict[str, Any]] = field(default=None, repr=False)
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = orjson.loads(self.json)
+        return self._data
+
+    @property
+    def type(self) -> str:
+        # dumps() writes "type" first, so it is readable without decoding the item
+        if self.json.startswith(_TYPE_PREFIX):
+            end = self.json.find(b'"', len(_TYPE_PREFIX))
+            if end > 0:
+                return self.json[len(_TYPE_PREFIX):end].decode()
+        return str(self.data.get("type") or "")
+
+    @property
+    def id(self) -> str:
+        # ...and "id" right after it; ids with escapes take the slow path
+        if self._data is None and self.json.startswith(_TYPE_PREFIX):
+            start = self.json.find(b'"', len(_TYPE_PREFIX)) + 1
+            if self.json.startswith(_ID_PREFIX, start):
+                start += len(_ID_PREFIX)
+                end = self.json.find(b'"', start)
+                if end > 0 and b"\\" not in self.json[start:end]:
+                    return self.json[start:end].decode()
+        return str(self.data.get("id") or "")
+
+    def model(self, users: Any = None) -> SkoolItem:
+        return item_from_dict(self.data, users)
\ No newline at end of file
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+
+from outputs.columnar import rows_for
+from outputs.schema import Comment, SkoolItem, User
+
+if TYPE_CHECKING:
+    import sqlite3
+
+# Column order per table; `id` is the primary key everywhere
+COLUMNS: Dict[str, List[str]] = {
+    "posts": [
+        "id", "groupId", "createdAt", "updatedAt", "name", "title", "postTitle", "content", "url",
+        "urlAjax", "postType", "rootId", "parentId", "labelId", "userId", "userName",
+        "commentsCount", "upvotes", "pinned", "metadata",
+    ],
+    "comments": [
+        "id", "groupId", "createdAt", "updatedAt", "postId", "parentId", "rootId", "depth",
+        "content", "upvotes", "attachments", "attachmentsData", "userId", "userName",
+    ],
+    "modules": [
+        "id", "groupId", "createdAt", "updatedAt", "name", "title", "postTitle", "content", "url",
+        "urlAjax", "postType", "media", "courseId", "courseName", "courseTitle",
+    ],
+    "users": ["id", "name", "firstName", "lastName", "createdAt", "updatedAt", "metadata"],
+}
+
+INDEXES = [
+    ("posts", "groupId"),
+    ("posts", "createdAt"),
+    ("posts", "updatedAt"),
+    ("posts", "userId"),
+    ("comments", "postId"),
+    ("comments", "parentId"),
+    ("comments", "groupId"),
+    ("comments", "createdAt"),
+    ("comments", "updatedAt"),
+    ("modules", "groupId"),
+    ("modules", "createdAt"),
+]
+
+_INTEGER = {"commentsCount", "upvotes", "pinned", "depth"}
+_NEWER = "COALESCE(excluded.updatedAt, '') >= COALESCE(users.updatedAt, '')"
+
+def _create_sql(table: str) -> str:
+    cols = ", ".join(
+        f"{c} {'INTEGER' if c in _INTEGER else 'TEXT'}{' PRIMARY KEY' if c == 'id' else ''}"
+        for c in COLUMNS[table]
+    )
+    return f"CREATE TABLE IF NOT EXISTS {table} ({cols}) WITHOUT ROWID"
+
+def _upsert_sql(table: str) -> str:
+    cols = COLUMNS[table]
+    head = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' for _ in cols)}) ON CONFLICT(id) DO UPDATE SET "
+    if table != "users":
+        return head + ", ".join(f"{c} = excluded.{c}" for c in cols[1:])
+    # Users arrive in many partial copies (comment authors carry less than post
+    # authors): the more recently updated copy wins, but never blanks a field
+    sets = [
+        f"{c} = CASE WHEN {_NEWER} THEN COALESCE(NULLIF(excluded.{c}, ''), users.{c}) "
+        f"ELSE COALESCE(NULLIF(users.{c}, ''), excluded.{c}) END"
+        for c in cols[1:]
+        if c != "metadata"
+    ]
+    sets.append(
+        f"metadata = CASE WHEN {_NEWER} THEN json_patch(users.metadata, excluded.metadata) "
+        "ELSE json_patch(excluded.metadata, users.metadata) END"
+    )
+    return head + ", ".join(sets)
+
+UPSERT_SQL = {table: _upsert_sql(table) for table in COLUMNS}
+
+def _comment_users(comments: List[Comment]) -> Iterator[User]:
+    for c in comments:
+        if c.user is not None:
+            yield c.user
+        yield from _comment_users(c.replies)
+
+def _user_row(user: User) -> Tuple[Any, ...]:
+    # Empty metadata values are left out so json_patch never blanks a known one
+    meta = {k: v for k, v in user.metadata.items() if v not in (None, "")}
+    return (
+        user.id,
+        user.name,
+        user.firstName,
+        user.lastName,
+        user.createdAt,
+        user.updatedAt,
+        orjson.dumps(meta).decode(),
+    )
+
+@dataclass
+class SqliteExporter:
+    """
+    Upserts items into a normalized SQLite database (posts, comments, modules,
+    users; same columns as the Parquet tables) so repeated runs update rows in
+    place instead of appending.
+
+    Rows are batched and written with executemany in one transaction per
+    `batch_size` rows or per commit(). The database runs in WAL mode, so it
+    can be queried while a scrape is writing to it.
+    """
+
+    path: str
+    batch_size: int = 2000
+    rows_written: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(COLUMNS, 0))
+    _conn: Optional[sqlite3.Connection] = field(default=None, init=False, repr=False)
+    _pending: Dict[str, List[Tuple[Any, ...]]] = field(default_factory=dict, init=False, repr=False)
+    _pending_rows: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        import sqlite3
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            for table in COLUMNS:
+                self._conn.execute(_create_sql(table))
+            for table, col in INDEXES:
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{col} ON {table} ({col})")
+        self._pending = {table: [] for table in COLUMNS}
+
+    def _add(self, table: str, row: Tuple[Any, ...]) -> None:
+        self._pending[table].append(row)
+        self._pending_rows += 1
+
+    def write(self, item: SkoolItem) -> None:
+        # Timestamps stay ISO strings in SQLite: no conversion
+        for table, row in rows_for(item, ts=lambda value: value):
+            if table == "modules":
+                row["media"] = orjson.dumps(row["media"]).decode()
+            self._add(table, tuple(row[c] for c in COLUMNS[table]))
+        if item.user is not None and item.user.id:
+            self._add("users", _user_row(item.user))
+        for user in _comment_users(item.comments):
+            if user.id:
+                self._add("users", _user_row(user))
+        if self._pending_rows >= self.batch_size:
+            self.commit()
+
+    def commit(self) -> None:
+        """
+        Write all pending rows in a single transaction.
+        """
+        if not self._pending_rows:
+            return
+        with self._conn:
+            for table, rows in self._pending.items():
+                if rows:
+                    self._conn.executemany(UPSERT_SQL[table], rows)
+                    self.rows_written[table] += len(rows)
+                    rows.clear()
+        self._pending_rows = 0
+
+    def finalize(self) -> None:
+        if self._conn is None:
+            return
+        self.commit()
+        self._conn.execute("PRAGMA optimize")
+        self._conn.close()
+        self._conn = None
\ No newline at end of file
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+import orjson
+
+from outputs.schema import User, build
+
+@dataclass
+class UserRegistry:
+    """
+    Run-wide table of authors, interned by id.
+
+    The parsers hand every User they build to intern() and keep the returned
+    shared instance, so an author seen on a thousand comments exists once.
+    When the same id shows up again its fields are merged: non-empty values
+    from the more recently updated copy win, gaps are filled from either.
+    Users changed since the last drain() are tracked for the exporter.
+    """
+
+    _users: Dict[str, User] = field(default_factory=dict, repr=False)
+    _dirty: Dict[str, None] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def get(self, user_id: str) -> Optional[User]:
+        return self._users.get(user_id)
+
+    def intern(self, user: Optional[User]) -> Optional[User]:
+        if user is None or not user.id:
+            return user
+        with self._lock:
+            current = self._users.get(user.id)
+            if current is None:
+                self._users[user.id] = user
+                self._dirty[user.id] = None
+                return user
+            if self._merge(current, user):
+                self._dirty[user.id] = None
+            return current
+
+    @staticmethod
+    def _merge(current: User, new: User) -> bool:
+        newer = (new.updatedAt or "") >= (current.updatedAt or "")
+        fields = current.__dict__
+        changed = False
+        for name in ("name", "createdAt", "updatedAt", "firstName", "lastName"):
+            value = getattr(new, name)
+            if value and value != fields[name] and (newer or not fields[name]):
+                fields[name] = value
+                changed = True
+        meta = current.metadata
+        for key, value in new.metadata.items():
+            if value and value != meta.get(key) and (newer or not meta.get(key)):
+                meta[key] = value
+                changed = True
+            elif key not in meta:
+                meta[key] = value
+                changed = True
+        return changed
+
+    def drain(self) -> List[User]:
+        """
+        Users added or changed since the previous drain(), in first-seen order.
+        """
+        with self._lock:
+            ids, self._dirty = list(self._dirty), {}
+            return [self._users[i] for i in ids]
+
+    def __iter__(self) -> Iterator[User]:
+        with self._lock:
+            return iter(list(self._users.values()))
+
+    def load(self, path: str) -> None:
+        """
+        Re-seed from a users.ndjson written by an earlier (interrupted) run;
+        later lines for the same id are newer versions.
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    data = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    break
+                with self._lock:
+                    self._users[data["id"]] = build(User, **data)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, Iterator, List, Optional, Union
+
+from extractors.classroom_scraper import ClassroomScraper
+from extractors.community_scraper import CommunityScraper
+from extractors.page_cache import Page
+from outputs.schema import RawItem, dumps, set_strict_validation, strict_validation
+from parsers.classroom import normalize_module
+from parsers.posts import normalize_post
+from pipeline import UnitDone
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# Per-process scrapers, set up once by _init_worker
+_worker: Dict[str, Any] = {}
+
+def _init_worker(
+    max_items: Optional[int],
+    fast_extract: bool,
+    selectors_path: Optional[str] = None,
+    strict: bool = False,
+) -> None:
+    # Spawned workers re-import the schema module, which only reads the env var
+    set_strict_validation(strict)
+    # Comment threads are fetched by the parent (it owns the HTTP session and
+    # rate limiter); workers only extract and normalize
+    kw = dict(include_comments=False, max_items=max_items, fast_extract=fast_extract, selectors_path=selectors_path)
+    _worker["post"] = CommunityScraper(**kw)
+    _worker["module"] = ClassroomScraper(**kw)
+
+def _parse_page(url: str, html: str, kinds: List[str]) -> List[bytes]:
+    page = Page(url=url, html=html)
+    out: List[bytes] = []
+    if "post" in kinds:
+        out.extend(dumps(normalize_post(raw)) for raw in _worker["post"].iter_items_from_page(page))
+    if "module" in kinds:
+        out.extend(dumps(normalize_module(raw)) for raw in _worker["module"].iter_modules_from_page(page))
+    return out
+
+def _normalize(kind: str, records: List[Dict]) -> List[bytes]:
+    normalize = normalize_post if kind == "post" else normalize_module
+    return [dumps(normalize(raw)) for raw in records]
+
+@dataclass
+class ParsePool:
+    """
+    Runs extraction and normalization in `workers` processes.
+
+    Workers get raw HTML (or raw records, when the parent had to fetch their
+    comment threads first) and send back dumps() bytes, so no pydantic objects
+    cross the process boundary. ordered() yields the results in submission
+    order with at most `window` jobs in flight, so output is identical to an
+    in-process run.
+    """
+
+    workers: int
+    max_items: Optional[int] = None
+    fast_extract: bool = True
+    window: Optional[int] = None
+    selectors_path: Optional[str] = None
+    _pool: Optional[ProcessPoolExecutor] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.window = self.window or self.workers * 2
+        # spawn: the parent runs fetch and pipeline threads, which fork does not mix well with
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.max_items, self.fast_extract, self.selectors_path, strict_validation()),
+        )
+
+    def parse_page(self, page: Page, kinds: List[str]) -> Future:
+        return self._pool.submit(_parse_page, page.url, page.html, kinds)
+
+    def normalize(self, kind: str, records: List[Dict]) -> Future:
+        return self._pool.submit(_normalize, kind, records)
+
+    def ordered(self, jobs: Iterable[Union[Future, UnitDone]]) -> Iterator[Union[RawItem, UnitDone]]:
+        """
+        Resolve a stream of job futures and UnitDone markers in order. A marker
+        with items=None gets the number of items since the previous marker.
+        """
+        pending: Deque[Union[Future, UnitDone]] = deque()
+        in_flight = 0
+        count = 0
+
+        def _drain_one() -> Iterator[Union[RawItem, UnitDone]]:
+            nonlocal in_flight, count
+            head = pending.popleft()
+            if isinstance(head, UnitDone):
+                if head.items is None:
+                    head.items = count
+                count = 0
+                yield head
+                return
+            in_flight -= 1
+            for data in head.result():
+                count += 1
+                yield RawItem(data)
+
+        try:
+            for job in jobs:
+                pending.append(job)
+                if isinstance(job, Future):
+                    in_flight += 1
+                while pending and (in_flight >= self.window or isinstance(pending[0], UnitDone)):
+                    yield from _drain_one()
+            while pending:
+                yield from _drain_one()
+        finally:
+            for job in pending:
+                if isinstance(job, Future):
+                    job.cancel()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
\ No newline at end of file
@@ -6,13 +6,16 @@ from outputs.schema import (
     ItemType,
     SkoolItem,
     CourseMetaDetails,
+    build,
 )
+from parsers.comments import normalize_comments
 from extractors.utils_time import to_iso
 
 def _course_meta(raw: Dict[str, Any]) -> Optional[CourseMetaDetails]:
     if not isinstance(raw, dict):
         return None
-    return CourseMetaDetails(
+    return build(
+        CourseMetaDetails,
         id=str(raw.get("id") or raw.get("@id") or raw.get("courseId") or ""),
         name=str(raw.get("name") or raw.get("slug") or ""),
         title=str(raw.get("title") or raw.get("headline") or raw.get("name") or ""),
@@ -37,7 +40,8 @@ def normalize_module(raw: Dict[str, Any]) -> SkoolItem:
             course_meta = _course_meta(maybe)
             break
 
-    return SkoolItem(
+    return build(
+        SkoolItem,
         type=ItemType.module,
         id=str(raw.get("id") or raw.get("@id") or ""),
         name=str(raw.get("name") or ""),
@@ -56,7 +60,7 @@ def normalize_module(raw: Dict[str, Any]) -> SkoolItem:
         parentId=str(raw.get("parent_id") or ""),
         labelId=str(raw.get("labelId") or ""),
         user=None,
-        comments=[],
+        comments=normalize_comments(raw.get("comments") or []),
         media=media,
         courseMetaDetails=course_meta,
     )
\ No newline at end of file
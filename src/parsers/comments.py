@@ -2,14 +2,16 @@ from __future__ import annotations
 
 from typing import Any, Dict, Iterable, List, Optional
 
-from outputs.schema import Comment, User
+from outputs.schema import Comment, User, build
+from outputs.users import UserRegistry
 from extractors.utils_time import to_iso
 
 def _user_from_comment(u: Dict[str, Any]) -> Optional[User]:
     if not isinstance(u, dict):
         return None
     meta = u.get("metadata") or {}
-    return User(
+    return build(
+        User,
         id=str(u.get("id") or u.get("userId") or u.get("user_id") or ""),
         name=str(u.get("name") or ""),
         metadata={
@@ -23,7 +25,7 @@ def _user_from_comment(u: Dict[str, Any]) -> Optional[User]:
         lastName=str(u.get("lastName") or u.get("last_name") or ""),
     )
 
-def _coerce_comment(rec: Dict[str, Any]) -> Optional[Comment]:
+def _coerce_comment(rec: Dict[str, Any], users: Optional[UserRegistry] = None) -> Optional[Comment]:
     """
     Accept either a raw record with fields at top-level or nested under 'post'.
     """
@@ -33,8 +35,12 @@ def _coerce_comment(rec: Dict[str, Any]) -> Optional[Comment]:
 
     u = node.get("user") or {}
     meta = node.get("metadata") or {}
+    user = _user_from_comment(u)
+    if users is not None:
+        user = users.intern(user)
 
-    return Comment(
+    return build(
+        Comment,
         id=str(node.get("id") or node.get("comment_id") or ""),
         parentId=str(node.get("parent_id") or ""),
         rootId=str(node.get("root_id") or node.get("rootId") or ""),
@@ -44,7 +50,7 @@ def _coerce_comment(rec: Dict[str, Any]) -> Optional[Comment]:
         updatedAt=to_iso(node.get("updated_at") or node.get("updatedAt")),
         attachments=str(meta.get("attachments") or ""),
         attachmentsData=str(meta.get("attachments_data") or ""),
-        user=_user_from_comment(u),
+        user=user,
         replies=[],
     )
 
@@ -60,16 +66,17 @@ def _build_tree(flat: List[Comment]) -> List[Comment]:
             roots.append(c)
     return roots
 
-def normalize_comments(records: Any) -> List[Comment]:
+def normalize_comments(records: Any, users: Optional[UserRegistry] = None) -> List[Comment]:
     """
     Normalize comments payload (list or dict) into a nested tree of Comment objects.
+    Authors are interned in `users` when given.
     """
     flat: List[Comment] = []
     if isinstance(records, dict) and "items" in records:
         records = records["items"]
     if isinstance(records, list):
         for rec in records:
-            c = _coerce_comment(rec)
+            c = _coerce_comment(rec, users)
             if c:
                 flat.append(c)
     return _build_tree(flat)
\ No newline at end of file
@@ -7,14 +7,17 @@ from outputs.schema import (
     ItemType,
     SkoolItem,
     User,
+    build,
 )
+from outputs.users import UserRegistry
 from parsers.comments import normalize_comments
 from extractors.utils_time import to_iso
 
 def _coerce_user(u: Dict[str, Any]) -> User:
     # Accept multiple casing styles (snake/camel)
     meta = u.get("metadata") or {}
-    return User(
+    return build(
+        User,
         id=str(u.get("id") or u.get("userId") or u.get("user_id") or ""),
         name=str(u.get("name") or u.get("username") or ""),
         metadata={
@@ -32,14 +35,18 @@ def _coerce_user(u: Dict[str, Any]) -> User:
         lastName=str(u.get("lastName") or u.get("last_name") or ""),
     )
 
-def normalize_post(raw: Dict[str, Any]) -> SkoolItem:
+def normalize_post(raw: Dict[str, Any], users: Optional[UserRegistry] = None) -> SkoolItem:
     meta = raw.get("metadata") or raw.get("meta") or {}
     # Some Skool payloads nest post under 'post'
     core = raw.get("post") if isinstance(raw.get("post"), dict) else raw
     user_raw = core.get("user") or {}
     comments_raw = core.get("comments") or raw.get("comments") or []
+    user = _coerce_user(user_raw) if user_raw else None
+    if users is not None:
+        user = users.intern(user)
 
-    item = SkoolItem(
+    item = build(
+        SkoolItem,
         type=ItemType.post,
         id=str(core.get("id") or core.get("post_id") or core.get("uuid") or ""),
         name=str(core.get("name") or core.get("slug") or ""),
@@ -69,8 +76,8 @@ def normalize_post(raw: Dict[str, Any]) -> SkoolItem:
         rootId=str(core.get("rootId") or raw.get("rootId") or core.get("id") or ""),
         parentId=str(core.get("parent_id") or ""),
         labelId=str(core.get("labelId") or meta.get("labels") or ""),
-        user=_coerce_user(user_raw) if user_raw else None,
-        comments=normalize_comments(comments_raw),
+        user=user,
+        comments=normalize_comments(comments_raw, users),
         media=[],
         courseMetaDetails=None,
     )
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+@dataclass
+class UnitDone:
+    """
+    Marker sent down a stream after the last item of a work unit (a URL or a
+    feed page), so the consumer can checkpoint once the unit is fully exported.
+    """
+
+    unit: str
+    # None: not known yet (ParsePool.ordered fills it in)
+    items: Optional[int] = 0
+
+class _Failure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+def bounded(source: Iterable[T], maxsize: int = 256, poll: float = 0.1) -> Iterator[T]:
+    """
+    Drain `source` on a background thread into a queue of at most `maxsize` entries
+    and yield from it. When the consumer falls behind the producer blocks, so
+    upstream stages (fetching, parsing) never run more than `maxsize` items ahead.
+    Errors raised by the producer are re-raised in the consumer.
+    """
+    q: "queue.Queue[object]" = queue.Queue(maxsize=max(1, maxsize))
+    stop = threading.Event()
+
+    def _put(obj: object) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(obj, timeout=poll)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for obj in source:
+                if not _put(obj):
+                    return
+        except BaseException as exc:  # surfaced to the consumer below
+            _put(_Failure(exc))
+            return
+        finally:
+            close = getattr(source, "close", None)
+            if stop.is_set() and close is not None:
+                close()
+        _put(_DONE)
+
+    worker = threading.Thread(target=_produce, name="pipeline-producer", daemon=True)
+    worker.start()
+    try:
+        while True:
+            obj = q.get()
+            if obj is _DONE:
+                return
+            if isinstance(obj, _Failure):
+                raise obj.exc
+            yield obj  # type: ignore[misc]
+    finally:
+        stop.set()
+        worker.join()
\ No newline at end of file
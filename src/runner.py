@@ -1,20 +1,39 @@
 import argparse
+import itertools
 import json
 import os
 import sys
 import time
-from typing import Any, Dict, List, Optional
-
-from tqdm import tqdm
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
 
 # Local imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from extractors.community_scraper import CommunityScraper
+from extractors.capture import CaptureArchive, CaptureWriter, ReplayEngine
 from extractors.classroom_scraper import ClassroomScraper
-from outputs.exporters import Exporter
-from outputs.schema import ItemType, SkoolItem
+from extractors.feed_crawler import FeedCrawler
+from extractors.http_cache import HttpCache
+from extractors.http_client import FetchEngine, imap_ordered
+from extractors.page_cache import PageCache
+from extractors.rate_limit import RateLimiter
+from extractors.scripts import TagStream
+from extractors.replay import iter_records
+from outputs.columnar import ParquetExporter
+from outputs.exporters import FORMATS, Exporter
+from outputs.journal import RunJournal
+from outputs.merge import merge_partitions
+from outputs.sqlite_sink import SqliteExporter
+from outputs.schema import ItemType, RawItem, SkoolItem, set_strict_validation
+from outputs.users import UserRegistry
 from parsers.posts import normalize_post
 from parsers.classroom import normalize_module
+from dedup import CompactSeenSet, Deduper, DiskSeenSet
+from metrics import RunMetrics
+from parse_pool import ParsePool
+from pipeline import UnitDone, bounded
+from sharding import WorkQueue, partition_dir, partitions_in, select_shard, shard_name
 
 def load_json(path: str) -> Any:
     with open(path, "r", encoding="utf-8") as f:
@@ -23,6 +42,190 @@ def load_json(path: str) -> Any:
 def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
+class _NoProgress:
+    def update(self, n: int = 1) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+def exported_keys(path: str, start: int = 0) -> Iterator[Tuple[str, str]]:
+    """
+    (type, id) of every item in an NDJSON output from byte `start` on, to
+    seed dedup on --resume.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        f.seek(start)
+        for line in f:
+            if line.strip():
+                item = RawItem(line)
+                yield item.type, item.id
+
+def progress_bar(**kwargs: Any) -> Any:
+    """
+    A tqdm bar on an interactive terminal; cron jobs and pipes get none (and
+    skip importing tqdm).
+    """
+    if not sys.stderr.isatty():
+        return _NoProgress()
+    from tqdm import tqdm
+
+    return tqdm(**kwargs)
+
+def stream_records(
+    url: str,
+    engine: FetchEngine,
+    comm: Optional[CommunityScraper],
+    clas: Optional[ClassroomScraper],
+) -> Tuple[bool, List[Dict], List[Dict]]:
+    """
+    Post and module records of one page, read while it downloads; the
+    connection is dropped as soon as both scrapers have max_items records.
+    Returns (fetched, posts, modules); a page whose download failed or broke
+    off returns no records, like a failed fetch().
+    """
+    tags = TagStream(engine.stream(url))
+    try:
+        posts = list(itertools.islice(comm.iter_records_streamed(tags), comm.max_items or None)) if comm else []
+        modules = list(itertools.islice(clas.iter_payloads_streamed(tags), clas.max_items or None)) if clas else []
+    finally:
+        tags.close()
+    if not tags.fetched:
+        return False, [], []
+    return True, posts, modules
+
+def iter_online_items(
+    urls: Iterable[str],
+    engine: FetchEngine,
+    cache: PageCache,
+    comm: Optional[CommunityScraper],
+    clas: Optional[ClassroomScraper],
+    skip_unchanged: bool = False,
+    crawler: Optional[FeedCrawler] = None,
+    done: Optional[Set[str]] = None,
+    users: Optional[UserRegistry] = None,
+    metrics: Optional[RunMetrics] = None,
+    stream: bool = False,
+) -> Iterator[Union[SkoolItem, UnitDone]]:
+    # Pages are fetched concurrently but consumed in input order. Both scrapers
+    # read the same cached Page, so its scripts are scanned and decoded once.
+    done = done or set()
+    metrics = metrics or RunMetrics()
+    clock = time.perf_counter
+
+    def _normalized(records: Iterable[Dict], normalize: Callable[[Dict], SkoolItem]) -> Iterator[SkoolItem]:
+        st = metrics.stage("normalize")
+        for raw in metrics.timed("extract", records):
+            t0 = clock()
+            item = normalize(raw)
+            st.seconds += clock() - t0
+            st.calls += 1
+            yield item
+
+    def _post(raw: Dict) -> SkoolItem:
+        return normalize_post(raw, users)
+
+    if stream:
+        # Pages are parsed in the fetch threads while they download, and cut short at max_items
+        def _streamed(url: str) -> Tuple[str, bool, List[Dict], List[Dict]]:
+            return (url,) + stream_records(url, engine, comm, clas)
+
+        for url, fetched, posts, modules in metrics.timed(
+            "fetch_wait", imap_ordered(_streamed, urls, workers=engine.concurrency)
+        ):
+            count = 0
+            if comm is not None:
+                for item in _normalized(comm.with_comments(posts), _post):
+                    yield item
+                    count += 1
+            if clas is not None:
+                for item in _normalized(clas.with_comments(modules), normalize_module):
+                    yield item
+                    count += 1
+            # Failed pages stay out of the journal so --resume retries them
+            if fetched:
+                yield UnitDone(url, count)
+        return
+
+    for page in metrics.timed("fetch_wait", cache.fetch_many(urls, engine.fetch, workers=engine.concurrency)):
+        count = 0
+        if not (skip_unchanged and page.not_modified):
+            if crawler is not None:
+                # Every feed page is its own unit so --resume never re-exports it
+                for feed in metrics.timed("crawl", crawler.crawl_from(page)):
+                    unit = f"{page.url}#p{feed.number}"
+                    if unit in done:
+                        continue
+                    yield from _normalized(crawler.scraper.with_comments(feed.records), _post)
+                    count += len(feed.records)
+                    if feed.page.html:
+                        yield UnitDone(unit, len(feed.records))
+            elif comm is not None:
+                for item in _normalized(comm.iter_items_from_page(page), _post):
+                    yield item
+                    count += 1
+            if clas is not None:
+                for item in _normalized(clas.iter_modules_from_page(page), normalize_module):
+                    yield item
+                    count += 1
+        # Failed pages stay out of the journal so --resume retries them
+        if page.html:
+            yield UnitDone(page.url, count)
+
+def iter_pooled_items(
+    urls: Iterable[str],
+    engine: FetchEngine,
+    cache: PageCache,
+    comm: Optional[CommunityScraper],
+    clas: Optional[ClassroomScraper],
+    pool: ParsePool,
+    skip_unchanged: bool = False,
+    crawler: Optional[FeedCrawler] = None,
+    done: Optional[Set[str]] = None,
+    metrics: Optional[RunMetrics] = None,
+) -> Iterator[Union[RawItem, UnitDone]]:
+    """
+    iter_online_items with extraction and normalization in worker processes;
+    same items in the same order, as RawItems.
+    """
+    done = done or set()
+    metrics = metrics or RunMetrics()
+
+    def _jobs() -> Iterator[Union[Future, UnitDone]]:
+        for page in metrics.timed("fetch_wait", cache.fetch_many(urls, engine.fetch, workers=engine.concurrency)):
+            if not (skip_unchanged and page.not_modified):
+                if crawler is not None:
+                    for feed in metrics.timed("crawl", crawler.crawl_from(page)):
+                        unit = f"{page.url}#p{feed.number}"
+                        if unit in done:
+                            continue
+                        yield pool.normalize("post", list(metrics.timed("extract", crawler.scraper.with_comments(feed.records))))
+                        if feed.page.html:
+                            yield UnitDone(unit, len(feed.records))
+                # Comment threads are fetched here, so those records go to the
+                # workers for normalizing only; other pages are parsed there
+                kinds: List[str] = []
+                for kind, scraper in (("post", comm if crawler is None else None), ("module", clas)):
+                    if scraper is None:
+                        continue
+                    if scraper.include_comments and kinds:
+                        yield pool.parse_page(page, kinds)
+                        kinds = []
+                    if not scraper.include_comments:
+                        kinds.append(kind)
+                    elif kind == "post":
+                        yield pool.normalize(kind, list(metrics.timed("extract", scraper.iter_items_from_page(page))))
+                    else:
+                        yield pool.normalize(kind, list(metrics.timed("extract", scraper.iter_modules_from_page(page))))
+                if kinds:
+                    yield pool.parse_page(page, kinds)
+            if page.html:
+                yield UnitDone(page.url, None)
+
+    yield from pool.ordered(_jobs())
+
 def run(
     urls: List[str],
     mode: str,
@@ -31,62 +234,319 @@ def run(
     offline: bool,
     max_items: Optional[int] = None,
     sample_path: Optional[str] = None,
+    concurrency: int = 3,
+    queue_size: int = 256,
+    page_cache_size: int = 32,
+    http_cache_dir: Optional[str] = None,
+    http_cache_max_mb: int = 512,
+    http_cache_max_age_days: float = 7,
+    skip_unchanged: bool = False,
+    resume: bool = False,
+    crawl: bool = False,
+    max_pages: Optional[int] = None,
+    since: Optional[datetime] = None,
+    rate: float = 5.0,
+    users_table: bool = False,
+    formats: Sequence[str] = FORMATS,
+    sqlite_path: Optional[str] = None,
+    workers: int = 0,
+    metrics_path: Optional[str] = None,
+    metrics_textfile: Optional[str] = None,
+    metrics_interval: float = 15.0,
+    shard_index: int = 0,
+    shard_count: int = 0,
+    queue_dir: Optional[str] = None,
+    worker_id: Optional[str] = None,
+    capture_dir: Optional[str] = None,
+    replay_capture_dir: Optional[str] = None,
+    dedup: str = "memory",
+    selectors_path: Optional[str] = None,
+    stream: bool = False,
 ) -> int:
+    # Sharded and queue workers each write a partition of their own; --merge combines them
+    queue = None
+    if shard_count:
+        urls = select_shard(urls, shard_index, shard_count)
+        output_dir = partition_dir(output_dir, shard_name(shard_index, shard_count))
+    elif queue_dir:
+        # Claims never expire: only a restart under the same id (--resume)
+        # finishes the URLs a crashed worker had taken, so the id must be stable
+        if not worker_id:
+            raise SystemExit("--queue-dir needs a stable --worker-id (reuse it with --resume after a crash)")
+        queue = WorkQueue(queue_dir, worker_id)
+        output_dir = partition_dir(output_dir, f"worker-{worker_id}")
+    if stream:
+        conflicts = {
+            "--crawl": crawl,
+            "--workers": workers > 0,
+            "--http-cache": bool(http_cache_dir),
+            "--skip-unchanged": skip_unchanged,
+            "--capture": bool(capture_dir),
+        }
+        used = [flag for flag, on in conflicts.items() if on]
+        if used:
+            raise SystemExit(f"--stream reads pages partially and cannot be combined with {', '.join(used)}")
+    if (shard_count or queue is not None) and "ndjson" not in formats:
+        raise SystemExit("Sharded and queue runs need ndjson output to be merged; add it to --formats")
     ensure_dir(output_dir)
-    exporter = Exporter(output_dir)
+    metrics = RunMetrics(textfile=metrics_textfile, interval=metrics_interval)
+    metrics_path = metrics_path or os.path.join(output_dir, "metrics.json")
+    unknown = set(formats) - set(FORMATS) - {"parquet", "sqlite"}
+    if unknown:
+        raise SystemExit(f"Unknown output format(s): {', '.join(sorted(unknown))}")
+    if resume and "parquet" in formats:
+        raise SystemExit("--resume cannot continue Parquet output; drop parquet from --formats")
+    # Users table layout: authors interned run-wide and written once to users.ndjson
+    users = UserRegistry() if users_table else None
+    exporter = Exporter(output_dir, users=users, formats=tuple(f for f in formats if f in FORMATS))
+    columnar = ParquetExporter(output_dir) if "parquet" in formats else None
+    # Upserted, so the same database can be reused across runs (and --resume)
+    database = None
+    if "sqlite" in formats:
+        database = SqliteExporter(sqlite_path or os.path.join(output_dir, "skool.sqlite"))
+    # Run-wide (type, id) filter: the first copy of an item is exported, later ones are counted
+    if dedup not in ("memory", "disk", "off"):
+        raise SystemExit(f"Unknown --dedup mode: {dedup}")
+    deduper = None
+    if dedup != "off":
+        seen = DiskSeenSet(os.path.join(output_dir, "dedup.sqlite")) if dedup == "disk" else CompactSeenSet()
+        deduper = Deduper(seen)
+        metrics.sources["dedup"] = deduper.stats
 
     if offline:
-        # Use sample file (provided) or embedded example
-        if sample_path and os.path.exists(sample_path):
-            sample = load_json(sample_path)
-        else:
-            builtin = os.path.join(
+        # Use sample file (provided) or embedded example; records are streamed
+        # (JSON array or NDJSON), so replaying large archives needs little memory
+        if not (sample_path and os.path.exists(sample_path)):
+            sample_path = os.path.join(
                 os.path.dirname(os.path.dirname(__file__)), "data", "sample_output.json"
             )
-            sample = load_json(builtin)
+        records = iter_records(sample_path)
 
         written = 0
-        for raw in tqdm(sample, desc="Writing sample items"):
-            if raw.get("type") == "module":
-                item = normalize_module(raw)
-            else:
-                item = normalize_post(raw)
-            exporter.write(item)
+        progress = progress_bar(desc="Writing sample items", unit="item")
+        for raw in metrics.timed("read", records):
+            if not isinstance(raw, dict):
+                continue
+            with metrics.time("normalize"):
+                if raw.get("type") == "module":
+                    item = normalize_module(raw)
+                else:
+                    item = normalize_post(raw, users)
+            if deduper is not None and not deduper.first(item.type.value, item.id):
+                continue
+            with metrics.time("export"):
+                exporter.write(item)
+                if columnar is not None:
+                    columnar.write(item)
+                if database is not None:
+                    database.write(item)
+            metrics.count_item(item.type.value)
+            metrics.tick()
             written += 1
+            progress.update()
             if max_items and written >= max_items:
                 break
+        # Stops reading right away when --max-items cut the replay short
+        records.close()
+        progress.close()
+        if deduper is not None:
+            deduper.close()
 
-        exporter.finalize()
+        with metrics.time("finalize"):
+            exporter.finalize()
+            if columnar is not None:
+                columnar.finalize()
+            if database is not None:
+                database.finalize()
+        metrics.write_json(metrics_path)
+        metrics.write_textfile()
+        if deduper is not None and deduper.dropped:
+            print(f"Duplicates dropped: {deduper.dropped}")
         print(f"Offline run complete. Wrote {written} items to {output_dir}")
         return 0
 
-    # Online scraping
-    items: List[SkoolItem] = []
-    if mode == "community":
-        scraper = CommunityScraper(include_comments=include_comments, max_items=max_items)
-        for url in urls:
-            for raw in scraper.iter_items(url):
-                items.append(normalize_post(raw))
-    elif mode == "classroom":
-        scraper = ClassroomScraper(include_comments=include_comments, max_items=max_items)
-        for url in urls:
-            for raw in scraper.iter_modules(url):
-                items.append(normalize_module(raw))
-    elif mode == "both":
-        comm = CommunityScraper(include_comments=include_comments, max_items=max_items)
-        clas = ClassroomScraper(include_comments=include_comments, max_items=max_items)
-        for url in urls:
-            for raw in comm.iter_items(url):
-                items.append(normalize_post(raw))
-            for raw in clas.iter_modules(url):
-                items.append(normalize_module(raw))
-    else:
+    # Online scraping: fetch -> extract/normalize -> export, streamed through a bounded queue
+    if mode not in ("community", "classroom", "both"):
         raise SystemExit(f"Unknown mode: {mode}")
+    http_cache = None
+    if http_cache_dir:
+        http_cache = HttpCache(
+            http_cache_dir,
+            max_bytes=http_cache_max_mb * 1024 * 1024,
+            max_age=http_cache_max_age_days * 24 * 3600,
+        )
+    if capture_dir and replay_capture_dir:
+        raise SystemExit("--capture and --replay-capture cannot be combined")
+    capture = CaptureWriter(capture_dir) if capture_dir else None
+    if replay_capture_dir:
+        # Pages come from the archive: no requests, no rate limit; fetch threads decompress in parallel
+        engine = ReplayEngine(concurrency=concurrency, archive=CaptureArchive(replay_capture_dir))
+    else:
+        limiter = RateLimiter(rate=rate, burst=max(1, concurrency))
+        engine = FetchEngine(
+            concurrency=concurrency, http_cache=http_cache, limiter=limiter, metrics=metrics, capture=capture
+        )
+    cache = PageCache(max_pages=page_cache_size)
+    metrics.sources["fetch"] = engine.stats
+    metrics.sources["pageCache"] = lambda: {"hits": cache.hits, "misses": cache.misses}
+    if http_cache is not None:
+        metrics.sources["httpCache"] = http_cache.stats
+    comm = None
+    clas = None
+    if mode in ("community", "both"):
+        comm = CommunityScraper(
+            include_comments=include_comments,
+            max_items=max_items,
+            engine=engine,
+            cache=cache,
+            selectors_path=selectors_path,
+        )
+    crawler = None
+    if crawl and comm is not None:
+        crawler = FeedCrawler(
+            scraper=comm, cache=cache, concurrency=concurrency, max_pages=max_pages, since=since
+        )
+    if mode in ("classroom", "both"):
+        clas = ClassroomScraper(
+            include_comments=include_comments,
+            max_items=max_items,
+            engine=engine,
+            cache=cache,
+            selectors_path=selectors_path,
+        )
 
-    for item in tqdm(items, desc="Exporting"):
-        exporter.write(item)
-    exporter.finalize()
-    print(f"Wrote {len(items)} items to {output_dir}")
+    # The journal records finished URLs with the exporter offsets at that point
+    journal = RunJournal(os.path.join(output_dir, "run.journal"))
+    done: Set[str] = set()
+    if resume and journal.exists():
+        state = journal.load()
+        if state.offsets is not None:
+            exporter.resume(state.offsets)
+            # items.ndjson keeps earlier runs' items too: seed only from where this run began
+            if deduper is not None and state.start is not None and "ndjson" in state.start:
+                deduper.seed(exported_keys(os.path.join(output_dir, exporter.jsonl_name), state.start["ndjson"]))
+        else:
+            journal.start(exporter.checkpoint())
+        done = state.done
+        todo = [u for u in urls if u not in done]
+        print(f"Resuming: {len(urls) - len(todo)} of {len(urls)} URLs already done")
+        urls = todo
+    else:
+        journal.start(exporter.checkpoint())
+    work: Iterable[str] = urls if queue is None else queue.claimed(urls)
+
+    written = 0
+    pool = ParsePool(workers, max_items=max_items, selectors_path=selectors_path) if workers > 0 else None
+    # Items from worker processes arrive serialized; decode them only for outputs that need models
+    need_models = users is not None or columnar is not None or database is not None
+    try:
+        if pool is not None:
+            source = iter_pooled_items(
+                work,
+                engine,
+                cache,
+                comm,
+                clas,
+                pool,
+                skip_unchanged=skip_unchanged,
+                crawler=crawler,
+                done=done,
+                metrics=metrics,
+            )
+        else:
+            source = iter_online_items(
+                work,
+                engine,
+                cache,
+                comm,
+                clas,
+                skip_unchanged=skip_unchanged,
+                crawler=crawler,
+                done=done,
+                users=users,
+                metrics=metrics,
+                stream=stream,
+            )
+        # queue_wait: the exporter had nothing to do (fetching/parsing is the bottleneck)
+        results = metrics.timed("queue_wait", bounded(source, maxsize=queue_size))
+        export = metrics.stage("export")
+        clock = time.perf_counter
+        progress = progress_bar(desc="Exporting", unit="item")
+        for item in results:
+            t0 = clock()
+            if isinstance(item, UnitDone):
+                if database is not None:
+                    database.commit()
+                journal.mark_done(item.unit, exporter.checkpoint(), item.items)
+                export.seconds += clock() - t0
+                metrics.tick()
+                continue
+            if deduper is not None:
+                raw_item = isinstance(item, RawItem)
+                if not deduper.first(item.type if raw_item else item.type.value, item.id):
+                    export.seconds += clock() - t0
+                    continue
+            if need_models and isinstance(item, RawItem):
+                item = item.model(users)
+            exporter.write(item)
+            if columnar is not None:
+                columnar.write(item)
+            if database is not None:
+                database.write(item)
+            export.seconds += clock() - t0
+            export.calls += 1
+            metrics.count_item(item.type if isinstance(item, RawItem) else item.type.value)
+            metrics.tick()
+            written += 1
+            progress.update()
+        progress.close()
+    finally:
+        if pool is not None:
+            pool.close()
+        engine.close()
+        if capture is not None:
+            capture.close()
+        if deduper is not None:
+            deduper.close()
+        journal.close()
+    with metrics.time("finalize"):
+        exporter.finalize()
+        if columnar is not None:
+            columnar.finalize()
+        if database is not None:
+            database.finalize()
+    if columnar is not None:
+        print("Parquet rows: " + ", ".join(f"{n} {t}" for t, n in columnar.rows_written.items()))
+    if database is not None:
+        print("SQLite upserts: " + ", ".join(f"{n} {t}" for t, n in database.rows_written.items()))
+    journal.finish()
+    metrics.write_json(metrics_path)
+    metrics.write_textfile()
+    print("Stages: " + ", ".join(f"{k} {s.seconds:.2f}s" for k, s in metrics.stages.items()))
+    lat = metrics.fetch_latency
+    if lat.count:
+        print(
+            f"Fetch latency: p50 <= {lat.quantile(0.5) or 'inf'}s, p95 <= {lat.quantile(0.95) or 'inf'}s; "
+            f"{metrics.bytes_downloaded / 1e6:.1f} MB downloaded"
+        )
+    st = engine.stats()
+    if isinstance(engine, ReplayEngine):
+        print(f"Replayed from {replay_capture_dir}: 0 requests, {st['missing']} URLs not in the capture")
+    else:
+        print(
+            f"Requests: {st['requests']} ({st['retries']} retries, {st['throttled']} throttled); "
+            f"waited {st['waitSeconds']:.1f}s on rate limit, {st['backoffSeconds']:.1f}s in backoff"
+        )
+    if capture is not None:
+        print(f"Captured {capture.pages} pages to {capture_dir}")
+    if http_cache is not None:
+        st = http_cache.stats()
+        print(f"HTTP cache: {st['hits']} not modified, {st['misses']} downloaded")
+    if users is not None:
+        print(f"Users: {len(users)} unique")
+    if deduper is not None:
+        print(f"Duplicates dropped: {deduper.dropped}")
+    print(f"Wrote {written} items to {output_dir}")
     return 0
 
 def parse_args() -> argparse.Namespace:
@@ -129,11 +589,193 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Max items to export.",
     )
+    ap.add_argument(
+        "--concurrency",
+        type=int,
+        default=3,
+        help="Max number of pages fetched in parallel.",
+    )
+    ap.add_argument(
+        "--queue-size",
+        type=int,
+        default=256,
+        help="Max normalized items buffered between scraping and export.",
+    )
+    ap.add_argument(
+        "--page-cache-size",
+        type=int,
+        default=32,
+        help="Max fetched pages kept in memory for reuse within the run.",
+    )
+    ap.add_argument(
+        "--http-cache",
+        type=str,
+        default=None,
+        help="Directory for a persistent response cache; pages are revalidated with ETag/Last-Modified.",
+    )
+    ap.add_argument(
+        "--http-cache-max-mb",
+        type=int,
+        default=512,
+        help="Size cap of the --http-cache directory (compressed bodies).",
+    )
+    ap.add_argument(
+        "--http-cache-max-age-days",
+        type=float,
+        default=7,
+        help="Drop --http-cache entries not used for this many days.",
+    )
+    ap.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="With --http-cache, do not re-extract or export pages the server reports as not modified.",
+    )
+    ap.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run in --output: skip URLs its run.journal marks done.",
+    )
+    ap.add_argument(
+        "--crawl",
+        action="store_true",
+        help="Follow community feed pagination beyond the first page.",
+    )
+    ap.add_argument(
+        "--max-pages",
+        type=int,
+        default=None,
+        help="With --crawl, max feed pages per URL (including the first).",
+    )
+    ap.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        default=None,
+        help="With --crawl, stop at posts created before this ISO date (e.g. 2024-10-01).",
+    )
+    ap.add_argument(
+        "--rate",
+        type=float,
+        default=5.0,
+        help="Max requests per second per host (0 = unlimited). Lowered automatically on 429/503.",
+    )
+    ap.add_argument(
+        "--formats",
+        type=lambda v: [f.strip() for f in v.split(",") if f.strip()],
+        default=list(FORMATS),
+        help="Comma-separated outputs: ndjson, json, csv, parquet, sqlite (default: ndjson,json,csv).",
+    )
+    ap.add_argument(
+        "--sqlite-path",
+        type=str,
+        default=None,
+        help="Database for the sqlite format (default: <output>/skool.sqlite); reuse it across runs to update in place.",
+    )
+    ap.add_argument(
+        "--users-table",
+        action="store_true",
+        help="Write authors once to users.ndjson and reference them by id from posts and comments.",
+    )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Parse and normalize pages in this many worker processes (0 = in the main process).",
+    )
+    ap.add_argument(
+        "--metrics-json",
+        type=str,
+        default=None,
+        help="Where to write the run metrics summary (default: <output>/metrics.json).",
+    )
+    ap.add_argument(
+        "--metrics-textfile",
+        type=str,
+        default=None,
+        help="Keep a Prometheus textfile (node_exporter textfile collector) updated during the run.",
+    )
+    ap.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=15.0,
+        help="Seconds between --metrics-textfile updates.",
+    )
+    ap.add_argument(
+        "--shard-index",
+        type=int,
+        default=0,
+        help="Which shard of the URL list to scrape (0-based, with --shard-count).",
+    )
+    ap.add_argument(
+        "--shard-count",
+        type=int,
+        default=0,
+        help="Split the URLs into this many shards by URL hash; output goes to <output>/shards/<shard>.",
+    )
+    ap.add_argument(
+        "--queue-dir",
+        type=str,
+        default=None,
+        help="Take URLs from a file-based work queue shared with other workers; output goes to <output>/shards/worker-<id>.",
+    )
+    ap.add_argument(
+        "--worker-id",
+        type=str,
+        default=None,
+        help="Name of this --queue-dir worker (required with it); reuse it with --resume after a crash.",
+    )
+    ap.add_argument(
+        "--merge",
+        action="store_true",
+        help="Combine the partitions in <output>/shards (or --partitions) into <output>, deduplicated by id, in --inputs order.",
+    )
+    ap.add_argument(
+        "--partitions",
+        nargs="*",
+        default=None,
+        help="Partition directories for --merge.",
+    )
+    ap.add_argument(
+        "--capture",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Append every fetched page (URL, status, headers, compressed body) to a capture archive in DIR.",
+    )
+    ap.add_argument(
+        "--replay-capture",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Re-run extraction on the pages archived by --capture in DIR instead of fetching (no requests).",
+    )
+    ap.add_argument(
+        "--dedup",
+        choices=["memory", "disk", "off"],
+        default="memory",
+        help="Drop repeated items (same type and id) run-wide; 'disk' keeps the seen set in a scratch SQLite file.",
+    )
+    ap.add_argument(
+        "--selectors",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="JSON file of record selectors to use instead of src/config/selectors.json.",
+    )
+    ap.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse pages while they download and stop reading each one once --max-items records are found.",
+    )
+    ap.add_argument(
+        "--strict-validation",
+        action="store_true",
+        help="Run full pydantic validation on every record (slower; same output).",
+    )
     ap.add_argument(
         "--sample",
         type=str,
         default=None,
-        help="Optional path to a sample JSON to use in --offline mode.",
+        help="Records to replay in --offline mode: a JSON array or NDJSON file, optionally .gz (read as a stream).",
     )
     return ap.parse_args()
 
@@ -147,6 +789,21 @@ if __name__ == "__main__":
     else:
         raise SystemExit("Invalid inputs JSON. Provide list or { 'urls': [...] }.")
 
+    if args.merge:
+        partitions = args.partitions or partitions_in(args.output)
+        if not partitions:
+            raise SystemExit(f"No partitions to merge in {args.output}")
+        ensure_dir(args.output)
+        deduper = Deduper(DiskSeenSet(os.path.join(args.output, "dedup.sqlite"))) if args.dedup == "disk" else None
+        st = merge_partitions(partitions, args.output, urls, formats=args.formats, deduper=deduper)
+        print(
+            f"Merged {st.partitions} partitions: {st.items} items "
+            f"({st.duplicates} duplicates dropped), {st.users} users -> {args.output}"
+        )
+        raise SystemExit(0)
+
+    if args.strict_validation:
+        set_strict_validation(True)
     t0 = time.time()
     code = run(
         urls=urls,
@@ -156,6 +813,34 @@ if __name__ == "__main__":
         offline=args.offline,
         max_items=args.max_items,
         sample_path=args.sample,
+        concurrency=args.concurrency,
+        queue_size=args.queue_size,
+        page_cache_size=args.page_cache_size,
+        http_cache_dir=args.http_cache,
+        http_cache_max_mb=args.http_cache_max_mb,
+        http_cache_max_age_days=args.http_cache_max_age_days,
+        skip_unchanged=args.skip_unchanged,
+        resume=args.resume,
+        crawl=args.crawl,
+        max_pages=args.max_pages,
+        since=args.since,
+        rate=args.rate,
+        users_table=args.users_table,
+        formats=args.formats,
+        sqlite_path=args.sqlite_path,
+        workers=args.workers,
+        metrics_path=args.metrics_json,
+        metrics_textfile=args.metrics_textfile,
+        metrics_interval=args.metrics_interval,
+        shard_index=args.shard_index,
+        shard_count=args.shard_count,
+        queue_dir=args.queue_dir,
+        worker_id=args.worker_id,
+        capture_dir=args.capture,
+        replay_capture_dir=args.replay_capture,
+        dedup=args.dedup,
+        selectors_path=args.selectors,
+        stream=args.stream,
     )
     dt = time.time() - t0
     print(f"Done in {dt:.2f}s")
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List
+
+SHARDS_DIR = "shards"
+
+def shard_of(url: str, count: int) -> int:
+    # crc32, not hash(): the assignment must agree across processes and machines
+    return zlib.crc32(url.encode("utf-8")) % count
+
+def select_shard(urls: Iterable[str], index: int, count: int) -> List[str]:
+    """
+    The URLs of shard `index` out of `count`, in input order.
+    """
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard {index} of {count}")
+    return [u for u in urls if shard_of(u, count) == index]
+
+def shard_name(index: int, count: int) -> str:
+    return f"shard-{index:03d}-of-{count:03d}"
+
+def partition_dir(output_dir: str, name: str) -> str:
+    """
+    Where a shard or queue worker writes its outputs; --merge reads them back from here.
+    """
+    return os.path.join(output_dir, SHARDS_DIR, name)
+
+def partitions_in(output_dir: str) -> List[str]:
+    root = os.path.join(output_dir, SHARDS_DIR)
+    if not os.path.isdir(root):
+        return []
+    return [os.path.join(root, d) for d in sorted(os.listdir(root)) if os.path.isdir(os.path.join(root, d))]
+
+@dataclass
+class WorkQueue:
+    """
+    File-based URL queue shared by processes on one machine (or a shared
+    filesystem). A URL belongs to whichever worker first creates its claim file
+    (written to a temp file first and linked into place, so a claim is never
+    seen half-written); a restarted worker with the same `owner` gets its own
+    claims back, so --resume finishes the URLs it had taken.
+    """
+
+    path: str
+    owner: str
+
+    def __post_init__(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+
+    def _claim_path(self, url: str) -> str:
+        return os.path.join(self.path, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".claim")
+
+    def claim(self, url: str) -> bool:
+        path = self._claim_path(url)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.owner)
+        try:
+            # Unlike rename, link fails if the claim exists: first writer wins
+            os.link(tmp, path)
+            return True
+        except FileExistsError:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    return f.read() == self.owner
+            except OSError:
+                return False
+        finally:
+            os.remove(tmp)
+
+    def claimed(self, urls: Iterable[str]) -> Iterator[str]:
+        """
+        The URLs this worker wins, claimed lazily as the fetcher asks for them
+        so that concurrent workers interleave.
+        """
+        for url in urls:
+            if self.claim(url):
+                yield url
\ No newline at end of file
@@ -0,0 +1,67 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+class StubServer:
+    """
+    Local HTTP server for tests. `routes` maps a path (including query string)
+    to (status, body), (status, body, delay_seconds) or
+    (status, body, delay_seconds, headers). A route with an ETag header answers
+    304 to a matching If-None-Match.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.hits = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.hits.append(self.path)
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    route = stub.routes.get(self.path, (404, "not found"))
+                    status, body = route[0], route[1]
+                    if len(route) > 2 and route[2]:
+                        time.sleep(route[2])
+                    headers = dict(route[3]) if len(route) > 3 else {}
+                    if headers.get("ETag") and self.headers.get("If-None-Match") == headers["ETag"]:
+                        status, body = 304, b""
+                    data = body.encode("utf-8") if isinstance(body, str) else body
+                    self.send_response(status)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    for k, v in headers.items():
+                        self.send_header(k, v)
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}{path}"
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    server.thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+
+from src.extractors.capture import INDEX_NAME, CaptureArchive, CaptureWriter
+from src.runner import run
+
+def _page(posts):
+    blob = {"props": {"pageProps": {"posts": posts}}}
+    return (
+        "<html><head></head><body>"
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(blob)}</script>'
+        "</body></html>"
+    )
+
+def test_archive_random_access_and_index_recovery(tmp_path: Path):
+    writer = CaptureWriter(str(tmp_path))
+    writer.write("https://x/a", 200, {"ETag": "1"}, "first ✓")
+    writer.write("https://x/b", 200, {}, "b" * 10000)
+    writer.write("https://x/a", 200, {"ETag": "2"}, "second")
+    writer.close()
+
+    archive = CaptureArchive(str(tmp_path))
+    assert archive.urls() == ["https://x/a", "https://x/b"]
+    assert archive.get("https://x/a").body == "second"
+    assert archive.get("https://x/a").headers == {"ETag": "2"}
+    assert archive.get("https://x/b").body == "b" * 10000
+    assert archive.get("https://x/c") is None
+    archive.close()
+
+    # Lost index tail (crash between the two writes): frames are scanned instead
+    index = tmp_path / INDEX_NAME
+    index.write_bytes(index.read_bytes().splitlines(keepends=True)[0])
+    archive = CaptureArchive(str(tmp_path))
+    assert [p.body for p in archive] == ["first ✓", "b" * 10000, "second"]
+    archive.close()
+
+def test_replay_capture_matches_online_run_without_requests(stub_server, tmp_path: Path):
+    urls = []
+    for i in range(3):
+        stub_server.routes[f"/c{i}"] = (200, _page([{"id": f"post-{i}-{j}"} for j in range(2)]))
+        urls.append(stub_server.url(f"/c{i}"))
+    capture = str(tmp_path / "capture")
+    run(urls=urls, mode="community", output_dir=str(tmp_path / "online"), include_comments=False,
+        offline=False, capture_dir=capture)
+    hits = len(stub_server.hits)
+    assert hits == 3
+
+    for workers in (0, 2):
+        out = tmp_path / f"replay{workers}"
+        run(urls=urls, mode="community", output_dir=str(out), include_comments=False, offline=False,
+            replay_capture_dir=capture, workers=workers)
+        assert (out / "items.ndjson").read_bytes() == (tmp_path / "online" / "items.ndjson").read_bytes()
+    assert len(stub_server.hits) == hits
\ No newline at end of file
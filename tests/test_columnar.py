@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+ds = pytest.importorskip("pyarrow.dataset")
+
+from src.outputs.columnar import ParquetExporter  # noqa: E402
+from src.parsers.classroom import normalize_module  # noqa: E402
+from src.parsers.posts import normalize_post  # noqa: E402
+from src.runner import run  # noqa: E402
+
+SAMPLE = Path(__file__).resolve().parents[1] / "data" / "sample_output.json"
+
+def _post(i, group, day, comments=0):
+    return {
+        "id": f"p{i}",
+        "groupId": group,
+        "createdAt": f"2024-11-{day:02d}T10:00:00Z",
+        "metadata": {"comments": comments, "upvotes": i},
+        "comments": [
+            {"post": {"id": f"p{i}-c{j}", "parent_id": f"p{i}-c{j - 1}" if j else "", "created_at": f"2024-11-{day:02d}T11:00:00Z"}}
+            for j in range(comments)
+        ],
+    }
+
+def _read(root: Path, table: str):
+    keys = ds.partitioning(pa.schema([("group", pa.string()), ("date", pa.string())]), flavor="hive")
+    return ds.dataset(root / "parquet" / table, format="parquet", partitioning=keys).to_table()
+
+def test_tables_partitions_and_flattened_comments(tmp_path: Path):
+    run(urls=[], mode="both", output_dir=str(tmp_path), include_comments=True, offline=True,
+        sample_path=str(SAMPLE), formats=["ndjson", "parquet"])
+
+    assert (tmp_path / "items.ndjson").exists() and not (tmp_path / "items.json").exists()
+    posts = _read(tmp_path, "posts").to_pylist()
+    assert [p["id"] for p in posts] == ["aab147fa0ea4420d83e8d3a9214f5203"]
+    assert posts[0]["commentsCount"] == 2 and posts[0]["date"] == "2024-11-07"
+    comments = sorted(_read(tmp_path, "comments").to_pylist(), key=lambda c: c["id"])
+    assert [(c["id"], c["parentId"], c["depth"], c["postId"]) for c in comments] == [
+        ("c1", "", 0, "aab147fa0ea4420d83e8d3a9214f5203"),
+        ("c2", "c1", 1, "aab147fa0ea4420d83e8d3a9214f5203"),
+    ]
+    modules = _read(tmp_path, "modules").to_pylist()
+    assert modules[0]["media"] == ["https://www.loom.com/share/video-id"]
+    assert modules[0]["courseTitle"] == "Course Title"
+
+def test_row_groups_and_bounded_writers(tmp_path: Path):
+    exporter = ParquetExporter(str(tmp_path), row_group_size=4, max_buffered_rows=6, max_open_files=2)
+    for i in range(30):
+        exporter.write(normalize_post(_post(i, f"g{i % 3}", 1 + i % 2, comments=2)))
+        assert exporter._buffered <= 6
+        assert len(exporter._open) <= 2
+    exporter.finalize()
+
+    assert exporter.rows_written == {"posts": 30, "comments": 60, "modules": 0}
+    files = sorted((tmp_path / "parquet" / "posts").rglob("*.parquet"))
+    assert {f.parent.parent.name for f in files} == {"group=g0", "group=g1", "group=g2"}
+    assert max(pq.ParquetFile(f).metadata.num_rows for f in files) <= 30
+    assert all(g.num_rows <= 4 for f in files for g in (pq.ParquetFile(f).metadata.row_group(i) for i in range(pq.ParquetFile(f).num_row_groups)))
+    assert sorted(_read(tmp_path, "posts").column("id").to_pylist()) == sorted(f"p{i}" for i in range(30))
+
+def test_missing_partition_values(tmp_path: Path):
+    exporter = ParquetExporter(str(tmp_path))
+    exporter.write(normalize_module({"id": "m1", "title": "no group, no date"}))
+    exporter.finalize()
+    assert (tmp_path / "parquet" / "modules" / "group=__HIVE_DEFAULT_PARTITION__" / "date=__HIVE_DEFAULT_PARTITION__").is_dir()
+
+def test_previous_dataset_kept_until_finalize_and_idle_partitions_dropped(tmp_path: Path):
+    first = ParquetExporter(str(tmp_path))
+    first.write(normalize_post(_post(0, "g0", 1)))
+    first.finalize()
+
+    exporter = ParquetExporter(str(tmp_path), row_group_size=1, max_open_files=1)
+    for i in range(1, 6):
+        exporter.write(normalize_post(_post(i, "g0", 1 + i)))
+        # Each new date partition closes the last one, which then holds nothing
+        assert len(exporter._partitions) <= 2
+    # Not finalized (e.g. the run crashed): the old dataset is still in place
+    assert _read(tmp_path, "posts").column("id").to_pylist() == ["p0"]
+    exporter.finalize()
+    assert sorted(_read(tmp_path, "posts").column("id").to_pylist()) == [f"p{i}" for i in range(1, 6)]
+    assert not (tmp_path / "parquet.tmp").exists()
\ No newline at end of file
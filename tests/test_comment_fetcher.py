@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+
+from src.extractors.comment_fetcher import CommentFetcher
+from src.extractors.http_client import FetchEngine
+from src.parsers.posts import normalize_post
+from src.runner import run
+
+def _next_data(props):
+    return f'<script id="__NEXT_DATA__" type="application/json">{json.dumps({"props": {"pageProps": props}})}</script>'
+
+def _comment(cid, children=(), **extra):
+    return {"post": {"id": cid, "metadata": {"content": f"text {cid}"}, **extra}, "children": list(children)}
+
+def _serve_thread(stub, path):
+    # Post page: two top-level comments with one embedded reply, then a cursor page.
+    # c2 has more replies than embedded, served by the JSON replies endpoint.
+    stub.routes[path] = (200, _next_data({
+        "postTree": {"post": {"id": "p"}, "children": [
+            _comment("c1", [_comment("c1a")]),
+            _comment("c2", hasMoreReplies=True, repliesCursor="r1"),
+        ]},
+        "nextCursor": "k2",
+    }), 0.1)
+    stub.routes[f"{path}?c=k2"] = (200, _next_data({"postTree": {"children": [_comment("c3")]}}))
+    stub.routes[f"{path}?parent=c2&c=r1"] = (200, json.dumps({"comments": [_comment("c2a")], "nextCursor": "r2"}))
+    stub.routes[f"{path}?parent=c2&c=r2"] = (200, json.dumps({"comments": [_comment("c2b")]}))
+
+def test_thread_pages_and_reply_pages_build_a_tree(stub_server):
+    _serve_thread(stub_server, "/g/post")
+    fetcher = CommentFetcher(engine=FetchEngine(retries=1))
+    rec = fetcher.attach({"id": "p", "url": stub_server.url("/g/post")})
+
+    item = normalize_post(rec)
+    tree = {c.id: [r.id for r in c.replies] for c in item.comments}
+    assert tree == {"c1": ["c1a"], "c2": ["c2a", "c2b"], "c3": []}
+
+def test_threads_are_fetched_concurrently_in_record_order(stub_server):
+    records = []
+    for i in range(6):
+        _serve_thread(stub_server, f"/g/post{i}")
+        records.append({"id": f"p{i}", "url": stub_server.url(f"/g/post{i}")})
+    records.append({"id": "no-url"})
+    fetcher = CommentFetcher(engine=FetchEngine(concurrency=4, retries=1), concurrency=4)
+
+    out = list(fetcher.attach_many(records))
+
+    assert [r["id"] for r in out] == [f"p{i}" for i in range(6)] + ["no-url"]
+    assert all(len(r["comments"]) == 6 for r in out[:6]) and "comments" not in out[6]
+    assert stub_server.max_in_flight > 1
+
+def test_run_fetches_comments_only_when_included(stub_server, tmp_path: Path):
+    _serve_thread(stub_server, "/g/post")
+    stub_server.routes["/g"] = (200, _next_data({"posts": [{"id": "p", "url": stub_server.url("/g/post")}]}))
+    kwargs = dict(urls=[stub_server.url("/g")], mode="community", offline=False, rate=0)
+
+    run(output_dir=str(tmp_path / "without"), include_comments=False, **kwargs)
+    run(output_dir=str(tmp_path / "with"), include_comments=True, **kwargs)
+
+    without = json.loads((tmp_path / "without" / "items.ndjson").read_text("utf-8").splitlines()[0])
+    with_comments = json.loads((tmp_path / "with" / "items.ndjson").read_text("utf-8").splitlines()[0])
+    assert without["comments"] == []
+    assert [c["id"] for c in with_comments["comments"]] == ["c1", "c2", "c3"]
+
+def test_thread_fetching_is_opt_in_and_pool_fits_both_thread_sets(stub_server):
+    from src.extractors.community_scraper import CommunityScraper
+
+    stub_server.routes["/page"] = (200, _next_data({"posts": [{"id": "p1", "url": stub_server.url("/thread")}]}))
+    engine = FetchEngine(concurrency=3, retries=1)
+    assert [r["id"] for r in CommunityScraper(engine=engine).iter_items(stub_server.url("/page"))] == ["p1"]
+    assert stub_server.hits == ["/page"]
+    assert engine.session.get_adapter("http://x").poolmanager.connection_pool_kw["maxsize"] == 6
+    engine.close()
\ No newline at end of file
@@ -0,0 +1,53 @@
+import json
+import random
+from pathlib import Path
+
+from src.dedup import CompactSeenSet, Deduper, DiskSeenSet, fingerprint
+from src.extractors.community_scraper import CommunityScraper
+from src.runner import run
+
+def _page(posts):
+    blob = {"props": {"pageProps": {"posts": posts, "feed": {"items": posts[:1]}}}}
+    return f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(blob)}</script>'
+
+def test_seen_sets_agree_across_growth(tmp_path: Path):
+    rng = random.Random(7)
+    keys = [rng.getrandbits(64) or 1 for _ in range(5000)]
+    compact = CompactSeenSet(capacity=8)
+    disk = DiskSeenSet(str(tmp_path / "seen.sqlite"))
+    for seen in (compact, disk):
+        assert all(seen.add(k) for k in keys)
+        assert not any(seen.add(k) for k in keys[::7])
+        assert len(seen) == len(keys)
+    disk.close()
+    assert not (tmp_path / "seen.sqlite").exists()
+
+    dedup = Deduper()
+    assert dedup.first("post", "a") and dedup.first("module", "a") and dedup.first("post", "")
+    assert not dedup.first("post", "a") and dedup.first("post", "")
+    assert dedup.stats() == {"unique": 2, "dropped": 1}
+    assert fingerprint("post", "a") != fingerprint("module", "a")
+
+def test_next_data_is_not_decoded_twice():
+    scraper = CommunityScraper(include_comments=False)
+    blobs = list(scraper._extract_json_blobs(_page([{"id": "x"}])))
+    assert len(blobs) == 1
+
+def test_run_drops_duplicates_across_urls(stub_server, tmp_path: Path):
+    stub_server.routes["/a"] = (200, _page([{"id": "p1"}, {"id": "p2"}]))
+    stub_server.routes["/b"] = (200, _page([{"id": "p2"}, {"id": "p3"}]))
+    urls = [stub_server.url("/a"), stub_server.url("/b")]
+
+    for mode, workers in (("memory", 0), ("disk", 2)):
+        out = tmp_path / mode
+        run(urls=urls, mode="community", output_dir=str(out), include_comments=False, offline=False,
+            dedup=mode, workers=workers)
+        ids = [json.loads(line)["id"] for line in (out / "items.ndjson").read_text("utf-8").splitlines()]
+        assert ids == ["p1", "p2", "p3"]
+        # p1 and p2 repeated from feed.items on their pages, p2 again on /b
+        assert json.loads((out / "metrics.json").read_text())["dedup"] == {"unique": 3, "dropped": 3}
+        assert not (out / "dedup.sqlite").exists()
+
+    run(urls=urls, mode="community", output_dir=str(tmp_path / "off"), include_comments=False,
+        offline=False, dedup="off")
+    assert len((tmp_path / "off" / "items.ndjson").read_text("utf-8").splitlines()) == 6
\ No newline at end of file
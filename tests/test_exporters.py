@@ -0,0 +1,37 @@
+import json
+from pathlib import Path
+
+import orjson
+
+from src.runner import run
+
+SAMPLE = Path(__file__).resolve().parents[1] / "data" / "sample_output.json"
+
+def test_exporter_outputs_match_full_dumps(tmp_path: Path):
+    code = run(
+        urls=[],
+        mode="both",
+        output_dir=str(tmp_path),
+        include_comments=True,
+        offline=True,
+        sample_path=str(SAMPLE),
+    )
+    assert code == 0
+
+    records = [json.loads(line) for line in (tmp_path / "items.ndjson").read_text("utf-8").splitlines()]
+    assert [r["id"] for r in records] == ["aab147fa0ea4420d83e8d3a9214f5203", "unique-module-id"]
+    # Incrementally written array is byte-identical to dumping the whole list at once
+    assert (tmp_path / "items.json").read_bytes() == orjson.dumps(records, option=orjson.OPT_INDENT_2)
+    assert (tmp_path / "items.csv").read_text("utf-8").splitlines() == [
+        "type,id,title,url,createdAt,commentsCount,upvotes",
+        "post,aab147fa0ea4420d83e8d3a9214f5203,Roadmap Update,https://www.skool.com/group-name/post-name,"
+        "2024-11-07T23:26:18.042030+00:00,2,50",
+        "module,unique-module-id,Module Title,https://www.skool.com/group-name/classroom/module-name,,0,0",
+    ]
+
+def test_exporter_empty_run(tmp_path: Path):
+    empty = tmp_path / "empty.json"
+    empty.write_text("[]", encoding="utf-8")
+    run(urls=[], mode="both", output_dir=str(tmp_path), include_comments=False, offline=True, sample_path=str(empty))
+    assert (tmp_path / "items.json").read_bytes() == b"[]"
+    assert not (tmp_path / "items.ndjson").exists()
@@ -0,0 +1,89 @@
+import json
+from datetime import datetime
+
+from src.extractors.community_scraper import CommunityScraper
+from src.extractors.feed_crawler import FeedCrawler
+from src.extractors.http_client import FetchEngine
+from src.extractors.page_cache import PageCache
+
+def _page(posts, **paging):
+    blob = {"props": {"pageProps": {"posts": posts, **paging}}}
+    return f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(blob)}</script>'
+
+def _posts(page, n=3, day=None):
+    return [
+        {"id": f"p{page}-{i}", "createdAt": f"2024-11-{day or (30 - page):02d}T10:00:00Z"}
+        for i in range(n)
+    ]
+
+def _crawler(**kwargs):
+    scraper = CommunityScraper(
+        engine=FetchEngine(concurrency=4, retries=1),
+        fast_extract=True,
+        max_items=kwargs.pop("max_items", None),
+    )
+    return FeedCrawler(scraper=scraper, cache=PageCache(), concurrency=4, **kwargs)
+
+def _ids(feed_pages):
+    return [rec["id"] for fp in feed_pages for rec in fp.records]
+
+def test_numbered_feed_is_fetched_concurrently_in_order(stub_server):
+    stub_server.routes["/feed"] = (200, _page(_posts(1), page=1, totalPages=6))
+    for n in range(2, 7):
+        stub_server.routes[f"/feed?p={n}"] = (200, _page(_posts(n), page=n, totalPages=6), 0.15)
+
+    pages = list(_crawler().crawl(stub_server.url("/feed")))
+
+    assert [p.number for p in pages] == [1, 2, 3, 4, 5, 6]
+    assert _ids(pages) == [f"p{n}-{i}" for n in range(1, 7) for i in range(3)]
+    assert stub_server.max_in_flight > 1
+
+def test_cursor_feed_and_max_pages(stub_server):
+    stub_server.routes["/feed"] = (200, _page(_posts(1), feed={"nextCursor": "abc"}))
+    stub_server.routes["/feed?c=abc"] = (200, _page(_posts(2), feed={"nextCursor": "def"}))
+    stub_server.routes["/feed?c=def"] = (200, _page(_posts(3), feed={"nextCursor": ""}))
+
+    assert [p.number for p in _crawler().crawl(stub_server.url("/feed"))] == [1, 2, 3]
+    assert [p.number for p in _crawler(max_pages=2).crawl(stub_server.url("/feed"))] == [1, 2]
+
+def test_since_cutoff_and_max_items(stub_server):
+    stub_server.routes["/feed"] = (200, _page(_posts(1), page=1, hasMore=True))
+    for n in range(2, 20):
+        stub_server.routes[f"/feed?p={n}"] = (200, _page(_posts(n), page=n, hasMore=True))
+
+    pages = list(_crawler(since=datetime(2024, 11, 26)).crawl(stub_server.url("/feed")))
+    # page n is dated 30 - n; pages 1..4 are on/after the cutoff, page 5 is older
+    assert _ids(pages) == [f"p{n}-{i}" for n in range(1, 5) for i in range(3)]
+
+    capped = list(_crawler(max_items=7).crawl(stub_server.url("/feed")))
+    assert sum(len(p.records) for p in capped) == 7
+
+def test_run_with_crawl_journals_pages(stub_server, tmp_path):
+    from src.runner import run
+
+    stub_server.routes["/feed"] = (200, _page(_posts(1, n=1), page=1, totalPages=3))
+    for n in (2, 3):
+        stub_server.routes[f"/feed?p={n}"] = (200, _page(_posts(n, n=1), page=n, totalPages=3))
+    url = stub_server.url("/feed")
+
+    run(urls=[url], mode="community", output_dir=str(tmp_path), include_comments=False, offline=False, crawl=True)
+
+    ids = [json.loads(line)["id"] for line in (tmp_path / "items.ndjson").read_text().splitlines()]
+    assert ids == ["p1-0", "p2-0", "p3-0"]
+    units = [json.loads(line).get("unit") for line in (tmp_path / "run.journal").read_text().splitlines()]
+    assert units == [None, f"{url}#p1", f"{url}#p2", f"{url}#p3", url, None]
+
+def test_stops_on_later_page_end_and_on_repeated_pages(stub_server):
+    # No total on page 1; page 3 says it is the last one
+    stub_server.routes["/feed"] = (200, _page(_posts(1), page=1, hasMore=True))
+    stub_server.routes["/feed?p=2"] = (200, _page(_posts(2), page=2, hasMore=True))
+    stub_server.routes["/feed?p=3"] = (200, _page(_posts(3), page=3, hasMore=False))
+    for n in range(4, 12):
+        stub_server.routes[f"/feed?p={n}"] = (200, _page(_posts(n), page=n, hasMore=True))
+    assert [p.number for p in _crawler().crawl(stub_server.url("/feed"))] == [1, 2, 3]
+
+    # A server that ignores ?p= and keeps serving the first page
+    stub_server.routes["/loop"] = (200, _page(_posts(1), page=1, hasMore=True))
+    for n in range(2, 40):
+        stub_server.routes[f"/loop?p={n}"] = stub_server.routes["/loop"]
+    assert [p.number for p in _crawler().crawl(stub_server.url("/loop"))] == [1]
\ No newline at end of file
@@ -0,0 +1,54 @@
+import json
+from pathlib import Path
+
+from src.extractors.http_client import FetchEngine
+from src.runner import run
+
+def _page(posts):
+    blob = {"props": {"pageProps": {"posts": posts}}}
+    return (
+        "<html><head></head><body>"
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(blob)}</script>'
+        "</body></html>"
+    )
+
+def test_fetch_many_is_concurrent_and_ordered(stub_server):
+    # Later paths answer first, results must still follow input order
+    for i in range(8):
+        stub_server.routes[f"/p{i}"] = (200, f"page {i}", 0.2 - i * 0.02)
+    engine = FetchEngine(concurrency=4, retries=1)
+    urls = [stub_server.url(f"/p{i}") for i in range(8)]
+    results = list(engine.fetch_many(urls))
+    engine.close()
+
+    assert [r.url for r in results] == urls
+    assert [r.text for r in results] == [f"page {i}" for i in range(8)]
+    assert 1 < stub_server.max_in_flight <= 4
+
+def test_fetch_failure_keeps_slot(stub_server):
+    stub_server.routes["/ok"] = (200, "ok")
+    engine = FetchEngine(concurrency=2, retries=1)
+    results = list(engine.fetch_many([stub_server.url("/missing"), stub_server.url("/ok")]))
+    engine.close()
+
+    assert not results[0].ok and results[0].status == 404
+    assert results[1].ok
+
+def test_run_online_against_stub(stub_server, tmp_path: Path):
+    urls = []
+    for i in range(5):
+        stub_server.routes[f"/g{i}"] = (200, _page([{"id": f"post-{i}-{j}"} for j in range(2)]), 0.05)
+        urls.append(stub_server.url(f"/g{i}"))
+
+    code = run(
+        urls=urls,
+        mode="community",
+        output_dir=str(tmp_path),
+        include_comments=False,
+        offline=False,
+        concurrency=3,
+    )
+    assert code == 0
+    lines = (tmp_path / "items.ndjson").read_text(encoding="utf-8").splitlines()
+    ids = [json.loads(line)["id"] for line in lines]
+    assert ids == [f"post-{i}-{j}" for i in range(5) for j in range(2)]
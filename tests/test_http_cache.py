@@ -0,0 +1,75 @@
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from src.extractors.http_cache import HttpCache
+from src.extractors.http_client import FetchEngine
+from src.runner import run
+
+def _page(post_id):
+    blob = {"props": {"pageProps": {"posts": [{"id": post_id}]}}}
+    return f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(blob)}</script>'
+
+def test_revalidation_serves_cached_body(stub_server, tmp_path: Path):
+    stub_server.routes["/g"] = (200, "hello", 0, {"ETag": '"v1"'})
+    url = stub_server.url("/g")
+
+    cache = HttpCache(str(tmp_path / "cache"))
+    first = FetchEngine(http_cache=cache).fetch(url)
+    second = FetchEngine(http_cache=HttpCache(str(tmp_path / "cache"))).fetch(url)
+
+    assert first.text == second.text == "hello"
+    assert not first.not_modified and second.not_modified and second.status == 304
+    assert cache.misses == 1 and cache.stores == 1
+
+def test_responses_without_validators_are_not_stored(stub_server, tmp_path: Path):
+    stub_server.routes["/plain"] = (200, "x")
+    cache = HttpCache(str(tmp_path / "cache"))
+    FetchEngine(http_cache=cache).fetch(stub_server.url("/plain"))
+    assert cache.stores == 0 and os.listdir(tmp_path / "cache") == []
+
+def test_prune_by_age_and_size(tmp_path: Path):
+    cache = HttpCache(str(tmp_path / "cache"), max_bytes=10**9, max_age=3600)
+    for i in range(4):
+        cache.store(f"https://x/{i}", os.urandom(2000).hex(), {"ETag": str(i)})
+    meta_path, _ = cache._files("https://x/0")
+    meta = json.loads(Path(meta_path).read_text())
+    meta["usedAt"] = time.time() - 7200
+    Path(meta_path).write_text(json.dumps(meta))
+    cache.max_bytes = cache.stats()["bytes"] // 2
+    cache.prune()
+
+    assert cache.load("https://x/0") is None  # expired
+    assert cache.load("https://x/3") is not None  # most recent survives the size cap
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+def test_store_prunes_to_low_water_without_rescanning(tmp_path: Path, monkeypatch):
+    cache = HttpCache(str(tmp_path / "cache"), max_bytes=10**9)
+    for i in range(10):
+        cache.store(f"https://x/{i}", os.urandom(2000).hex(), {"ETag": str(i)})
+    cache.max_bytes = cache.stats()["bytes"]  # full, not yet over
+    monkeypatch.setattr(os, "listdir", lambda *a: pytest.fail("store() rescanned the cache"))
+    cache.store("https://x/10", os.urandom(2000).hex(), {"ETag": "10"})
+    monkeypatch.undo()
+
+    # One entry over the cap: pruned down to 90% of it, oldest first
+    assert cache.stats()["bytes"] <= cache.max_bytes * 0.9
+    assert len(os.listdir(tmp_path / "cache")) // 2 == len(cache._entries) <= 9
+    assert cache.load("https://x/0") is None and cache.load("https://x/10") is not None
+    assert cache.stats()["bytes"] == sum(size for _, size in cache._entries.values())
+
+def test_skip_unchanged_run(stub_server, tmp_path: Path):
+    stub_server.routes["/a"] = (200, _page("a"), 0, {"ETag": '"a1"'})
+    stub_server.routes["/b"] = (200, _page("b"), 0, {"ETag": '"b1"'})
+    urls = [stub_server.url("/a"), stub_server.url("/b")]
+    kwargs = dict(mode="community", include_comments=False, offline=False, http_cache_dir=str(tmp_path / "c"))
+
+    run(urls=urls, output_dir=str(tmp_path / "o1"), skip_unchanged=True, **kwargs)
+    stub_server.routes["/b"] = (200, _page("b2"), 0, {"ETag": '"b2"'})
+    run(urls=urls, output_dir=str(tmp_path / "o2"), skip_unchanged=True, **kwargs)
+
+    ids = {json.loads(line)["id"] for line in (tmp_path / "o2" / "items.ndjson").read_text().splitlines()}
+    assert ids == {"b2"}
\ No newline at end of file
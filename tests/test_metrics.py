@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+from src.metrics import Histogram, RunMetrics
+from src.runner import run
+
+def test_histogram_buckets_and_quantiles():
+    h = Histogram(buckets=(0.1, 1.0))
+    for v in (0.05, 0.1, 0.5, 0.7, 5.0):
+        h.observe(v)
+    assert h.counts == [2, 2, 1]
+    assert h.quantile(0.4) == 0.1
+    assert h.quantile(0.8) == 1.0
+    assert h.quantile(1.0) is None  # in +Inf
+
+def test_timed_charges_only_time_spent_producing():
+    m = RunMetrics()
+
+    def slow():
+        for i in range(3):
+            time.sleep(0.01)
+            yield i
+
+    for _ in m.timed("produce", slow()):
+        time.sleep(0.05)  # consumer time is not charged
+    st = m.stages["produce"]
+    assert st.calls == 3
+    assert 0.03 <= st.seconds < 0.15
+
+def test_prometheus_textfile(tmp_path: Path):
+    m = RunMetrics(textfile=str(tmp_path / "skool.prom"), interval=3600)
+    m.sources["fetch"] = lambda: {"requests": 2, "retries": 1}
+    m.observe_fetch(0.2, 1000)
+    m.observe_fetch(3.0, 500)
+    m.count_item("post")
+    m.tick()
+    m.count_item("post")
+    m.tick()  # within the interval: not rewritten
+    text = (tmp_path / "skool.prom").read_text()
+    assert 'skool_items_total{type="post"} 1' in text
+    assert 'skool_fetch_latency_seconds_bucket{le="0.25"} 1' in text
+    assert 'skool_fetch_latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "skool_fetch_latency_seconds_count 2" in text
+    assert "skool_downloaded_bytes_total 1500" in text
+    assert "skool_fetch_retries 1" in text
+
+def test_run_writes_metrics_summary(stub_server, tmp_path: Path):
+    next_data = {"props": {"pageProps": {"posts": [{"id": "a"}, {"id": "b"}], "modules": [{"id": "m"}]}}}
+    stub_server.routes["/g"] = (
+        200,
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script>',
+    )
+    prom = tmp_path / "skool.prom"
+    run(
+        urls=[stub_server.url("/g")],
+        mode="both",
+        output_dir=str(tmp_path),
+        include_comments=False,
+        offline=False,
+        rate=0,
+        metrics_textfile=str(prom),
+    )
+    summary = json.loads((tmp_path / "metrics.json").read_text())
+    assert summary["items"]["module"] == 1 and summary["items"]["post"] >= 2
+    assert summary["fetchLatency"]["count"] == 1
+    assert summary["bytesDownloaded"] > 0
+    assert summary["fetch"]["requests"] == 1
+    assert {"fetch_wait", "extract", "normalize", "queue_wait", "export", "finalize"} <= set(summary["stages"])
+    assert summary["stages"]["normalize"]["calls"] == sum(summary["items"].values())
+    assert "skool_items_total" in prom.read_text()
+
+def test_summary_while_stages_and_item_types_are_added():
+    metrics = RunMetrics()
+    done = threading.Event()
+
+    def producer():
+        for i in range(20000):
+            metrics.add(f"stage-{i}", 0.0)
+            metrics.count_item(f"type-{i}")
+        done.set()
+
+    t = threading.Thread(target=producer)
+    t.start()
+    while not done.is_set():
+        metrics.prometheus()  # raised "dictionary changed size during iteration"
+    t.join()
+    assert len(metrics.summary()["stages"]) == len(metrics.summary()["items"]) == 20000
+
+def test_offline_run_refreshes_textfile_while_running(tmp_path: Path, monkeypatch):
+    import metrics as metrics_module
+
+    writes = []
+    original = metrics_module.RunMetrics.write_textfile
+
+    def recording(self):
+        writes.append(sum(self.items.values()))
+        original(self)
+
+    monkeypatch.setattr(metrics_module.RunMetrics, "write_textfile", recording)
+    run(urls=[], mode="community", output_dir=str(tmp_path), include_comments=False, offline=True,
+        metrics_textfile=str(tmp_path / "skool.prom"), metrics_interval=0)
+    # Refreshed per item during the replay, not only by the final write
+    assert len(writes) > 2 and writes[0] == 1
\ No newline at end of file
@@ -0,0 +1,42 @@
+import json
+
+from src.extractors.classroom_scraper import ClassroomScraper
+from src.extractors.community_scraper import CommunityScraper
+from src.extractors.http_client import FetchEngine
+from src.extractors.page_cache import Page, PageCache
+
+def test_lru_eviction_by_count_and_size():
+    cache = PageCache(max_pages=2, max_bytes=10)
+    cache.put(Page("a", "aaaa"))
+    cache.put(Page("b", "bbbb"))
+    assert cache.get("a") is not None  # a is now most recent
+    cache.put(Page("c", "cccc"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    cache.put(Page("d", "dddddddd"))
+    assert cache.get("a") is None and cache.get("c") is None and cache.get("d") is not None
+
+def test_both_scrapers_fetch_and_decode_once(stub_server):
+    blob = {"props": {"pageProps": {"posts": [{"id": "p1"}], "modules": [{"id": "m1"}]}}}
+    stub_server.routes["/g"] = (
+        200,
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(blob)}</script>',
+        0.1,
+    )
+    engine = FetchEngine(concurrency=4, retries=1)
+    cache = PageCache()
+    comm = CommunityScraper(engine=engine, cache=cache)
+    clas = ClassroomScraper(engine=engine, cache=cache)
+    url = stub_server.url("/g")
+
+    pages = list(cache.fetch_many([url, url, url], engine.fetch, workers=4))
+    assert pages[0] is pages[1] is pages[2]
+    assert [r["id"] for r in comm.iter_items(url)][0] == "p1"
+    assert [r["id"] for r in clas.iter_modules(url)] == ["m1"]
+    engine.close()
+
+    assert stub_server.hits == ["/g"]
+    assert cache.misses == 1 and cache.hits == 4
+    # Both scrapers got the very same decoded object
+    tag = pages[0].script_tags()[0]
+    assert next(iter(comm._blobs_from_page(pages[0]))) is tag.json()
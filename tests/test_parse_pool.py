@@ -0,0 +1,72 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.runner import run
+
+def _page(i, base=""):
+    posts = [
+        {
+            "id": f"post-{i}-{j}",
+            "url": f"{base}/thread/{i}-{j}" if j == 0 else "",
+            "createdAt": "2024-11-07T23:26:18.04203Z",
+            "user": {"id": f"u{j}", "name": "n"},
+            "comments": [{"post": {"id": f"c{i}-{j}-{k}", "parent_id": f"c{i}-{j}-{k - 1}" if k else ""}} for k in range(3)],
+        }
+        for j in range(4)
+    ]
+    props = {"posts": posts, "modules": [{"id": f"m{i}", "title": "Module", "media": ["v"]}]}
+    return f'<script id="__NEXT_DATA__" type="application/json">{json.dumps({"props": {"pageProps": props}})}</script>'
+
+def _outputs(path: Path):
+    return {name: (path / name).read_bytes() for name in ("items.ndjson", "items.json", "items.csv")}
+
+@pytest.mark.parametrize("include_comments", [False, True])
+def test_worker_processes_match_in_process_output(stub_server, tmp_path: Path, include_comments):
+    urls = []
+    for i in range(6):
+        stub_server.routes[f"/g{i}"] = (200, _page(i, stub_server.url("")))
+        stub_server.routes[f"/thread/{i}-0"] = (200, json.dumps({"comments": [{"post": {"id": f"t{i}"}}]}))
+        urls.append(stub_server.url(f"/g{i}"))
+    kwargs = dict(urls=urls, mode="both", include_comments=include_comments, offline=False, rate=0)
+
+    run(output_dir=str(tmp_path / "inline"), **kwargs)
+    run(output_dir=str(tmp_path / "pool"), workers=2, **kwargs)
+
+    inline = _outputs(tmp_path / "inline")
+    assert _outputs(tmp_path / "pool") == inline
+    ids = [json.loads(line)["id"] for line in inline["items.ndjson"].splitlines()]
+    assert (b'"id":"t0"' in inline["items.ndjson"]) == include_comments
+    assert "m5" in ids and ids.index("post-0-0") < ids.index("m0") < ids.index("post-1-0")
+    journal = [json.loads(line) for line in (tmp_path / "pool" / "run.journal").read_text("utf-8").splitlines()]
+    assert [e["items"] for e in journal if e["event"] == "done"] == [
+        e["items"] for e in map(json.loads, (tmp_path / "inline" / "run.journal").read_text("utf-8").splitlines())
+        if e["event"] == "done"
+    ]
+
+def test_worker_items_feed_model_outputs(stub_server, tmp_path: Path):
+    stub_server.routes["/g"] = (200, _page(0))
+    kwargs = dict(urls=[stub_server.url("/g")], mode="community", include_comments=False, offline=False, rate=0,
+                  users_table=True, formats=["ndjson", "sqlite"])
+
+    run(output_dir=str(tmp_path / "inline"), **kwargs)
+    run(output_dir=str(tmp_path / "pool"), workers=2, **kwargs)
+
+    for name in ("items.ndjson", "users.ndjson"):
+        assert (tmp_path / "pool" / name).read_bytes() == (tmp_path / "inline" / name).read_bytes()
+
+def test_workers_inherit_strict_validation():
+    from outputs.schema import set_strict_validation, strict_validation
+    from parse_pool import ParsePool
+
+    previous = strict_validation()
+    set_strict_validation(True)
+    try:
+        pool = ParsePool(1)
+        try:
+            assert pool._pool.submit(strict_validation).result(timeout=60) is True
+        finally:
+            pool.close()
+    finally:
+        set_strict_validation(previous)
\ No newline at end of file
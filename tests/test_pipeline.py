@@ -0,0 +1,55 @@
+import threading
+import time
+
+import pytest
+
+from src.pipeline import bounded
+
+def test_bounded_preserves_order():
+    assert list(bounded(iter(range(1000)), maxsize=8)) == list(range(1000))
+
+def test_bounded_applies_backpressure():
+    produced = []
+    lock = threading.Lock()
+
+    def source():
+        for i in range(50):
+            with lock:
+                produced.append(i)
+            yield i
+
+    lead = []
+    for i in bounded(source(), maxsize=4):
+        time.sleep(0.002)
+        with lock:
+            lead.append(len(produced) - i)
+    # queue (4) + the item being put + the item held by the consumer
+    assert max(lead) <= 6
+
+def test_bounded_reraises_producer_errors():
+    def source():
+        yield 1
+        raise ValueError("boom")
+
+    out = []
+    with pytest.raises(ValueError, match="boom"):
+        for x in bounded(source(), maxsize=2):
+            out.append(x)
+    assert out == [1]
+
+def test_bounded_stops_producer_when_consumer_quits():
+    closed = threading.Event()
+
+    def source():
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+        finally:
+            closed.set()
+
+    for x in bounded(source(), maxsize=2):
+        if x == 3:
+            break
+    assert closed.wait(2)
@@ -0,0 +1,52 @@
+import time
+
+from src.extractors.http_client import FetchEngine
+from src.extractors.rate_limit import RateLimiter, TokenBucket, backoff_delay, parse_retry_after
+
+def test_token_bucket_paces_after_burst():
+    bucket = TokenBucket(rate=10, burst=2)
+    now = time.monotonic()
+    waits = [bucket.reserve(now) for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert abs(waits[2] - 0.1) < 1e-6 and abs(waits[3] - 0.2) < 1e-6
+
+def test_retry_after_parsing_and_backoff():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert backoff_delay(3, retry_after=2.5) == 2.5
+    assert all(0 <= backoff_delay(4, base=0.5) <= 4.0 for _ in range(50))
+
+def test_throttle_halves_rate_and_circuit_opens():
+    limiter = RateLimiter(rate=8, burst=1, failure_threshold=3, cooldown=30)
+    url = "https://www.skool.com/g"
+    limiter.record_failure(url, 429)
+    assert limiter._host(url).bucket.rate == 4
+    limiter.record_failure(url, 503)
+    limiter.record_failure(url, 500)
+    assert limiter.circuit_opens == 1
+    assert limiter._host(url).paused_until - time.monotonic() > 25
+    # Other hosts are unaffected
+    assert limiter.acquire("https://other.example/x") == 0.0
+
+def test_retry_after_pause_is_capped():
+    limiter = RateLimiter(rate=0, cooldown_cap=5)
+    url = "https://www.skool.com/g"
+    limiter.record_failure(url, 429, retry_after=86400)
+    assert limiter._host(url).paused_until - time.monotonic() <= 5
+
+def test_engine_honors_retry_after_and_stops_on_404(stub_server):
+    stub_server.routes["/busy"] = (429, "slow down", 0, {"Retry-After": "0.3"})
+    stub_server.routes["/gone"] = (404, "nope")
+    engine = FetchEngine(retries=3, limiter=RateLimiter(rate=0), backoff_base=0.01)
+
+    t0 = time.monotonic()
+    res = engine.fetch(stub_server.url("/busy"))
+    elapsed = time.monotonic() - t0
+    assert res.status == 429 and not res.ok
+    assert stub_server.hits.count("/busy") == 3
+    assert elapsed >= 0.6  # two waits of Retry-After
+    assert engine.stats()["retries"] == 2 and engine.stats()["throttled"] == 3
+
+    engine.fetch(stub_server.url("/gone"))
+    assert stub_server.hits.count("/gone") == 1
\ No newline at end of file
@@ -0,0 +1,56 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from src.extractors.replay import iter_records
+from src.runner import run
+
+RECORDS = [
+    {"id": "a", "metadata": {"title": "Ünïcode ✓", "content": "x" * 3000}},
+    {"id": "b", "type": "module", "title": "Module [1], {braces}"},
+    {"id": "c", "comments": [{"post": {"id": "c1", "metadata": {"content": "]"}}}]},
+]
+
+def test_json_array_in_small_chunks(tmp_path: Path):
+    path = tmp_path / "records.json"
+    path.write_text("\ufeff  " + json.dumps(RECORDS, indent=2, ensure_ascii=False), "utf-8")
+    assert list(iter_records(str(path), chunk_size=7)) == RECORDS
+    (tmp_path / "empty.json").write_text("[ ]")
+    assert list(iter_records(str(tmp_path / "empty.json"))) == []
+
+def test_ndjson_and_gzip(tmp_path: Path):
+    lines = "\n".join(json.dumps(r) for r in RECORDS) + "\n\n"
+    (tmp_path / "records.ndjson").write_text(lines + '{"id": "torn', "utf-8")
+    assert list(iter_records(str(tmp_path / "records.ndjson"))) == RECORDS
+    with gzip.open(tmp_path / "records.json.gz", "wt", encoding="utf-8") as f:
+        json.dump(RECORDS, f)
+    assert list(iter_records(str(tmp_path / "records.json.gz"), chunk_size=16)) == RECORDS
+
+def test_truncated_array_raises(tmp_path: Path):
+    path = tmp_path / "bad.json"
+    path.write_text(json.dumps(RECORDS)[:-20])
+    with pytest.raises(ValueError):
+        list(iter_records(str(path), chunk_size=64))
+
+def test_offline_replay_streams_and_stops_at_max_items(tmp_path: Path, monkeypatch):
+    path = tmp_path / "archive.ndjson"
+    path.write_text("\n".join(json.dumps({"id": f"p{i}"}) for i in range(1000)), "utf-8")
+
+    import extractors.replay as replay
+
+    read = []
+    original = replay._iter_ndjson
+
+    def counting(f, p):
+        for rec in original(f, p):
+            read.append(rec["id"])
+            yield rec
+
+    monkeypatch.setattr(replay, "_iter_ndjson", counting)
+    run(urls=[], mode="both", output_dir=str(tmp_path / "out"), include_comments=False, offline=True,
+        sample_path=str(path), max_items=5)
+    assert read == [f"p{i}" for i in range(5)]
+    ids = [json.loads(line)["id"] for line in (tmp_path / "out" / "items.ndjson").read_text("utf-8").splitlines()]
+    assert ids == read
\ No newline at end of file
@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.runner import run
+
+def _page(prefix):
+    blob = {"props": {"pageProps": {"posts": [{"id": f"{prefix}-{j}"} for j in range(3)]}}}
+    return f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(blob)}</script>'
+
+def _ids(path: Path):
+    return [json.loads(line)["id"] for line in path.read_text("utf-8").splitlines()]
+
+def test_resume_after_crash_has_no_duplicates(stub_server, tmp_path: Path, monkeypatch):
+    urls = []
+    for i in range(4):
+        stub_server.routes[f"/g{i}"] = (200, _page(f"g{i}"))
+        urls.append(stub_server.url(f"/g{i}"))
+    kwargs = dict(urls=urls, mode="community", include_comments=False, offline=False)
+
+    run(output_dir=str(tmp_path / "clean"), **kwargs)
+
+    import outputs.exporters as exporters
+
+    original = exporters.Exporter.write
+    calls = {"n": 0}
+
+    def flaky_write(self, item):
+        calls["n"] += 1
+        if calls["n"] == 8:  # in the middle of the third URL
+            raise RuntimeError("crash")
+        original(self, item)
+
+    monkeypatch.setattr(exporters.Exporter, "write", flaky_write)
+    with pytest.raises(RuntimeError):
+        run(output_dir=str(tmp_path / "crashed"), **kwargs)
+    monkeypatch.setattr(exporters.Exporter, "write", original)
+
+    before = len(stub_server.hits)
+    run(output_dir=str(tmp_path / "crashed"), resume=True, **kwargs)
+    # Only URLs after the last completed one were fetched again
+    assert sorted(stub_server.hits[before:]) == ["/g2", "/g3"]
+
+    for name in ("items.ndjson", "items.json", "items.csv"):
+        assert (tmp_path / "crashed" / name).read_bytes() == (tmp_path / "clean" / name).read_bytes()
+    assert len(_ids(tmp_path / "crashed" / "items.ndjson")) == 4 * 3
+
+def test_resume_dedups_only_against_its_own_run(stub_server, tmp_path: Path, monkeypatch):
+    for path, ids in (("/a", ["p1"]), ("/b", ["p2"]), ("/c", ["p1", "p3"])):
+        blob = {"props": {"pageProps": {"posts": [{"id": i} for i in ids]}}}
+        stub_server.routes[path] = (200, f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(blob)}</script>')
+    kwargs = dict(output_dir=str(tmp_path / "out"), mode="community", include_comments=False, offline=False)
+    run(urls=[stub_server.url("/a")], **kwargs)
+
+    import outputs.exporters as exporters
+
+    original = exporters.Exporter.write
+
+    def crash_on_second(self, item):
+        if self._count == 1:
+            raise RuntimeError("crash")
+        original(self, item)
+
+    second = [stub_server.url("/b"), stub_server.url("/c")]
+    monkeypatch.setattr(exporters.Exporter, "write", crash_on_second)
+    with pytest.raises(RuntimeError):
+        run(urls=second, **kwargs)
+    monkeypatch.setattr(exporters.Exporter, "write", original)
+    run(urls=second, resume=True, **kwargs)
+
+    # p1 came from the earlier run in the same directory, so this run still exports it
+    assert [i["id"] for i in json.loads((tmp_path / "out" / "items.json").read_text("utf-8"))] == ["p2", "p1", "p3"]
+    assert _ids(tmp_path / "out" / "items.ndjson") == ["p1", "p2", "p1", "p3"]
\ No newline at end of file
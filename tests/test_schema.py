@@ -0,0 +1,37 @@
+import json
+import sys
+from pathlib import Path
+
+import orjson
+
+from src.parsers import posts
+from src.parsers.classroom import normalize_module
+from src.parsers.posts import normalize_post
+
+# The schema module the parsers were imported against (src/ is also on sys.path)
+schema = sys.modules[posts.build.__module__]
+
+SAMPLE = Path(__file__).resolve().parents[1] / "data" / "sample_output.json"
+
+def _normalize_all(data):
+    return [normalize_module(r) if r.get("type") == "module" else normalize_post(r) for r in data]
+
+def test_fast_path_serializes_like_strict_path():
+    data = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    fast = _normalize_all(data)
+    schema.set_strict_validation(True)
+    try:
+        strict = _normalize_all(data)
+    finally:
+        schema.set_strict_validation(False)
+    for a, b in zip(fast, strict):
+        assert a == b
+        assert schema.dumps(a) == orjson.dumps(b.model_dump())
+        assert schema.dumps(a, option=orjson.OPT_INDENT_2) == orjson.dumps(b.model_dump(), option=orjson.OPT_INDENT_2)
+
+def test_build_fills_defaults_in_field_order():
+    c = schema.build(schema.Comment, upvotes=2, id="c1")
+    assert list(c.__dict__) == list(schema.Comment.model_fields)
+    assert c.replies == [] and c.user is None
+    assert c.model_fields_set == {"id", "upvotes"}
+    assert schema.dumps(c) == orjson.dumps(schema.Comment(id="c1", upvotes=2).model_dump())
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from src.extractors.community_scraper import CommunityScraper
+from src.extractors.classroom_scraper import ClassroomScraper
+from src.extractors.scripts import find_json_object, iter_script_tags, soup_script_tags
+
+NEXT = {"props": {"pageProps": {"posts": [{"id": "p1"}, {"id": "p2"}], "course": {"modules": [{"id": "m1"}]}}}}
+LD = {"@type": "Course", "name": "c"}
+PAGE = (
+    "<html><head>"
+    "<script src='/app.js'></script>"
+    f"<SCRIPT type=\"application/ld+json\">{json.dumps(LD)}</SCRIPT>"
+    "<script>window.__STATE__ = {\"a\": \"}{\", \"b\": {\"c\": 1}}; window.x = {\"z\": 2};</script>"
+    "</head><body><div>hello</div>"
+    f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(NEXT)}</script>'
+    "</body></html>"
+)
+
+def test_scanner_matches_soup():
+    fast = [(t.attrs.get("id"), t.attrs.get("type"), t.text) for t in iter_script_tags(PAGE)]
+    slow = [(t.attrs.get("id"), t.attrs.get("type"), t.text) for t in soup_script_tags(PAGE)]
+    assert fast == slow
+
+def test_find_json_object_is_balanced():
+    assert find_json_object('x = {"a": "}{", "b": {"c": 1}}; y = {"z": 2};') == '{"a": "}{", "b": {"c": 1}}'
+    assert find_json_object('f({"s": "quote \\" }"})') == '{"s": "quote \\" }"}'
+    assert find_json_object("no braces here") is None
+    assert find_json_object("{ unterminated") is None
+
+def test_fast_and_dom_paths_agree():
+    fast = list(CommunityScraper(fast_extract=True)._extract_json_blobs(PAGE))
+    slow = list(CommunityScraper(fast_extract=False)._extract_json_blobs(PAGE))
+    assert fast == slow
+    assert fast[0] == NEXT and fast[1] == LD
+    assert {"a": "}{", "b": {"c": 1}} in fast
+
+    mods_fast = list(ClassroomScraper(fast_extract=True)._extract_module_payloads(PAGE))
+    mods_slow = list(ClassroomScraper(fast_extract=False)._extract_module_payloads(PAGE))
+    assert mods_fast == mods_slow == [{"id": "m1"}, LD]
+
+def test_dom_fallback_only_when_the_scan_finds_no_scripts(monkeypatch):
+    import extractors.page_cache as page_cache
+
+    real = page_cache.soup_script_tags
+    monkeypatch.setattr(page_cache, "soup_script_tags", lambda html: pytest.fail("DOM parse of a scannable page"))
+    # A community page has no modules: nothing to extract, but no second parse either
+    community = f'<script id="__NEXT_DATA__" type="application/json">{json.dumps({"props": {}})}</script>'
+    assert list(ClassroomScraper(fast_extract=True)._extract_module_payloads(community)) == []
+    assert list(CommunityScraper(fast_extract=True)._extract_json_blobs("<script>var x = 1;</script>")) == []
+
+    calls = []
+    monkeypatch.setattr(page_cache, "soup_script_tags", lambda html: calls.append(html) or real(html))
+    assert list(ClassroomScraper(fast_extract=True)._extract_module_payloads("<div>no scripts</div>")) == []
+    assert len(calls) == 1
\ No newline at end of file
@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.extractors.classroom_scraper import ClassroomScraper
+from src.extractors.community_scraper import CommunityScraper
+from src.extractors.page_cache import Page
+from src.extractors.selectors import SelectorSet, load_selectors, parse_selector
+
+def test_parse_and_select():
+    assert parse_selector("$.a['b c'][*][?@type=X|Y][?n:number][?k]") == [
+        ("key", "a"),
+        ("key", "b c"),
+        ("each", None),
+        ("filter", ("@type", frozenset({"X", "Y"}), None)),
+        ("filter", ("n", None, "number")),
+        ("filter", ("k", None, None)),
+    ]
+    for bad in ("a.b", "$.a[", "$.a[?x:bool]"):
+        with pytest.raises(ValueError):
+            parse_selector(bad)
+
+    doc = {
+        "p": {"posts": [{"id": 1}, "skip", {"id": 2}], "feed": {"items": [{"id": 3}]}},
+        "list": [{"@type": "X", "n": 1}, {"@type": "Z", "n": 2}, {"@type": "Y", "n": True}],
+    }
+    sel = SelectorSet(("$.p.feed.items[*]", "$.p.posts[*]", "$.p.posts.items[*]", "$.p", "$.list[*][?@type=X|Y]"))
+    assert sel.select(doc) == [{"id": 3}, {"id": 1}, {"id": 2}, doc["p"], doc["list"][0], doc["list"][2]]
+    assert SelectorSet(("$.list[*][?n:number]",)).select(doc) == doc["list"][:2]
+    assert SelectorSet(("$[*]",)).select(None) == []
+
+def test_list_payloads_do_not_crash():
+    html = '<script type="application/ld+json">[{"id": "a"}, 1, {"id": "b"}]</script>'
+    records = list(CommunityScraper(include_comments=False).iter_records(Page(url="u", html=html)))
+    assert records == [{"id": "a"}, {"id": "b"}]
+
+def test_selectors_from_config(tmp_path: Path):
+    path = tmp_path / "selectors.json"
+    path.write_text(json.dumps({
+        "posts": ["$.props.pageProps.threads[*]"],
+        "nextDataModules": ["$.props.pageProps.syllabus.units[*][?published]"],
+        "ldModules": [],
+    }))
+    blob = {"props": {"pageProps": {
+        "threads": [{"id": "t1"}],
+        "posts": [{"id": "ignored"}],
+        "syllabus": {"units": [{"id": "u1", "published": True}, {"id": "u2"}]},
+    }}}
+    html = f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(blob)}</script>'
+    comm = CommunityScraper(include_comments=False, selectors_path=str(path))
+    assert list(comm.iter_records(Page(url="u", html=html))) == [{"id": "t1"}]
+    clas = ClassroomScraper(selectors_path=str(path))
+    assert list(clas._extract_module_payloads(html)) == [{"id": "u1", "published": True}]
+    assert load_selectors(str(path)) is load_selectors(str(path))
\ No newline at end of file
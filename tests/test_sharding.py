@@ -0,0 +1,100 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.outputs.merge import merge_partitions
+from src.runner import run
+from src.sharding import WorkQueue, partitions_in, select_shard
+
+def _page(prefix, shared):
+    posts = [{"id": f"{prefix}-{j}", "user": {"id": f"u{j}", "name": prefix}} for j in range(3)]
+    posts.append({"id": shared, "user": {"id": "u0", "name": "x"}})  # also on other pages
+    blob = {"props": {"pageProps": {"posts": posts}}}
+    return f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(blob)}</script>'
+
+def _setup(stub_server, n=7):
+    urls = []
+    for i in range(n):
+        stub_server.routes[f"/g{i}"] = (200, _page(f"g{i}", "shared"))
+        urls.append(stub_server.url(f"/g{i}"))
+    return urls
+
+def _deduped_lines(path: Path):
+    seen, out = set(), []
+    for line in path.read_bytes().splitlines():
+        key = (json.loads(line)["type"], json.loads(line)["id"])
+        if key not in seen:
+            seen.add(key)
+            out.append(line)
+    return out
+
+def test_select_shard_partitions_urls():
+    urls = [f"https://www.skool.com/g{i}" for i in range(50)]
+    shards = [select_shard(urls, i, 4) for i in range(4)]
+    assert sorted(u for s in shards for u in s) == sorted(urls)
+    assert all(s == sorted(s, key=urls.index) for s in shards)
+    assert select_shard(urls, 1, 4) == shards[1]
+
+def test_sharded_runs_merge_like_a_single_run(stub_server, tmp_path: Path):
+    urls = _setup(stub_server)
+    kwargs = dict(mode="community", include_comments=False, offline=False, rate=0)
+    run(urls=urls, output_dir=str(tmp_path / "single"), **kwargs)
+    # Shards run in reverse order: the merge must not depend on it
+    for index in reversed(range(3)):
+        run(urls=urls, output_dir=str(tmp_path / "sharded"), shard_index=index, shard_count=3, **kwargs)
+
+    partitions = partitions_in(str(tmp_path / "sharded"))
+    assert [Path(p).name for p in partitions] == ["shard-000-of-003", "shard-001-of-003", "shard-002-of-003"]
+    st = merge_partitions(partitions, str(tmp_path / "sharded"), urls)
+
+    expected = _deduped_lines(tmp_path / "single" / "items.ndjson")
+    assert (tmp_path / "sharded" / "items.ndjson").read_bytes().splitlines() == expected
+    assert st.items == len(expected) and st.duplicates > 0
+    merged = json.loads((tmp_path / "sharded" / "items.json").read_bytes())
+    assert [json.dumps(i, separators=(",", ":")) for i in merged] == [
+        json.dumps(json.loads(line), separators=(",", ":")) for line in expected
+    ]
+    assert len((tmp_path / "sharded" / "items.csv").read_text("utf-8").splitlines()) == len(expected) + 1
+
+def test_queue_workers_split_urls_and_merge(stub_server, tmp_path: Path):
+    urls = _setup(stub_server)
+    queue = str(tmp_path / "queue")
+    # Worker b got to some URLs first
+    b = WorkQueue(queue, "b")
+    assert b.claim(urls[1]) and b.claim(urls[4])
+    assert not WorkQueue(queue, "a").claim(urls[1])
+
+    kwargs = dict(mode="community", include_comments=False, offline=False, rate=0, users_table=True)
+    run(urls=urls, output_dir=str(tmp_path / "out"), queue_dir=queue, worker_id="a", **kwargs)
+    hits = list(stub_server.hits)
+    assert "/g1" not in hits and "/g4" not in hits
+    run(urls=urls, output_dir=str(tmp_path / "out"), queue_dir=queue, worker_id="b", **kwargs)
+    assert sorted(stub_server.hits[len(hits):]) == ["/g1", "/g4"]
+
+    run(urls=urls, output_dir=str(tmp_path / "single"), **kwargs)
+    merge_partitions(partitions_in(str(tmp_path / "out")), str(tmp_path / "out"), urls)
+    assert (tmp_path / "out" / "items.ndjson").read_bytes().splitlines() == _deduped_lines(
+        tmp_path / "single" / "items.ndjson"
+    )
+    users = [json.loads(line) for line in (tmp_path / "out" / "users.ndjson").read_text("utf-8").splitlines()]
+    assert [u["id"] for u in users] == ["u0", "u1", "u2"]
+
+def test_queue_claims_are_whole_and_need_a_worker_id(tmp_path: Path):
+    queue = tmp_path / "queue"
+    assert WorkQueue(str(queue), "a").claim("https://x/1")
+    assert not WorkQueue(str(queue), "b").claim("https://x/1")
+    assert [p.read_text("utf-8") for p in queue.iterdir()] == ["a"]  # no temp files left
+    with pytest.raises(SystemExit, match="--worker-id"):
+        run(urls=["https://x/1"], output_dir=str(tmp_path / "out"), mode="community", include_comments=False, offline=False, queue_dir=str(queue))
+
+def test_merge_dedups_by_type_and_id(tmp_path: Path):
+    for name, lines in (("a", ['{"type":"post","id":"x"}', '{"type":"module","id":"x"}']), ("b", ['{"type":"post","id":"x"}'])):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "items.ndjson").write_text("\n".join(lines) + "\n")
+    (tmp_path / "out").mkdir()
+    for _ in range(2):  # merging again replaces the result
+        st = merge_partitions([str(tmp_path / "a"), str(tmp_path / "b")], str(tmp_path / "out"), formats=["ndjson", "json"])
+        assert (st.items, st.duplicates) == (2, 1)
+        assert (tmp_path / "out" / "items.ndjson").read_text().splitlines() == ['{"type":"post","id":"x"}', '{"type":"module","id":"x"}']
+        assert len(json.loads((tmp_path / "out" / "items.json").read_text())) == 2
\ No newline at end of file
@@ -0,0 +1,65 @@
+import sqlite3
+from pathlib import Path
+
+from src.outputs.sqlite_sink import SqliteExporter
+from src.parsers.posts import normalize_post
+from src.runner import run
+
+SAMPLE = Path(__file__).resolve().parents[1] / "data" / "sample_output.json"
+
+def _post(title, comments, user=None):
+    return {
+        "id": "p1",
+        "groupId": "g1",
+        "title": title,
+        "updatedAt": "2024-11-08T00:00:00Z",
+        "user": user or {"id": "u1", "name": "author"},
+        "comments": [
+            {"post": {"id": cid, "parent_id": parent, "updated_at": "2024-11-09T00:00:00Z", "user": {"id": "u2", "name": "c"}}}
+            for cid, parent in comments
+        ],
+    }
+
+def test_offline_run_into_sqlite(tmp_path: Path):
+    db = tmp_path / "out.sqlite"
+    for _ in range(2):
+        run(urls=[], mode="both", output_dir=str(tmp_path), include_comments=True, offline=True,
+            sample_path=str(SAMPLE), formats=["sqlite"], sqlite_path=str(db))
+
+    conn = sqlite3.connect(db)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    counts = {t: conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in ("posts", "comments", "modules", "users")}
+    assert counts == {"posts": 1, "comments": 2, "modules": 1, "users": 3}
+    assert conn.execute("SELECT parentId, postId FROM comments WHERE id = 'c2'").fetchone() == (
+        "c1", "aab147fa0ea4420d83e8d3a9214f5203"
+    )
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM comments WHERE updatedAt > '2024-11-01'"
+    ).fetchall()
+    assert "idx_comments_updatedAt" in str(plan)
+    assert not (tmp_path / "items.json").exists()
+
+def test_rewrites_update_rows_in_place(tmp_path: Path):
+    sink = SqliteExporter(str(tmp_path / "db.sqlite"), batch_size=1)
+    sink.write(normalize_post(_post("v1", [("c1", "")])))
+    sink.write(normalize_post(_post("v2", [("c1", ""), ("c2", "c1")])))
+    sink.finalize()
+
+    conn = sqlite3.connect(tmp_path / "db.sqlite")
+    assert conn.execute("SELECT id, title FROM posts").fetchall() == [("p1", "v2")]
+    assert conn.execute("SELECT id, parentId FROM comments ORDER BY id").fetchall() == [("c1", ""), ("c2", "c1")]
+
+def test_users_merge_without_blanking(tmp_path: Path):
+    sink = SqliteExporter(str(tmp_path / "db.sqlite"))
+    full = {"id": "u1", "name": "Ann", "firstName": "Ann", "updatedAt": "2024-06-01T00:00:00Z",
+            "metadata": {"bio": "new bio", "location": "Oslo"}}
+    older = {"id": "u1", "name": "Old name", "updatedAt": "2024-01-01T00:00:00Z", "metadata": {"bio": "old bio"}}
+    sink.write(normalize_post(_post("a", [], user=full)))
+    sink.write(normalize_post(_post("b", [], user=older)))
+    sink.write(normalize_post(_post("c", [], user={"id": "u1", "name": ""})))
+    sink.finalize()
+
+    conn = sqlite3.connect(tmp_path / "db.sqlite")
+    name, first, meta = conn.execute("SELECT name, firstName, metadata FROM users WHERE id = 'u1'").fetchone()
+    assert (name, first) == ("Ann", "Ann")
+    assert '"bio":"new bio"' in meta and '"location":"Oslo"' in meta
@@ -0,0 +1,25 @@
+import subprocess
+import sys
+from pathlib import Path
+
+RUNNER = Path(__file__).resolve().parents[1] / "src" / "runner.py"
+
+def test_offline_run_skips_heavy_imports(tmp_path: Path):
+    code = (
+        "import runpy, sys\n"
+        "sys.argv = sys.argv[1:]\n"
+        "try:\n"
+        "    runpy.run_path(sys.argv[0], run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "heavy = ('requests', 'tqdm', 'dateutil', 'bs4', 'lxml', 'pandas', 'multiprocessing', 'sqlite3')\n"
+        "print(sorted(m for m in heavy if m in sys.modules))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code, str(RUNNER), "--offline", "--output", str(tmp_path)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert proc.stdout.strip().splitlines()[-1] == "[]"
+    assert (tmp_path / "items.csv").read_text("utf-8").startswith("type,id,")
\ No newline at end of file
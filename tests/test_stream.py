@@ -0,0 +1,93 @@
+import json
+import random
+from pathlib import Path
+
+from src.extractors.scripts import ScriptScanner, TagStream, iter_script_tags
+from src.runner import run
+
+NEXT = {"props": {"pageProps": {"posts": [{"id": f"p{i}"} for i in range(5)], "course": {"modules": [{"id": "m1"}]}}}}
+LD = {"@type": "Course", "name": "c"}
+
+def _page(filler_kb: int = 0) -> str:
+    return (
+        "<html><head><SCRIPT type=\"application/ld+json\">" + json.dumps(LD) + "</SCRIPT >"
+        "<script>if (a<b) { x = {\"k\": \"</scrip\"}; }</script></head><body>"
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(NEXT)}</script>'
+        + "<div>filler</div>" * (filler_kb * 64)
+        + "<script>window.tail = {\"late\": 1}</script></body></html>"
+    )
+
+def test_scanner_matches_iter_script_tags_for_any_chunking():
+    rng = random.Random(3)
+    for page in (_page(1), _page() + "<script src=x>unterminated </scr"):
+        expected = [(t.attrs, t.text) for t in iter_script_tags(page)]
+        for _ in range(50):
+            scanner, tags, pos = ScriptScanner(), [], 0
+            while pos < len(page):
+                step = rng.randint(1, 40)
+                tags += scanner.feed(page[pos:pos + step])
+                pos += step
+            tags += scanner.close()
+            assert [(t.attrs, t.text) for t in tags] == expected
+
+def test_tag_stream_replays_and_stops_reading():
+    page = _page(16)
+    read = []
+
+    def chunks():
+        for pos in range(0, len(page), 1024):
+            read.append(pos)
+            yield page[pos:pos + 1024]
+
+    tags = TagStream(chunks())
+    first = next(t for t in tags if t.attrs.get("id") == "__NEXT_DATA__")
+    assert first.json() == NEXT and len(read) < 3
+    # A second reader replays the tags already scanned
+    assert [t.attrs.get("type") for t in tags][:3] == ["application/ld+json", None, "application/json"]
+    tags.close()
+
+def test_stream_run_matches_full_run_and_stops_early(stub_server, tmp_path: Path):
+    stub_server.routes["/big"] = (200, _page(2048))
+    stub_server.routes["/small"] = (200, _page())
+    urls = [stub_server.url("/big"), stub_server.url("/missing"), stub_server.url("/small")]
+    kwargs = dict(urls=urls, mode="both", include_comments=False, offline=False, max_items=2)
+
+    run(output_dir=str(tmp_path / "full"), **kwargs)
+    run(output_dir=str(tmp_path / "stream"), stream=True, **kwargs)
+
+    full = (tmp_path / "full" / "items.ndjson").read_bytes()
+    assert (tmp_path / "stream" / "items.ndjson").read_bytes() == full
+    # Two posts and two modules (m1, then the id-less LD+JSON course) per page; repeats dropped run-wide
+    assert [json.loads(line)["id"] for line in full.splitlines()] == ["p0", "p1", "m1", "", ""]
+    downloaded = json.loads((tmp_path / "stream" / "metrics.json").read_text())["bytesDownloaded"]
+    assert downloaded < len(_page(2048)) // 4
+
+def test_broken_download_is_not_journaled(stub_server, tmp_path: Path):
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    body = _page(64).encode("utf-8")
+
+    class Short(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body) + 1000))
+            self.end_headers()
+            self.wfile.write(body[: len(body) // 2])
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Short)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    stub_server.routes["/ok"] = (200, _page())
+    broken = f"http://127.0.0.1:{httpd.server_address[1]}/short"
+    try:
+        run(urls=[broken, stub_server.url("/ok")], mode="community", output_dir=str(tmp_path),
+            include_comments=False, offline=False, stream=True)
+    finally:
+        httpd.shutdown()
+    ids = [json.loads(line)["id"] for line in (tmp_path / "items.ndjson").read_text("utf-8").splitlines()]
+    assert ids == [f"p{i}" for i in range(5)]
+    units = [json.loads(line).get("unit") for line in (tmp_path / "run.journal").read_text().splitlines()]
+    assert units == [None, stub_server.url("/ok"), None]
\ No newline at end of file
@@ -0,0 +1,23 @@
+from benchmarks import synthetic
+from src.extractors.classroom_scraper import ClassroomScraper
+from src.extractors.community_scraper import CommunityScraper
+from src.extractors.page_cache import Page
+from src.parsers.classroom import normalize_module
+from src.parsers.posts import normalize_post
+
+def test_community_page_round_trips_through_the_parsers():
+    html = synthetic.community_page(5, comment_width=3, comment_depth=2, filler_kb=4)
+    assert html == synthetic.community_page(5, comment_width=3, comment_depth=2, filler_kb=4)
+
+    records = list(CommunityScraper().iter_records(Page(url="u", html=html)))
+    items = [normalize_post(r) for r in records]
+    assert list(dict.fromkeys(i.id for i in items)) == [f"p{i:07d}" for i in range(5)]
+    assert all(len(i.comments) == 3 and all(len(c.replies) == 3 for c in i.comments) for i in items)
+    assert items[0].metadata["comments"] == 12
+
+def test_classroom_pages_in_both_shapes():
+    for shape in ("skool", "schema"):
+        html = synthetic.classroom_page(4, shape=shape, filler_kb=4)
+        modules = [normalize_module(r) for r in ClassroomScraper().iter_modules_from_page(Page(url="u", html=html))]
+        assert len(modules) == 4, shape
+        assert all(m.media and m.courseMetaDetails and m.courseMetaDetails.id == "c1" for m in modules), shape
\ No newline at end of file
@@ -0,0 +1,62 @@
+import json
+from pathlib import Path
+
+from src.outputs.exporters import Exporter
+from src.outputs.users import UserRegistry
+from src.parsers.posts import normalize_post
+from src.runner import run
+
+def _post(i, author, commenters, updated="2024-01-01T00:00:00Z"):
+    return {
+        "id": f"p{i}",
+        "user": {"id": author, "name": f"name-{author}", "updatedAt": updated, "metadata": {"bio": f"bio {i}"}},
+        "comments": [
+            {"post": {"id": f"p{i}-c{j}", "user": {"id": u, "name": f"name-{u}"}}}
+            for j, u in enumerate(commenters)
+        ],
+    }
+
+def _lines(path: Path):
+    return [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+
+def test_registry_interns_and_merges_freshest():
+    users = UserRegistry()
+    a = normalize_post(_post(1, "u1", ["u2", "u1"], updated="2024-01-01T00:00:00Z"), users)
+    b = normalize_post(_post(2, "u1", ["u2"], updated="2024-06-01T00:00:00Z"), users)
+    assert a.user is b.user is a.comments[1].user
+    assert a.comments[0].user is b.comments[0].user
+    assert len(users) == 2
+    # Newer copy wins, older copies never overwrite it
+    assert a.user.metadata["bio"] == "bio 2"
+    normalize_post(_post(3, "u1", [], updated="2023-01-01T00:00:00Z"), users)
+    assert users.get("u1").metadata["bio"] == "bio 2"
+    assert users.get("u1").metadata["location"] == ""  # filled from the post author copy
+
+def test_users_table_layout(tmp_path: Path):
+    sample = tmp_path / "sample.json"
+    sample.write_text(json.dumps([_post(i, "author", ["u1", "u2", "author"]) for i in range(5)]), "utf-8")
+    out = tmp_path / "out"
+    run(urls=[], mode="both", output_dir=str(out), include_comments=True, offline=True,
+        sample_path=str(sample), users_table=True)
+
+    items = _lines(out / "items.ndjson")
+    assert [i["user"] for i in items] == ["author"] * 5
+    assert [c["user"] for c in items[0]["comments"]] == ["u1", "u2", "author"]
+    assert json.loads((out / "items.json").read_text("utf-8")) == items
+    users = _lines(out / "users.ndjson")
+    assert [u["id"] for u in users] == ["author", "u1", "u2"]
+    assert users[0]["metadata"]["bio"] == "bio 4"
+
+def test_users_table_resume_keeps_earlier_users(tmp_path: Path):
+    exporter = Exporter(str(tmp_path), users=UserRegistry())
+    exporter.write(normalize_post(_post(1, "a", ["b"]), exporter.users))
+    offsets = exporter.checkpoint()
+    exporter.write(normalize_post(_post(2, "c", []), exporter.users))
+    exporter.flush()  # crash here: p2 and user c are past the checkpoint
+
+    resumed = Exporter(str(tmp_path), users=UserRegistry())
+    resumed.resume(offsets)
+    resumed.write(normalize_post(_post(3, "d", ["a"]), resumed.users))
+    resumed.finalize()
+    assert [i["id"] for i in _lines(tmp_path / "items.ndjson")] == ["p1", "p3"]
+    assert [u["id"] for u in _lines(tmp_path / "users.ndjson")] == ["a", "b", "d"]
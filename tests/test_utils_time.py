@@ -0,0 +1,44 @@
+import random
+
+from src.extractors.utils_time import _parse_dateutil, to_iso
+
+def test_fast_path_matches_dateutil():
+    rnd = random.Random(7)
+    samples = [
+        "2024-11-07T23:26:18.04203Z",
+        "2024-11-07T23:26:18Z",
+        "2024-11-07T23:26:18.000000Z",
+        "2024-11-07T23:26:18.1234567Z",
+        "2024-11-07",
+        "2024-11-07T23:26",
+        "2024-11-07 23:26:18+02:00",
+        "2024-11-07T23:26:18-0500",
+        "2024-11-07T23:26:18.5+05:30",
+        "2024-11-07T23:26:18.04203z",
+        "  2024-11-07T23:26:18Z ",
+        "2024-11-07T24:00:00Z",
+        "2024-02-30T00:00:00Z",
+        "2024-11-07T10:00:00+24:00",
+        "20241107",
+        "Nov 7 2024",
+        "1731431342",
+        "not a date",
+    ]
+    for _ in range(500):
+        frac = "".join(rnd.choice("0123456789") for _ in range(rnd.randint(0, 7)))
+        tz = rnd.choice(["Z", "", "+00:00", "-03:30", "+0545"])
+        samples.append(
+            f"{rnd.randint(1970, 2030)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 31):02d}"
+            f"T{rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}:{rnd.randint(0, 59):02d}"
+            f"{'.' + frac if frac else ''}{tz}"
+        )
+    for s in samples:
+        assert to_iso(s) == _parse_dateutil(s), s
+
+def test_epoch_numbers():
+    assert to_iso(1731431342) == "2024-11-12T17:09:02+00:00"
+    assert to_iso(1731431342139) == "2024-11-12T17:09:02.139000+00:00"
+    assert to_iso(1731431342139887) == "2024-11-12T17:09:02.139887+00:00"
+    assert to_iso(1731431342139887000) == "2024-11-12T17:09:02.139887+00:00"
+    assert to_iso(1731431342.5) == "2024-11-12T17:09:02.500000+00:00"
+    assert to_iso(0) is None and to_iso(True) is None and to_iso(None) is None